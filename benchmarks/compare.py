@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Stores benchmark results per git commit, and compares them to find performance regressions.
+
+`record` runs the benchmarks, and stores the results under the current commit hash. `check` compares
+results against a baseline commit, exiting with a non-zero code if anything regressed. A result
+only counts as a regression if it's both slower than the tolerance for it's group, and the
+difference is larger than the noise in the two runs.
+"""
+
+import json
+import math
+import platform
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import hot_paths  # noqa: F401  # pyright: ignore[reportUnusedImport]
+from harness import BenchmarkResult, print_result, run_benchmarks
+
+sys.path.append(str(Path(__file__).parent.parent))
+from prepare_release import check_git_is_dirty, get_git_commit_hash
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+DEFAULT_TOLERANCE = 0.10
+DEFAULT_SIGMAS = 3
+
+
+@dataclass
+class StoredResults:
+    commit: str
+    dirty: bool
+    python: str
+    results: list[BenchmarkResult]
+
+    @staticmethod
+    def load(path: Path) -> "StoredResults":
+        """
+        Loads a set of results from disk.
+
+        Args:
+            path: The file to load.
+        Returns:
+            The loaded results.
+        """
+        data = json.loads(path.read_text(encoding="utf8"))
+        return StoredResults(
+            data["commit"],
+            data["dirty"],
+            data["python"],
+            [BenchmarkResult(**result) for result in data["results"]],
+        )
+
+    def save(self, path: Path) -> None:
+        """
+        Saves this set of results to disk.
+
+        Args:
+            path: The file to save to.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(asdict(self), indent=4), encoding="utf8")
+
+
+def get_results_file(commit: str, dirty: bool) -> Path:
+    """
+    Gets the file results for a given commit are stored in.
+
+    Args:
+        commit: The full commit hash.
+        dirty: True if the results were from a dirty repo.
+    Returns:
+        The results file.
+    """
+    return RESULTS_DIR / (f"{commit}-dirty.json" if dirty else f"{commit}.json")
+
+
+def find_results(identifier: str) -> StoredResults:
+    """
+    Finds stored results, either by path, or by git identifier.
+
+    Clean results are preferred over dirty ones.
+
+    Args:
+        identifier: Either a path to a results file, or a git identifier (hash, tag, branch, etc).
+    Returns:
+        The stored results.
+    """
+    if (path := Path(identifier)).is_file():
+        return StoredResults.load(path)
+
+    commit = get_git_commit_hash(identifier)
+    for dirty in (False, True):
+        if (path := get_results_file(commit, dirty)).is_file():
+            return StoredResults.load(path)
+
+    raise FileNotFoundError(f"No stored results for '{identifier}' ({commit})")
+
+
+def record(filters: list[str], rounds: int) -> StoredResults:
+    """
+    Runs the benchmarks, and stores the results under the current commit.
+
+    Args:
+        filters: The benchmark filters to use.
+        rounds: How many rounds to run each benchmark for.
+    Returns:
+        The new results.
+    """
+    results: list[BenchmarkResult] = []
+    for result in run_benchmarks(filters, rounds):
+        print_result(result)
+        results.append(result)
+
+    stored = StoredResults(
+        get_git_commit_hash(),
+        check_git_is_dirty(),
+        platform.python_version(),
+        results,
+    )
+    stored.save(path := get_results_file(stored.commit, stored.dirty))
+    print(f"Stored results in {path}")  # noqa: T201
+    return stored
+
+
+def classify(
+    baseline: BenchmarkResult,
+    current: BenchmarkResult,
+    tolerance: float,
+    sigmas: float,
+) -> str:
+    """
+    Classifies the change in a benchmark between two runs.
+
+    Args:
+        baseline: The baseline result.
+        current: The current result.
+        tolerance: The relative change which is allowed before counting as a regression.
+        sigmas: How many standard errors the difference must be larger than, to not count as noise.
+    Returns:
+        One of "regressed", "improved", or "ok".
+    """
+    diff = current.median - baseline.median
+    noise = sigmas * math.sqrt(
+        baseline.stdev**2 / len(baseline.timings) + current.stdev**2 / len(current.timings),
+    )
+    if abs(diff) <= noise or abs(diff) <= tolerance * baseline.median:
+        return "ok"
+    return "regressed" if diff > 0 else "improved"
+
+
+def check(
+    baseline: StoredResults,
+    current: StoredResults,
+    tolerances: dict[str, float],
+    default_tolerance: float,
+    sigmas: float,
+) -> bool:
+    """
+    Compares two sets of results, printing a summary.
+
+    Args:
+        baseline: The baseline results.
+        current: The results to check.
+        tolerances: Per group relative tolerances.
+        default_tolerance: The tolerance to use for groups without their own.
+        sigmas: How many standard errors a difference must be larger than, to not count as noise.
+    Returns:
+        True if nothing regressed.
+    """
+    if baseline.python != current.python:
+        print(  # noqa: T201
+            f"Warning: comparing results from different python versions ({baseline.python} vs"
+            f" {current.python})",
+        )
+
+    baseline_results = {result.full_name: result for result in baseline.results}
+    print(  # noqa: T201
+        f"Comparing {current.commit[:10]}{' (dirty)' if current.dirty else ''} against"
+        f" {baseline.commit[:10]}{' (dirty)' if baseline.dirty else ''}",
+    )
+    print(  # noqa: T201
+        f"{'status':<10} {'group':<12} {'name':<56}"
+        f" {'baseline (us)':>14} {'current (us)':>14} {'change':>8}",
+    )
+
+    passed = True
+    for result in current.results:
+        base = baseline_results.pop(result.full_name, None)
+        if base is None:
+            print(f"{'new':<10} {result.group:<12} {result.full_name:<56}")  # noqa: T201
+            continue
+
+        status = classify(base, result, tolerances.get(result.group, default_tolerance), sigmas)
+        passed = passed and status != "regressed"
+        print(  # noqa: T201
+            f"{status:<10} {result.group:<12} {result.full_name:<56}"
+            f" {base.median * 1e6:>14.2f} {result.median * 1e6:>14.2f}"
+            f" {(result.median - base.median) / base.median:>+8.1%}",
+        )
+
+    for base in baseline_results.values():
+        print(f"{'missing':<10} {base.group:<12} {base.full_name:<56}")  # noqa: T201
+
+    return passed
+
+
+def parse_tolerance(arg: str) -> tuple[str, float]:
+    group, _, value = arg.partition("=")
+    return group, float(value)
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Stores and compares benchmark results per git commit.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Run and store benchmarks.")
+    record_parser.add_argument("filters", nargs="*", help="Only run matching benchmarks.")
+    record_parser.add_argument("--rounds", type=int, default=10, help="How many rounds to run.")
+
+    check_parser = subparsers.add_parser("check", help="Compare results against a baseline.")
+    check_parser.add_argument(
+        "baseline",
+        help="The git identifier, or results file, to use as the baseline.",
+    )
+    check_parser.add_argument(
+        "--current",
+        help=(
+            "The git identifier, or results file, to check. If not given, runs the benchmarks"
+            " from the baseline, and stores them under the current commit."
+        ),
+    )
+    check_parser.add_argument("--rounds", type=int, default=10, help="How many rounds to run.")
+    check_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="The default relative slowdown allowed. Defaults to %(default)s.",
+    )
+    check_parser.add_argument(
+        "--group-tolerance",
+        type=parse_tolerance,
+        action="append",
+        default=[],
+        metavar="GROUP=TOLERANCE",
+        help="Overrides the tolerance for a specific group, e.g. 'menu=0.2'.",
+    )
+    check_parser.add_argument(
+        "--sigmas",
+        type=float,
+        default=DEFAULT_SIGMAS,
+        help=(
+            "How many standard errors a difference must be larger than to not be considered noise."
+            " Defaults to %(default)s."
+        ),
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.filters, args.rounds)
+        sys.exit(0)
+
+    baseline_results = find_results(args.baseline)
+    if args.current is not None:
+        current_results = find_results(args.current)
+    else:
+        current_results = record(
+            [result.full_name for result in baseline_results.results],
+            args.rounds,
+        )
+
+    tolerances: dict[str, Any] = dict(args.group_tolerance)
+    if not check(baseline_results, current_results, tolerances, args.tolerance, args.sigmas):
+        print("Performance regressed!")  # noqa: T201
+        sys.exit(1)
@@ -0,0 +1,210 @@
+"""
+A small benchmark runner, in the style of pytest-benchmark.
+
+Benchmarks are registered using the `benchmark` decorator. Each benchmark function is called once
+per set of params, to do any setup, and returns the zero-arg function to actually time. Each round
+runs the timed function enough times to take at least `MIN_ROUND_TIME`, and the per call times of
+all rounds are reported.
+"""
+
+import importlib.util
+import json
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+THIS_FOLDER = Path(__file__).parent
+STAND_IN_FOLDER = THIS_FOLDER / "stand_in"
+SRC_FOLDER = THIS_FOLDER.parent / "src"
+
+MIN_ROUND_TIME = 0.01
+
+
+@dataclass
+class Benchmark:
+    group: str
+    name: str
+    setup: Callable[..., Callable[[], Any]]
+    params: list[dict[str, Any]]
+
+
+@dataclass
+class BenchmarkResult:
+    group: str
+    name: str
+    params: dict[str, Any]
+    # Seconds per call, one per round
+    timings: list[float] = field(default_factory=list[float])
+
+    @property
+    def full_name(self) -> str:
+        if not self.params:
+            return self.name
+        return self.name + "[" + ",".join(f"{k}={v}" for k, v in self.params.items()) + "]"
+
+    @property
+    def min(self) -> float:
+        return min(self.timings)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.timings)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.timings)
+
+    @property
+    def stdev(self) -> float:
+        return statistics.stdev(self.timings) if len(self.timings) > 1 else 0
+
+
+all_benchmarks: list[Benchmark] = []
+
+
+def benchmark(
+    group: str,
+    params: list[dict[str, Any]] | None = None,
+) -> Callable[[Callable[..., Callable[[], Any]]], Callable[..., Callable[[], Any]]]:
+    """
+    Decorator which registers a benchmark.
+
+    Args:
+        group: The group the benchmark is part of, e.g. "discovery".
+        params: A list of kwargs to call the benchmark's setup function with, one per run. If None,
+                it's run once with no args.
+    Returns:
+        A decorator, which registers the setup function and returns it unchanged.
+    """
+
+    def decorator(setup: Callable[..., Callable[[], Any]]) -> Callable[..., Callable[[], Any]]:
+        all_benchmarks.append(Benchmark(group, setup.__name__, setup, params or [{}]))
+        return setup
+
+    return decorator
+
+
+def time_rounds(func: Callable[[], Any], rounds: int) -> list[float]:
+    """
+    Times a function.
+
+    Args:
+        func: The function to time.
+        rounds: How many rounds to time it for.
+    Returns:
+        The average time per call in each round, in seconds.
+    """
+    # Calibrate how many calls we need per round
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        if (time.perf_counter() - start) >= MIN_ROUND_TIME:
+            break
+        iterations *= 2
+
+    timings: list[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append((time.perf_counter() - start) / iterations)
+    return timings
+
+
+def run_benchmarks(filters: list[str], rounds: int) -> Iterator[BenchmarkResult]:
+    """
+    Runs all registered benchmarks.
+
+    Args:
+        filters: If not empty, only runs benchmarks whose group or full name contains one of these.
+        rounds: How many rounds to time each benchmark for.
+    Yields:
+        The result of each benchmark, as it finishes.
+    """
+    for bench in all_benchmarks:
+        for params in bench.params:
+            result = BenchmarkResult(bench.group, bench.name, params)
+            if filters and not any(f in result.full_name or f == bench.group for f in filters):
+                continue
+
+            result.timings = time_rounds(bench.setup(**params), rounds)
+            yield result
+
+
+def print_result(result: BenchmarkResult) -> None:
+    """
+    Prints a single benchmark result.
+
+    Args:
+        result: The result to print.
+    """
+    print(  # noqa: T201
+        f"{result.group:<12} {result.full_name:<56}"
+        f" {result.min * 1e6:>12.2f} {result.median * 1e6:>12.2f}"
+        f" {result.mean * 1e6:>12.2f} {result.stdev * 1e6:>10.2f}",
+    )
+
+
+def main() -> None:
+    """Main entry point, which runs all registered benchmarks from the command line."""
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Runs the registered benchmarks.")
+    parser.add_argument(
+        "filters",
+        nargs="*",
+        help="Only run benchmarks in these groups, or whose names contain these strings.",
+    )
+    parser.add_argument("--rounds", type=int, default=10, help="How many rounds to run.")
+    parser.add_argument("--json", type=Path, help="A file to write the full results to.")
+    args = parser.parse_args()
+
+    print(  # noqa: T201
+        f"{'group':<12} {'name':<56} {'min (us)':>12} {'median (us)':>12}"
+        f" {'mean (us)':>12} {'stdev (us)':>10}",
+    )
+    results: list[BenchmarkResult] = []
+    for result in run_benchmarks(args.filters, args.rounds):
+        print_result(result)
+        results.append(result)
+
+    if args.json is not None:
+        args.json.write_text(json.dumps([asdict(r) for r in results], indent=4), encoding="utf8")
+
+
+def load_real_module(name: str) -> ModuleType:
+    """
+    Loads one of the mod manager's real python modules, on top of the stand-ins.
+
+    The module's parent package is the stand-in, so any relative imports of native modules resolve
+    to stand-ins too.
+
+    Args:
+        name: The fully qualified name of the module to load, e.g. "keybinds.raw_keybinds".
+    Returns:
+        The loaded module.
+    """
+    if str(STAND_IN_FOLDER) not in sys.path:
+        sys.path.insert(0, str(STAND_IN_FOLDER))
+
+    if (module := sys.modules.get(name)) is not None:
+        return module
+
+    parent, _, _ = name.rpartition(".")
+    if parent:
+        importlib.import_module(parent)
+
+    path = SRC_FOLDER.joinpath(*name.split(".")).with_suffix(".py")
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
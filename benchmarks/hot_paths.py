@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of the pure python hot paths, run on top of the stand-in sdk.
+
+Covers:
+- Mod discovery over synthetic mods folders, of both loose folders and '.sdkmod's.
+- Importing synthetic mods through the `ModFinder`, with and without the sdkmod bytecode cache.
+- Running the init script's full boot sequence, both from source and in the release zip's layout.
+- Drawing the bl3 options menu, for large and deeply grouped option trees.
+- Replaying synthetic input streams through the reference keybind dispatcher.
+- Creating dialog boxes, and mapping the selected choice back when they're closed.
+- The hud message display hook, when it needs to queue messages.
+"""
+
+import atexit
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+from zipfile import ZipFile
+
+from harness import benchmark, load_real_module, main
+from init_script import load_init_script
+
+MOD_COUNTS = (100, 1000, 5000)
+OPTION_COUNTS = (100, 1000, 5000)
+OPTION_GROUP_SIZE = 10
+
+
+@cache
+def get_init_script() -> ModuleType:
+    return load_init_script()
+
+
+def make_temp_folder() -> Path:
+    folder = Path(tempfile.mkdtemp(prefix="oak_mod_manager_bench_"))
+    atexit.register(shutil.rmtree, folder, ignore_errors=True)
+    return folder
+
+
+@cache
+def make_mods_folder(count: int, kind: str) -> Path:
+    """
+    Creates a synthetic mods folder.
+
+    Args:
+        count: How many mods to create.
+        kind: Either "folder" or "zip", the type of mods to create.
+    Returns:
+        The path to the mods folder.
+    """
+    folder = make_temp_folder()
+    for idx in range(count):
+        name = f"BenchMod{idx}"
+        if kind == "folder":
+            (folder / name).mkdir()
+            (folder / name / "__init__.py").write_text("VALUE = 1\n")
+            (folder / name / "pyproject.toml").write_text(f'[project]\nname = "{name}"\n')
+        else:
+            with ZipFile(folder / f"{name}.sdkmod", "w") as zip_file:
+                zip_file.writestr(f"{name}/__init__.py", "VALUE = 1\n")
+                zip_file.writestr(f"{name}/pyproject.toml", f'[project]\nname = "{name}"\n')
+    return folder
+
+
+@benchmark(
+    "discovery",
+    [
+        {"count": count, "kind": kind, "indexed": indexed}
+        for count in MOD_COUNTS
+        for kind in ("folder", "zip")
+        for indexed in (False, True)
+    ],
+)
+def find_mods_to_import(count: int, kind: str, indexed: bool) -> Callable[[], Any]:
+    init_script = get_init_script()
+    folder = make_mods_folder(count, kind)
+
+    index = None
+    if indexed:
+        index = init_script.DiscoveryIndex()
+        init_script.find_mods_to_import([folder], index)
+
+    return lambda: init_script.find_mods_to_import([folder], index)
+
+
+@benchmark(
+    "import",
+    [
+        {"count": count, "kind": kind, "bytecode_cache": bytecode_cache}
+        for count in (10, 100)
+        for kind in ("folder", "zip")
+        for bytecode_cache in (False, True)
+        if kind == "zip" or not bytecode_cache
+    ],
+)
+def import_mods(count: int, kind: str, bytecode_cache: bool) -> Callable[[], Any]:
+    init_script = get_init_script()
+    # Keep the bytecode cache out of the repo's settings folder
+    init_script.BYTECODE_CACHE_DIR = make_temp_folder()
+
+    folder = make_mods_folder(count, kind)
+    mods = init_script.find_mods_to_import([folder])
+    finder = init_script.ModFinder(mods, bytecode_cache=bytecode_cache)
+
+    def run() -> None:
+        finder.install()
+        try:
+            for mod in mods:
+                init_script.import_mod(mod)
+        finally:
+            sys.meta_path.remove(finder)
+            for mod in mods:
+                del sys.modules[mod.module]
+
+    return run
+
+
+@benchmark("startup", [{"layout": layout} for layout in ("source", "release")])
+def boot_init_script(layout: str) -> Callable[[], Any]:
+    # The boot sequence imports everything and installs import hooks, so needs a fresh interpreter
+    # each time. This also means the release layout actually has to find the mod manager's modules
+    # itself, rather than picking up the stand-ins from an earlier benchmark.
+    command = (
+        sys.executable,
+        "-c",
+        f"import init_script; init_script.load_init_script(release_layout={layout == 'release'})",
+    )
+
+    def run() -> None:
+        subprocess.run(command, cwd=Path(__file__).parent, stdout=subprocess.DEVNULL, check=True)
+
+    return run
+
+
+def make_option_tree(count: int, depth: int) -> list[Any]:
+    """
+    Creates a synthetic tree of options.
+
+    Args:
+        count: How many non-grouped options to create.
+        depth: How many levels of grouped options to wrap them in.
+    Returns:
+        The list of top level options.
+    """
+    import mods_base
+
+    leaf_types: list[Callable[[int], Any]] = [
+        lambda idx: mods_base.ButtonOption(f"Button {idx}"),
+        lambda idx: mods_base.BoolOption(f"Bool {idx}", idx % 2 == 0),
+        lambda idx: mods_base.DropdownOption(f"Dropdown {idx}", "c", list("abcdefgh")),
+        lambda idx: mods_base.SliderOption(f"Slider {idx}", idx % 100),
+        lambda idx: mods_base.SpinnerOption(f"Spinner {idx}", "e", list("abcdefgh")),
+        lambda idx: mods_base.KeybindOption(f"Keybind {idx}", "F"),
+        lambda idx: mods_base.NestedOption(f"Nested {idx}", ()),
+    ]
+    level: list[Any] = [leaf_types[idx % len(leaf_types)](idx) for idx in range(count)]
+    for option in level[::13]:
+        option.is_hidden = True
+
+    for depth_idx in range(depth):
+        level = [
+            mods_base.GroupedOption(
+                f"Group {depth_idx}.{idx}",
+                level[idx : idx + OPTION_GROUP_SIZE],
+            )
+            for idx in range(0, len(level), OPTION_GROUP_SIZE)
+        ]
+    return level
+
+
+@benchmark(
+    "menu",
+    [{"count": count, "depth": depth} for count in OPTION_COUNTS for depth in (0, 1, 3)],
+)
+def draw_options(count: int, depth: int) -> Callable[[], Any]:
+    options_setup = load_real_module("bl3_mod_menu.options_setup")
+
+    import mods_base
+
+    options = make_option_tree(count, depth)
+    mod = mods_base.Mod("Bench Mod", options=options)
+    menu = object()
+
+    def run() -> None:
+        options_setup.option_stack[:] = [options_setup.OptionStackInfo(mod, [])]
+        options_setup.draw_options(menu, options, [])
+
+    return run
+
+
+@benchmark("keybinds", [{"events": events} for events in (100, 1000)])
+def reference_dispatch(events: int) -> Callable[[], Any]:
+    load_real_module("keybinds.recording")
+
+    import replay_inputs
+    from reference_dispatcher import ReferenceDispatcher
+
+    records = replay_inputs.synthesize_records(events)
+
+    dispatcher = ReferenceDispatcher()
+    log: replay_inputs.CallLog = []
+    replay_inputs.register_scenario(dispatcher, replay_inputs.get_keys(records), log)
+
+    def run() -> None:
+        replay_inputs.replay(dispatcher, records)
+        log.clear()
+
+    return run
+
+
+def make_dialog_choices(count: int) -> list[Any]:
+    dialog_box = load_real_module("bl3_mod_menu.dialog_box")
+    return [
+        dialog_box.DialogBoxChoice(f"Choice {idx}", close_on_select=False) for idx in range(count)
+    ]
+
+
+@benchmark("dialog", [{"choices": choices} for choices in (2, 10, 100, 1000)])
+def dialog_box_create(choices: int) -> Callable[[], Any]:
+    dialog_box = load_real_module("bl3_mod_menu.dialog_box")
+    choice_list = make_dialog_choices(choices)
+    return lambda: dialog_box.DialogBox("Header", choice_list, dont_show=True)
+
+
+@benchmark("dialog", [{"choices": choices} for choices in (2, 10, 100, 1000)])
+def dialog_box_closed_hook(choices: int) -> Callable[[], Any]:
+    import unrealsdk
+
+    dialog_box = load_real_module("bl3_mod_menu.dialog_box")
+    box = dialog_box.DialogBox("Header", make_dialog_choices(choices), dont_show=True)
+    box.on_press = lambda _: None
+    args = unrealsdk.unreal.WrappedStruct(ChoiceNameId=f"Choice {choices - 1}")
+
+    dialog_box._dialog_stack[:] = [box]
+    return lambda: dialog_box.DialogBox._on_dialog_closed_hook(None, args, None, None)
+
+
+@benchmark("hud")
+def display_rollout_hook_queued() -> Callable[[], Any]:
+    hud_message = load_real_module("ui_utils.hud_message")
+
+    import unrealsdk
+
+    # Pretend a message is already being displayed, so we don't actually start any timers
+    hud_message.display_timer = object()
+    args = unrealsdk.unreal.WrappedStruct(Title="Title", MESSAGE="Message", Duration=2.5)
+    return lambda: hud_message.display_rollout_hook(None, args, None, None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import atexit
+import importlib.util
+import shutil
+import sys
+import tempfile
+from collections.abc import Sequence
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec, PathFinder
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+from zipfile import ZipFile
+
+THIS_FOLDER = Path(__file__).parent
+STAND_IN_FOLDER = THIS_FOLDER / "stand_in"
+INIT_SCRIPT = THIS_FOLDER.parent / "src" / "__main__.py"
+
+# The sdk itself is built into the game, so it never comes from the mods folder
+SDK_STAND_INS = ("unrealsdk",)
+# `prepare_release.py` ships every mod manager module which doesn't contain a .pyd as a '.sdkmod'
+RELEASE_SDKMOD_STAND_INS = ("bl3_mod_menu", "mods_base", "ui_utils")
+
+
+class StandInFinder(MetaPathFinder):
+    """
+    Meta path finder which makes the stand-ins take priority over the real modules.
+
+    When run from source, the real modules are all in the mods folder, so the init script's own
+    finder would otherwise pick them up first.
+    """
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        """
+        Finds the spec for a top level stand-in module.
+
+        Args:
+            fullname: The fully qualified name of the module being imported.
+            path: The parent package's `__path__`, or None for top level modules.
+            target: The module being reloaded, if applicable.
+        Returns:
+            The module spec, or None if this isn't a stand-in.
+        """
+        if path is not None or not (STAND_IN_FOLDER / fullname).is_dir():
+            return None
+        return PathFinder.find_spec(fullname, [str(STAND_IN_FOLDER)], target)
+
+
+def make_release_layout() -> Path:
+    """
+    Recreates the release zip's layout in a temporary folder, using the stand-ins.
+
+    The sdk stand-ins are put in their own folder on `sys.path`. The mod manager module stand-ins
+    are put in the mods folder next to a copy of the init script - zipped up into '.sdkmod's if the
+    release ships them that way, or as loose folders otherwise.
+
+    Returns:
+        The path to the copy of the init script.
+    """
+    folder = Path(tempfile.mkdtemp(prefix="oak_mod_manager_release_"))
+    atexit.register(shutil.rmtree, folder, ignore_errors=True)
+
+    sdk_folder = folder / "sdk"
+    mods_folder = folder / "sdk_mods"
+    sdk_folder.mkdir()
+    mods_folder.mkdir()
+
+    for stand_in in STAND_IN_FOLDER.iterdir():
+        if not stand_in.is_dir() or stand_in.name == "__pycache__":
+            continue
+
+        if stand_in.name in SDK_STAND_INS:
+            shutil.copytree(stand_in, sdk_folder / stand_in.name)
+        elif stand_in.name in RELEASE_SDKMOD_STAND_INS:
+            with ZipFile(mods_folder / f"{stand_in.name}.sdkmod", "w") as zip_file:
+                for file in stand_in.glob("**/*.py"):
+                    zip_file.write(file, Path(stand_in.name) / file.relative_to(stand_in))
+        else:
+            shutil.copytree(
+                stand_in,
+                mods_folder / stand_in.name,
+                ignore=shutil.ignore_patterns("__pycache__"),
+            )
+
+    shutil.copy(INIT_SCRIPT, mods_folder / INIT_SCRIPT.name)
+
+    sys.path.insert(0, str(sdk_folder))
+    return mods_folder / INIT_SCRIPT.name
+
+
+def load_init_script(
+    config: dict[str, Any] | None = None,
+    *,
+    release_layout: bool = False,
+) -> ModuleType:
+    """
+    Runs the init script outside of the game, using the stand-in modules, and returns it.
+
+    The init script runs it's entire boot sequence on import, so this will also import everything in
+    the mods folder. Anything which needs the real sdk will fail to import, which is fine, we only
+    want access to the init script's functions afterwards.
+
+    Args:
+        config: The `mod_manager` config section to use.
+        release_layout: If true, runs the init script in a recreation of the release zip's layout,
+                        rather than from the repo's source folder.
+    Returns:
+        The init script module.
+    """
+    if release_layout:
+        init_script = make_release_layout()
+    else:
+        init_script = INIT_SCRIPT
+        if str(STAND_IN_FOLDER) not in sys.path:
+            sys.path.insert(0, str(STAND_IN_FOLDER))
+
+    import unrealsdk
+
+    # Don't want to leave any caches behind in the repo's settings folder
+    unrealsdk.config["mod_manager"] = {
+        "discovery_index": False,
+        "failed_import_cache": False,
+        "precompile_folder_mods": False,
+        **(config or {}),
+    }
+
+    meta_path = list(sys.meta_path)
+    if not release_layout:
+        sys.meta_path.insert(0, StandInFinder())
+
+    spec = importlib.util.spec_from_file_location("oak_mod_manager_init_script", init_script)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+    # The release layout only has stand-ins in its mods folder, so everything it imported is fine to
+    # keep using
+    if release_layout:
+        return module
+
+    # Remove any import hooks the boot sequence installed, so they don't skew results
+    sys.meta_path[:] = meta_path
+
+    # Unload anything the boot sequence managed to import out of the real mods folder, so that the
+    # stand-ins get used instead
+    src_folder = INIT_SCRIPT.parent
+    for name, imported in list(sys.modules.items()):
+        file = getattr(imported, "__file__", None)
+        if name != spec.name and file is not None and Path(file).is_relative_to(src_folder):
+            del sys.modules[name]
+
+    return module
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Compares import times with every '.sdkmod' on `sys.path`, against using the `ModFinder`.
+
+Two kinds of imports are measured:
+- Unrelated: Imports of modules which aren't mods, and which don't exist. This is the worst case,
+  every single path entry gets probed. It's also common - e.g. optional dependency checks.
+- Mod: Imports of one of the zipped mods.
+"""
+
+import contextlib
+import importlib
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from zipfile import ZipFile
+
+from init_script import load_init_script
+
+UNRELATED_IMPORTS = 200
+
+
+def make_mods(folder: Path, count: int) -> list[Path]:
+    """
+    Creates a set of synthetic '.sdkmod's.
+
+    Args:
+        folder: The folder to create them in.
+        count: How many mods to create.
+    Returns:
+        The paths of the created mods.
+    """
+    mods: list[Path] = []
+    for idx in range(count):
+        name = f"BenchMod{idx}"
+        path = folder / f"{name}.sdkmod"
+        with ZipFile(path, "w") as zip_file:
+            zip_file.writestr(f"{name}/__init__.py", "from . import inner  # noqa: F401\n")
+            zip_file.writestr(f"{name}/inner.py", "VALUE = 1\n")
+        mods.append(path)
+    return mods
+
+
+def time_imports(mods: list[Path]) -> tuple[float, float]:
+    """
+    Times importing unrelated modules, and all the given mods.
+
+    Args:
+        mods: The mods to import.
+    Returns:
+        A tuple of the average time of each unrelated import, and of each mod import, in seconds.
+    """
+    importlib.invalidate_caches()
+
+    start = time.perf_counter()
+    for idx in range(UNRELATED_IMPORTS):
+        with contextlib.suppress(ModuleNotFoundError):
+            importlib.import_module(f"not_a_real_module_{idx}")
+    unrelated = (time.perf_counter() - start) / UNRELATED_IMPORTS
+
+    start = time.perf_counter()
+    for mod in mods:
+        importlib.import_module(mod.stem)
+    mod_time = (time.perf_counter() - start) / len(mods)
+
+    for mod in mods:
+        for name in (mod.stem, f"{mod.stem}.inner"):
+            sys.modules.pop(name, None)
+
+    return unrelated, mod_time
+
+
+def with_sys_path(init_script: object, mods: list[Path]) -> tuple[float, float]:  # noqa: ARG001
+    original = list(sys.path)
+    sys.path.extend(str(mod) for mod in mods)
+    try:
+        return time_imports(mods)
+    finally:
+        sys.path[:] = original
+        sys.path_importer_cache.clear()
+
+
+def with_mod_finder(init_script: object, mods: list[Path]) -> tuple[float, float]:
+    finder = init_script.ModFinder(  # type: ignore
+        [init_script.ModInfo(mod.stem, mod) for mod in mods],  # type: ignore
+    )
+    finder.install()  # type: ignore
+    try:
+        return time_imports(mods)
+    finally:
+        sys.meta_path.remove(finder)
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Benchmarks mod import times as the mod count scales.")
+    parser.add_argument(
+        "counts",
+        nargs="*",
+        type=int,
+        default=[10, 100, 500, 1000, 2500],
+        help="The mod counts to benchmark.",
+    )
+    args = parser.parse_args()
+
+    init_script = load_init_script()
+
+    strategies: tuple[tuple[str, Callable[[object, list[Path]], tuple[float, float]]], ...] = (
+        ("sys.path", with_sys_path),
+        ("ModFinder", with_mod_finder),
+    )
+
+    print(f"{'mods':>6} {'strategy':>10} {'unrelated (us)':>15} {'mod (us)':>10}")  # noqa: T201
+    for count in args.counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            mods = make_mods(Path(tmp), count)
+            for name, strategy in strategies:
+                unrelated, mod_time = strategy(init_script, mods)
+                print(  # noqa: T201
+                    f"{count:>6} {name:>10} {unrelated * 1e6:>15.1f} {mod_time * 1e6:>10.1f}",
+                )
@@ -0,0 +1,122 @@
+"""
+Microbenchmarks of the native keybind registry, with a large number of binds registered.
+
+This needs the real native module, so must be run in game, using `pyexec`, e.g.:
+    pyexec ../../../../oak-mod-manager/benchmarks/native_keybinds.py
+
+Covers:
+- Registering and deregistering single binds, while the registry's full.
+- Deregistering every bind, in both registration and reverse order.
+- Pushing and popping a raw keybind frame, while the registry's full, on top of stacks of frames of
+  various depths.
+"""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+from keybinds import raw_keybinds
+from keybinds.keybinds import deregister_keybind, register_keybind
+
+BIND_COUNT = 10_000
+KEY_COUNT = 100
+CHURN_ROUNDS = 10_000
+PUSH_POP_ROUNDS = 1_000
+PUSH_POP_DEPTHS = (1, 10, 100)
+PUSH_POP_FRAME_BINDS = 10
+
+
+def callback() -> None:
+    pass
+
+
+def time_per_call(func: Callable[[], Any], rounds: int) -> float:
+    """
+    Times how long a function takes to run.
+
+    Args:
+        func: The function to time.
+        rounds: How many times to run it.
+    Returns:
+        The average time of each call, in seconds.
+    """
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+def fill_registry() -> list[Any]:
+    """
+    Registers `BIND_COUNT` binds, spread evenly across `KEY_COUNT` keys.
+
+    Returns:
+        The handles of all the registered binds.
+    """
+    return [
+        register_keybind(f"BenchKey{idx % KEY_COUNT}", None, False, lambda _: None)
+        for idx in range(BIND_COUNT)
+    ]
+
+
+def bench_churn() -> float:
+    handles = fill_registry()
+
+    def run() -> None:
+        deregister_keybind(register_keybind("BenchKey0", None, False, lambda _: None))
+
+    try:
+        return time_per_call(run, CHURN_ROUNDS)
+    finally:
+        for handle in handles:
+            deregister_keybind(handle)
+
+
+def bench_deregister_all(reverse: bool) -> float:
+    handles = fill_registry()
+    if reverse:
+        handles.reverse()
+
+    start = time.perf_counter()
+    for handle in handles:
+        deregister_keybind(handle)
+    return (time.perf_counter() - start) / len(handles)
+
+
+def bench_push_pop(depth: int) -> float:
+    handles = fill_registry()
+
+    for _ in range(depth):
+        raw_keybinds.push()
+        for idx in range(PUSH_POP_FRAME_BINDS):
+            raw_keybinds.add(f"BenchKey{idx}", None, callback)
+
+    def run() -> None:
+        raw_keybinds.push()
+        raw_keybinds.pop()
+
+    try:
+        return time_per_call(run, PUSH_POP_ROUNDS)
+    finally:
+        for _ in range(depth):
+            raw_keybinds.pop()
+        for handle in handles:
+            deregister_keybind(handle)
+
+
+def main() -> None:
+    print(f"With {BIND_COUNT} binds over {KEY_COUNT} keys:")  # noqa: T201
+    for name, func in (
+        ("register + deregister", bench_churn),
+        ("deregister all, in order", lambda: bench_deregister_all(reverse=False)),
+        ("deregister all, reversed", lambda: bench_deregister_all(reverse=True)),
+        *(
+            (f"raw push + pop, depth {depth}", lambda depth=depth: bench_push_pop(depth))
+            for depth in PUSH_POP_DEPTHS
+        ),
+    ):
+        print(f"{name:>26}: {func() * 1e6:>8.2f}us")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+A pure python reference implementation of the native keybind dispatcher, in `keybinds.cpp`.
+
+This mirrors all of `handle_key_event`'s rules, so that it can be used as a spec to compare the
+native implementation against, and to benchmark dispatch outside of the game:
+- Binds on any key are run before binds on the specific key. For each, binds not in any frame are
+  run before those in the top raw keybind frame. Binds in lower frames are not run.
+- Binds for each key are kept in registration order, but removing one swaps the last bind into its
+  place.
+- Raw binds are run before gameplay binds, and gameplay binds are not run while in a menu.
+- If any raw bind blocks, gameplay binds are not run.
+- Throttled repeats and mouse wheel ticks are dropped, but block if the last delivered event did.
+- Gestures only run once they complete.
+- Held keys (used for gesture modifiers) expire if they haven't had an event in a while, unless
+  they're a mouse button. Pushing or popping a frame releases all of them.
+
+Events are plain ints, rather than `EInputEvent`s. Rather than reading the clock, every event is
+given an explicit timestamp, in seconds.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from unrealsdk.hooks import Block
+
+from keybinds.keybinds import DEFAULT_TAP_WINDOW
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Container, Sequence
+
+IE_PRESSED = 0
+IE_RELEASED = 1
+IE_REPEAT = 2
+
+WHEEL_KEYS = frozenset({"MouseScrollUp", "MouseScrollDown"})
+MOUSE_BUTTONS = frozenset(
+    {
+        "LeftMouseButton",
+        "RightMouseButton",
+        "MiddleMouseButton",
+        "ThumbMouseButton",
+        "ThumbMouseButton2",
+    },
+)
+HELD_KEY_TIMEOUT = 2.0
+
+
+@dataclass
+class Gesture:
+    modifiers: Sequence[str] = ()
+    hold_time: float = 0.0
+    taps: int = 1
+    tap_window: float = DEFAULT_TAP_WINDOW
+
+    pressed: bool = False
+    hold_fired: bool = False
+    press_start: float = 0.0
+    tap_count: int = 0
+    last_tap: float = 0.0
+
+    def update(self, input_event: int, now: float, held_keys: Container[str]) -> bool:
+        """
+        Updates this gesture's state for a new event on its key.
+
+        Args:
+            input_event: What type of event it was.
+            now: The time of the current event.
+            held_keys: The keys which are currently held.
+        Returns:
+            True if the gesture completed on this event.
+        """
+        is_hold = self.hold_time > 0
+
+        if input_event == IE_PRESSED:
+            if not all(modifier in held_keys for modifier in self.modifiers):
+                self.pressed = False
+                self.tap_count = 0
+                return False
+
+            self.pressed = True
+            self.hold_fired = False
+            self.press_start = now
+            if is_hold:
+                return False
+
+            if self.tap_count > 0 and now - self.last_tap > self.tap_window:
+                self.tap_count = 0
+            self.tap_count += 1
+            self.last_tap = now
+
+            if self.tap_count >= self.taps:
+                self.tap_count = 0
+                return True
+            return False
+
+        if input_event in (IE_REPEAT, IE_RELEASED):
+            completed = (
+                is_hold
+                and self.pressed
+                and not self.hold_fired
+                and now - self.press_start >= self.hold_time
+            )
+            if completed:
+                self.hold_fired = True
+            if input_event == IE_RELEASED:
+                self.pressed = False
+            return completed
+
+        return False
+
+
+@dataclass(eq=False)
+class Keybind:
+    key: str | None
+    event: int | None
+    gameplay_bind: bool
+    callback: Callable[..., Any]
+    repeat_interval: float = 0.0
+    wheel_interval: float = 0.0
+    gesture: Gesture | None = None
+
+    idx: int = 0
+    last_repeat: float = 0.0
+    last_wheel: float = 0.0
+    wheel_press_delivered: bool = False
+    last_blocked: bool = False
+    throttled: bool = False
+    gesture_completed: bool = False
+
+    def is_throttled(self, is_wheel: bool, input_event: int, now: float) -> bool:
+        """
+        Checks if this bind should be skipped for the current event, due to its throttling.
+
+        Args:
+            is_wheel: True if the current event is for a mouse wheel key.
+            input_event: What type of event it was.
+            now: The time of the current event.
+        Returns:
+            True if the callback should not be run.
+        """
+        if input_event == IE_REPEAT:
+            return self.repeat_interval > 0 and now - self.last_repeat < self.repeat_interval
+
+        if is_wheel and self.wheel_interval > 0:
+            if input_event == IE_PRESSED:
+                self.wheel_press_delivered = False
+                return now - self.last_wheel < self.wheel_interval
+            if input_event == IE_RELEASED:
+                return not self.wheel_press_delivered
+
+        return False
+
+    def mark_delivered(self, is_wheel: bool, input_event: int, now: float) -> None:
+        """
+        Updates this bind's throttling state after it's been delivered an event.
+
+        Args:
+            is_wheel: True if the current event is for a mouse wheel key.
+            input_event: What type of event it was.
+            now: The time of the current event.
+        """
+        if input_event == IE_REPEAT:
+            self.last_repeat = now
+        elif is_wheel and input_event == IE_PRESSED:
+            self.last_wheel = now
+            self.wheel_press_delivered = True
+
+
+def is_block_sentinel(value: Any) -> bool:
+    return value is Block or isinstance(value, Block)
+
+
+@dataclass
+class ReferenceDispatcher:
+    keybinds: dict[str | None, list[Keybind]] = field(
+        default_factory=dict[str | None, list[Keybind]],
+    )
+    frames: list[dict[str | None, list[Keybind]]] = field(
+        default_factory=list[dict[str | None, list[Keybind]]],
+    )
+    handles: dict[Keybind, dict[str | None, list[Keybind]]] = field(
+        default_factory=dict[Keybind, dict[str | None, list[Keybind]]],
+    )
+    held_keys: dict[str, float] = field(default_factory=dict[str, float])
+
+    def _add(self, data: Keybind, registry: dict[str | None, list[Keybind]]) -> Keybind:
+        binds = registry.setdefault(data.key, [])
+        data.idx = len(binds)
+        binds.append(data)
+        self.handles[data] = registry
+        return data
+
+    def register_keybind(
+        self,
+        key: str | None,
+        event: int | None,
+        gameplay_bind: bool,
+        callback: Callable[..., Any],
+        *,
+        repeat_interval: float = 0.0,
+        wheel_interval: float = 0.0,
+        in_frame: bool = False,
+    ) -> Keybind:
+        """Equivalent of `keybinds.register_keybind`."""
+        if in_frame and not self.frames:
+            raise IndexError("Can't register keybind in frame, none are pushed!")
+        return self._add(
+            Keybind(key, event, gameplay_bind, callback, repeat_interval, wheel_interval),
+            self.frames[-1] if in_frame else self.keybinds,
+        )
+
+    def register_gesture(
+        self,
+        key: str,
+        gameplay_bind: bool,
+        callback: Callable[[], Any],
+        *,
+        modifiers: Sequence[str] = (),
+        hold_time: float = 0.0,
+        taps: int = 1,
+        tap_window: float = DEFAULT_TAP_WINDOW,
+    ) -> Keybind:
+        """Equivalent of `keybinds.register_gesture`."""
+        gesture = Gesture(tuple(modifiers), hold_time, taps, tap_window)
+        return self._add(
+            Keybind(key, None, gameplay_bind, callback, gesture=gesture),
+            self.keybinds,
+        )
+
+    def deregister_keybind(self, handle: Keybind) -> None:
+        """Equivalent of `keybinds.deregister_keybind`."""
+        registry = self.handles.pop(handle, None)
+        if registry is None:
+            return
+
+        binds = registry[handle.key]
+        last = binds.pop()
+        if last is not handle:
+            binds[handle.idx] = last
+            last.idx = handle.idx
+
+        if not binds:
+            del registry[handle.key]
+
+    def push_frame(self) -> None:
+        """Equivalent of `keybinds.push_frame`."""
+        self.frames.append({})
+        self.held_keys.clear()
+
+    def pop_frame(self) -> None:
+        """Equivalent of `keybinds.pop_frame`."""
+        if not self.frames:
+            raise IndexError("Can't pop raw keybind frame, none are pushed!")
+        for binds in self.frames.pop().values():
+            for data in binds:
+                del self.handles[data]
+        self.held_keys.clear()
+
+    def _update_held_keys(self, key: str, input_event: int, now: float) -> None:
+        self.held_keys = {
+            held: last_event
+            for held, last_event in self.held_keys.items()
+            if now - last_event <= HELD_KEY_TIMEOUT or held in MOUSE_BUTTONS
+        }
+
+        if input_event == IE_PRESSED or (input_event == IE_REPEAT and key in self.held_keys):
+            self.held_keys[key] = now
+        elif input_event == IE_RELEASED:
+            self.held_keys.pop(key, None)
+
+    def handle_key_event(  # noqa: C901 - kept as one function to mirror the native one
+        self,
+        key: str,
+        input_event: int,
+        in_menu: bool,
+        now: float,
+    ) -> bool:
+        """
+        Handles a key event.
+
+        Args:
+            key: The key's name.
+            input_event: What type of event it was.
+            in_menu: True if the event was done in a menu.
+            now: The time of the event.
+        Returns:
+            True if to block key processing, false to allow it through.
+        """
+        self._update_held_keys(key, input_event, now)
+        for data in self.keybinds.get(key, ()):
+            if data.gesture is not None:
+                data.gesture_completed = data.gesture.update(input_event, now, self.held_keys)
+
+        top_frame = self.frames[-1] if self.frames else {}
+        matching = [
+            data
+            for data in (
+                *self.keybinds.get(None, ()),
+                *top_frame.get(None, ()),
+                *self.keybinds.get(key, ()),
+                *top_frame.get(key, ()),
+            )
+            if (
+                data.gesture_completed
+                if data.gesture is not None
+                else data.event is None or data.event == input_event
+            )
+        ]
+        if not matching:
+            return False
+
+        has_gameplay_bind = any(data.gameplay_bind for data in matching)
+        dont_run_gameplay_binds = not has_gameplay_bind or in_menu
+        if dont_run_gameplay_binds and not any(not data.gameplay_bind for data in matching):
+            return False
+
+        is_wheel = key in WHEEL_KEYS
+        raw_throttled_block = False
+        gameplay_throttled_block = False
+        has_unthrottled_bind = False
+        for data in matching:
+            if data.gameplay_bind and dont_run_gameplay_binds:
+                continue
+
+            data.throttled = data.is_throttled(is_wheel, input_event, now)
+            if not data.throttled:
+                has_unthrottled_bind = True
+            elif data.last_blocked:
+                if data.gameplay_bind:
+                    gameplay_throttled_block = True
+                else:
+                    raw_throttled_block = True
+
+        if not has_unthrottled_bind:
+            return raw_throttled_block or gameplay_throttled_block
+
+        to_run = [data for data in matching if not data.throttled]
+        raw_binds = [data for data in to_run if not data.gameplay_bind]
+        gameplay_binds = [data for data in to_run if data.gameplay_bind]
+
+        def run_callbacks(binds: list[Keybind]) -> bool:
+            should_block = False
+            for data in binds:
+                data.mark_delivered(is_wheel, input_event, now)
+
+                args: list[Any] = []
+                if data.key is None:
+                    args.append(key)
+                if data.event is None and data.gesture is None:
+                    args.append(input_event)
+
+                data.last_blocked = is_block_sentinel(data.callback(*args))
+                if data.last_blocked:
+                    should_block = True
+            return should_block
+
+        if run_callbacks(raw_binds) or raw_throttled_block:
+            return True
+        return not dont_run_gameplay_binds and (
+            run_callbacks(gameplay_binds) or gameplay_throttled_block
+        )
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Replays recorded input streams through a keybind dispatcher.
+
+This is used both to benchmark dispatch, and to compare the semantics of different implementations.
+
+Recordings are made in game using `keybinds.recording.InputRecorder`. Outside of the game, they can
+only be replayed through the pure python reference dispatcher:
+    replay_inputs.py recording.kbrec
+    replay_inputs.py --synthesize 100000
+
+In game, they can also be replayed through the native dispatcher, and compared against the
+reference, e.g. using:
+    py import sys; sys.path.append("path/to/benchmarks"); import replay_inputs
+    py replay_inputs.compare_in_game("recording.kbrec")
+Note that replayed events get dispatched to any mod's binds which are enabled at the time too, so
+this is best done with as few mods enabled as possible.
+
+The same fixed scenario of binds is registered on both dispatchers, covering raw and gameplay binds,
+blocking, binds which remove themselves, throttling, and gestures. Every callback logs what it was
+called with, so two implementations agree if they make the same block decisions, and produce the
+same logs.
+"""
+
+import random
+import sys
+import time
+from collections.abc import Callable, Iterator, Sequence
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Protocol
+
+# Everything which depends on the sdk is imported lazily, since outside of the game the stand-ins
+# need to be put on the path first
+
+SYNTHETIC_KEYS = ("W", "A", "S", "D", "LeftControl", "E", "MouseScrollUp", "MouseScrollDown")
+SYNTHETIC_MENU_CHANCE = 0.02
+SYNTHETIC_CHORD_CHANCE = 0.2
+SYNTHETIC_REPEAT_CHANCE = 0.3
+
+
+class Record(Protocol):
+    @property
+    def timestamp(self) -> float: ...
+
+    @property
+    def key(self) -> str: ...
+
+    @property
+    def event(self) -> int: ...
+
+    @property
+    def in_menu(self) -> bool | None: ...
+
+
+class Dispatcher(Protocol):
+    def register_keybind(
+        self,
+        key: str | None,
+        event: int | None,
+        gameplay_bind: bool,
+        callback: Callable[..., Any],
+        *,
+        repeat_interval: float = 0.0,
+        wheel_interval: float = 0.0,
+        in_frame: bool = False,
+    ) -> Any: ...
+
+    def register_gesture(
+        self,
+        key: str,
+        gameplay_bind: bool,
+        callback: Callable[[], Any],
+        *,
+        modifiers: Sequence[str] = (),
+        hold_time: float = 0.0,
+        taps: int = 1,
+        tap_window: float = ...,
+    ) -> Any: ...
+
+    def deregister_keybind(self, handle: Any) -> None: ...
+
+    def push_frame(self) -> None: ...
+
+    def pop_frame(self) -> None: ...
+
+    def handle_key_event(self, key: str, input_event: int, in_menu: bool, now: float) -> bool: ...
+
+
+class NativeDispatcher:
+    """Adapts the native keybinds module to the same interface as the reference dispatcher."""
+
+    native: ModuleType
+    handles: list[Any]
+    frame_depth: int
+
+    def __init__(self) -> None:
+        from keybinds import keybinds
+
+        self.native = keybinds
+        self.handles = []
+        self.frame_depth = 0
+
+    def register_keybind(self, *args: Any, **kwargs: Any) -> Any:
+        handle = self.native.register_keybind(*args, **kwargs)
+        self.handles.append(handle)
+        return handle
+
+    def register_gesture(self, *args: Any, **kwargs: Any) -> Any:
+        handle = self.native.register_gesture(*args, **kwargs)
+        self.handles.append(handle)
+        return handle
+
+    def deregister_keybind(self, handle: Any) -> None:
+        self.native.deregister_keybind(handle)
+
+    def push_frame(self) -> None:
+        self.native.push_frame()
+        self.frame_depth += 1
+
+    def pop_frame(self) -> None:
+        self.native.pop_frame()
+        self.frame_depth -= 1
+
+    def handle_key_event(self, key: str, input_event: int, in_menu: bool, now: float) -> bool:
+        return self.native._handle_key_event(key, input_event, in_menu, now)
+
+    def close(self) -> None:
+        """Deregisters every bind and frame this dispatcher registered."""
+        for handle in self.handles:
+            self.native.deregister_keybind(handle)
+        self.handles.clear()
+        while self.frame_depth > 0:
+            self.pop_frame()
+
+
+type CallLog = list[tuple[str, tuple[Any, ...]]]
+
+
+def register_scenario(dispatcher: Dispatcher, keys: Sequence[str], log: CallLog) -> None:
+    """
+    Registers the fixed scenario of binds used when replaying.
+
+    Args:
+        dispatcher: The dispatcher to register the binds on.
+        keys: The keys in the recording, in order of first use.
+        log: The list each callback appends its name and args to.
+    """
+    from reference_dispatcher import IE_PRESSED, IE_REPEAT
+    from unrealsdk.hooks import Block
+
+    def make_callback(name: str, block_every: int = 0) -> Callable[..., Any]:
+        calls = 0
+
+        def callback(*args: Any) -> Any:
+            nonlocal calls
+            calls += 1
+            # Native calls get passed an enum, normalize it so logs compare equal
+            log.append((name, tuple(getattr(arg, "value", arg) for arg in args)))
+            if block_every and calls % block_every == 0:
+                return Block
+            return None
+
+        return callback
+
+    def make_one_shot(name: str, key: str) -> None:
+        handle = None
+
+        def callback() -> None:
+            log.append((name, ()))
+            dispatcher.deregister_keybind(handle)
+
+        handle = dispatcher.register_keybind(key, IE_PRESSED, False, callback)
+
+    dispatcher.register_keybind(None, None, False, make_callback("any"))
+    dispatcher.register_keybind(None, IE_PRESSED, True, make_callback("any_pressed", 7))
+
+    for idx, key in enumerate(keys):
+        dispatcher.register_keybind(key, IE_PRESSED, False, make_callback(f"{key}.raw", 5))
+        make_one_shot(f"{key}.one_shot", key)
+        dispatcher.register_keybind(key, None, True, make_callback(f"{key}.gameplay", 3))
+        dispatcher.register_keybind(
+            key,
+            IE_REPEAT,
+            True,
+            make_callback(f"{key}.repeat"),
+            repeat_interval=0.1,
+        )
+        dispatcher.register_keybind(
+            key,
+            None,
+            False,
+            make_callback(f"{key}.wheel", 4),
+            wheel_interval=0.05,
+        )
+        dispatcher.register_gesture(key, True, make_callback(f"{key}.double_tap"), taps=2)
+        dispatcher.register_gesture(key, False, make_callback(f"{key}.hold", 2), hold_time=0.5)
+        if idx > 0:
+            dispatcher.register_gesture(
+                key,
+                True,
+                make_callback(f"{key}.chord"),
+                modifiers=(keys[idx - 1],),
+            )
+
+    # Binds in lower frames should never run, only those in the top one
+    dispatcher.push_frame()
+    dispatcher.register_keybind(None, None, False, make_callback("buried"), in_frame=True)
+    dispatcher.push_frame()
+    dispatcher.register_keybind(
+        None,
+        IE_PRESSED,
+        False,
+        make_callback("frame_any", 6),
+        in_frame=True,
+    )
+    for key in keys:
+        dispatcher.register_keybind(
+            key,
+            None,
+            False,
+            make_callback(f"{key}.frame", 9),
+            in_frame=True,
+        )
+
+
+def replay(dispatcher: Dispatcher, records: Sequence[Record]) -> list[bool]:
+    """
+    Replays a set of input events through a dispatcher.
+
+    Args:
+        dispatcher: The dispatcher to use.
+        records: The events to replay.
+    Returns:
+        The block decision for each event.
+    """
+    blocks: list[bool] = []
+    in_menu = False
+    for record in records:
+        # The dispatcher only checks if it's in a menu when it needs to, if it didn't this event,
+        # assume nothing changed since the last one it did
+        if record.in_menu is not None:
+            in_menu = record.in_menu
+        blocks.append(
+            dispatcher.handle_key_event(record.key, record.event, in_menu, record.timestamp),
+        )
+    return blocks
+
+
+def get_keys(records: Sequence[Record]) -> list[str]:
+    return list(dict.fromkeys(record.key for record in records))
+
+
+def run_scenario(dispatcher: Dispatcher, records: Sequence[Record]) -> tuple[list[bool], CallLog]:
+    """
+    Registers the scenario on a dispatcher, and replays a set of input events through it.
+
+    Args:
+        dispatcher: The dispatcher to use.
+        records: The events to replay.
+    Returns:
+        A tuple of the block decision for each event, and the log of all callbacks.
+    """
+    log: CallLog = []
+    register_scenario(dispatcher, get_keys(records), log)
+    return replay(dispatcher, records), log
+
+
+def find_divergence(
+    records: Sequence[Record],
+    expected: tuple[list[bool], CallLog],
+    actual: tuple[list[bool], CallLog],
+) -> str | None:
+    """
+    Compares the results of two replays.
+
+    Args:
+        records: The events which were replayed.
+        expected: The block decisions and log from the reference replay.
+        actual: The block decisions and log from the replay to compare.
+    Returns:
+        A description of the first difference, or None if they're identical.
+    """
+    expected_blocks, expected_log = expected
+    actual_blocks, actual_log = actual
+
+    for idx, (record, expected_block, actual_block) in enumerate(
+        zip(records, expected_blocks, actual_blocks, strict=True),
+    ):
+        if expected_block != actual_block:
+            return (
+                f"Event {idx} ({record.key}, {record.event}, in_menu={record.in_menu}):"
+                f" expected block={expected_block}, got block={actual_block}"
+            )
+
+    for idx, (expected_call, actual_call) in enumerate(zip(expected_log, actual_log, strict=False)):
+        if expected_call != actual_call:
+            return f"Callback {idx}: expected {expected_call}, got {actual_call}"
+    if len(expected_log) != len(actual_log):
+        return f"Expected {len(expected_log)} callbacks, got {len(actual_log)}"
+
+    return None
+
+
+def synthesize_records(count: int, seed: int = 0) -> list[Any]:
+    """
+    Creates a synthetic, but plausible, input stream.
+
+    Keys are pressed, possibly repeated or with another key pressed while they're held, and
+    released, with the occasional burst of mouse wheel ticks, and the occasional trip into a menu.
+
+    Args:
+        count: Roughly how many events to create.
+        seed: The random seed to use.
+    Returns:
+        A list of input events.
+    """
+    from reference_dispatcher import IE_PRESSED, IE_RELEASED, IE_REPEAT
+
+    from keybinds.recording import InputRecord
+
+    rng = random.Random(seed)  # noqa: S311 - only needs to be reproducible, not secure
+    records: list[InputRecord] = []
+    now = 1000.0
+    in_menu = False
+
+    while len(records) < count:
+        now += rng.uniform(0.01, 0.2)
+        if rng.random() < SYNTHETIC_MENU_CHANCE:
+            in_menu = not in_menu
+
+        key = rng.choice(SYNTHETIC_KEYS)
+        if key.startswith("MouseScroll"):
+            for _ in range(rng.randint(1, 20)):
+                records.append(InputRecord(now, key, IE_PRESSED, in_menu))
+                records.append(InputRecord(now, key, IE_RELEASED, in_menu))
+                now += rng.uniform(0.005, 0.03)
+            continue
+
+        records.append(InputRecord(now, key, IE_PRESSED, in_menu))
+        if rng.random() < SYNTHETIC_CHORD_CHANCE:
+            # Press another key while this one's held, to try make a chord
+            other = rng.choice(SYNTHETIC_KEYS[:-2])
+            now += rng.uniform(0.02, 0.1)
+            records.append(InputRecord(now, other, IE_PRESSED, in_menu))
+            now += rng.uniform(0.02, 0.1)
+            records.append(InputRecord(now, other, IE_RELEASED, in_menu))
+        elif rng.random() < SYNTHETIC_REPEAT_CHANCE:
+            now += 0.5
+            for _ in range(rng.randint(1, 30)):
+                records.append(InputRecord(now, key, IE_REPEAT, in_menu))
+                now += 0.033
+        else:
+            now += rng.uniform(0.02, 0.3)
+        records.append(InputRecord(now, key, IE_RELEASED, in_menu))
+
+    return records
+
+
+def time_replay(make_dispatcher: Callable[[], Dispatcher], records: Sequence[Record]) -> float:
+    """
+    Times replaying a set of events through a fresh dispatcher with the scenario registered.
+
+    Args:
+        make_dispatcher: A function to create the dispatcher.
+        records: The events to replay.
+    Returns:
+        The average time per event, in seconds.
+    """
+    dispatcher = make_dispatcher()
+    register_scenario(dispatcher, get_keys(records), [])
+    start = time.perf_counter()
+    replay(dispatcher, records)
+    elapsed = time.perf_counter() - start
+    if isinstance(dispatcher, NativeDispatcher):
+        dispatcher.close()
+    return elapsed / len(records)
+
+
+def compare_in_game(path: Path | str) -> bool:
+    """
+    Replays a recording through both the native and reference dispatchers, and compares them.
+
+    Args:
+        path: The recording to replay.
+    Returns:
+        True if both implementations agreed.
+    """
+    from reference_dispatcher import ReferenceDispatcher
+
+    from keybinds.recording import read_recording
+
+    records = list(read_recording(Path(path)))
+
+    native = NativeDispatcher()
+    try:
+        actual = run_scenario(native, records)
+    finally:
+        native.close()
+    expected = run_scenario(ReferenceDispatcher(), records)
+
+    divergence = find_divergence(records, expected, actual)
+    print(f"{len(records)} events, {len(expected[1])} callbacks")  # noqa: T201
+    print(divergence or "Native and reference dispatchers agree")  # noqa: T201
+
+    for name, factory in (("native", NativeDispatcher), ("reference", ReferenceDispatcher)):
+        per_event = time_replay(factory, records)
+        print(f"{name:>10}: {per_event * 1e6:.2f}us per event")  # noqa: T201
+
+    return divergence is None
+
+
+def iter_records(args: Any) -> Iterator[Any]:
+    if args.synthesize:
+        yield from synthesize_records(args.synthesize, args.seed)
+    else:
+        from harness import load_real_module
+
+        yield from load_real_module("keybinds.recording").read_recording(args.recording)
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    from harness import load_real_module
+
+    # Make sure the recording module is loaded on top of the stand-ins
+    load_real_module("keybinds.recording")
+    from reference_dispatcher import ReferenceDispatcher
+
+    parser = ArgumentParser(
+        description="Replays input recordings through the reference dispatcher.",
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("recording", nargs="?", type=Path, help="The recording to replay.")
+    source.add_argument(
+        "--synthesize",
+        type=int,
+        metavar="COUNT",
+        help="Replay a synthetic input stream of roughly this many events instead.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="The seed for synthetic streams.")
+    parser.add_argument("--save", type=Path, help="Save the replayed stream as a recording.")
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="How many times to replay the stream. Defaults to 5.",
+    )
+    args = parser.parse_args()
+
+    records = list(iter_records(args))
+    if not records:
+        sys.exit("No events to replay")
+    if args.save:
+        load_real_module("keybinds.recording").write_recording(args.save, records)
+
+    blocks, log = run_scenario(ReferenceDispatcher(), records)
+    print(  # noqa: T201
+        f"{len(records)} events, {sum(blocks)} blocked, {len(log)} callbacks, over"
+        f" {len(get_keys(records))} keys",
+    )
+
+    timings = [time_replay(ReferenceDispatcher, records) for _ in range(args.rounds)]
+    print(  # noqa: T201
+        f"reference: {min(timings) * 1e6:.2f}us per event,"
+        f" {1 / min(timings):,.0f} events per second",
+    )
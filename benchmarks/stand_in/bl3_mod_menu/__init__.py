@@ -0,0 +1,2 @@
+# Stand-in for the bl3 mod menu package. The real python submodules get loaded into this package by
+# the benchmarks, on top of the stand-in native modules.
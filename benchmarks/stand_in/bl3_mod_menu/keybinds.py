@@ -0,0 +1,7 @@
+from typing import Any
+
+__all__: tuple[str, ...] = ("add_keybind_option",)
+
+
+def add_keybind_option(self: Any, option: Any) -> None:
+    pass
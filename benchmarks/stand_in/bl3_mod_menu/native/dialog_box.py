@@ -0,0 +1,8 @@
+# Stand-in for the native dialog box module, where everything's a no-op
+from typing import Any
+
+__all__: tuple[str, ...] = ("show_dialog_box",)
+
+
+def show_dialog_box(*args: Any) -> None:
+    pass
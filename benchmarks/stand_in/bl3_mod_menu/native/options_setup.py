@@ -0,0 +1,40 @@
+# Stand-in for the native options setup module, where everything's a no-op
+from typing import Any
+
+__all__: tuple[str, ...] = (
+    "add_binding",
+    "add_bool_spinner",
+    "add_button",
+    "add_dropdown",
+    "add_slider",
+    "add_spinner",
+    "add_title",
+)
+
+
+def add_title(*args: Any) -> None:
+    pass
+
+
+def add_slider(*args: Any) -> None:
+    pass
+
+
+def add_spinner(*args: Any) -> None:
+    pass
+
+
+def add_bool_spinner(*args: Any) -> None:
+    pass
+
+
+def add_dropdown(*args: Any) -> None:
+    pass
+
+
+def add_button(*args: Any) -> None:
+    pass
+
+
+def add_binding(*args: Any) -> None:
+    pass
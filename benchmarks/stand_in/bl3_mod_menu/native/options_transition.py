@@ -0,0 +1,15 @@
+# Stand-in for the native options transition module, where everything's a no-op
+from typing import Any
+
+__all__: tuple[str, ...] = (
+    "open_custom_options",
+    "refresh_options",
+)
+
+
+def open_custom_options(*args: Any) -> None:
+    pass
+
+
+def refresh_options(*args: Any) -> None:
+    pass
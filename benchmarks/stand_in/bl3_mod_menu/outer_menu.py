@@ -0,0 +1,3 @@
+import unrealsdk
+
+MAIN_PAUSE_MENU_CLS = unrealsdk.find_class("GFxMainAndPauseBaseMenu")
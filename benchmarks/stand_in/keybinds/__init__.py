@@ -0,0 +1,10 @@
+# Stand-in for the mod manager's keybinds package, which needs the native module. The real python
+# submodules get loaded into this package by the benchmarks, on top of the stand-in native module.
+
+
+def set_stats_enabled(enabled: bool) -> None:
+    pass
+
+
+def set_slow_callback_threshold(threshold: float) -> None:
+    pass
@@ -0,0 +1,62 @@
+# Stand-in for the native keybinds module, which just keeps track of what's registered
+from collections.abc import Callable
+from typing import Any
+
+from mods_base.keybinds import EInputEvent
+
+__all__: tuple[str, ...] = (
+    "DEFAULT_TAP_WINDOW",
+    "deregister_keybind",
+    "pop_frame",
+    "push_frame",
+    "register_keybind",
+)
+
+DEFAULT_TAP_WINDOW = 0.3
+
+registered: dict[int, tuple[str | None, EInputEvent | None, bool, Callable[..., Any]]] = {}
+frames: list[set[int]] = []
+_next_handle = 0
+
+
+def register_keybind(
+    key: str | None,
+    event: EInputEvent | None,
+    gameplay_bind: bool,
+    callback: Callable[..., Any],
+    *,
+    repeat_interval: float = 0.0,  # noqa: ARG001
+    wheel_interval: float = 0.0,  # noqa: ARG001
+    in_frame: bool = False,
+) -> int:
+    global _next_handle
+    _next_handle += 1
+    registered[_next_handle] = (key, event, gameplay_bind, callback)
+    if in_frame:
+        frames[-1].add(_next_handle)
+    return _next_handle
+
+
+def deregister_keybind(handle: int) -> None:
+    registered.pop(handle, None)
+    for frame in frames:
+        frame.discard(handle)
+
+
+def push_frame() -> None:
+    frames.append(set())
+
+
+def pop_frame() -> None:
+    for handle in frames.pop():
+        registered.pop(handle, None)
+
+
+def _invalidate_menu_state() -> None:
+    pass
+
+
+def _set_input_recorder(
+    recorder: Callable[[str, int, bool | None, float], None] | None,
+) -> None:
+    pass
@@ -0,0 +1,156 @@
+"""
+Stand-in for mods_base, implementing what the init script and the benchmarked menu code use.
+
+Options and mods are plain dataclasses with the same field names as the real ones, so that code
+reading them behaves the same, but none of the settings/hook/keybind machinery exists.
+"""
+
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from enum import Enum, Flag, auto
+from typing import Any
+
+from .keybinds import EInputEvent
+
+__all__: tuple[str, ...] = (
+    "ENGINE",
+    "BaseOption",
+    "BoolOption",
+    "ButtonOption",
+    "CoopSupport",
+    "DropdownOption",
+    "EInputEvent",
+    "Game",
+    "GroupedOption",
+    "KeybindOption",
+    "Mod",
+    "NestedOption",
+    "SliderOption",
+    "SpinnerOption",
+    "get_pc",
+    "hook",
+)
+
+ENGINE: Any = None
+
+
+class Game(Flag):
+    BL3 = auto()
+    WL = auto()
+
+    @staticmethod
+    def get_current() -> "Game":
+        return Game.BL3
+
+
+class CoopSupport(Enum):
+    Unknown = auto()
+    Incompatible = auto()
+    RequiresAllPlayers = auto()
+    ClientSide = auto()
+    HostOnly = auto()
+
+
+def get_pc(possibly_loading: bool = False) -> Any:  # noqa: ARG001
+    return None
+
+
+def hook(*args: Any, **kwargs: Any) -> Callable[[Any], Any]:  # noqa: ARG001
+    """Stand-in for the hook decorator, which leaves the function as is."""
+    return lambda func: func
+
+
+@dataclass
+class BaseOption:
+    identifier: str
+    description: str = field(default="", kw_only=True)
+    description_title: str = field(default=None, kw_only=True)  # type: ignore
+    is_hidden: bool = field(default=False, kw_only=True)
+    display_name: str = field(default=None, kw_only=True)  # type: ignore
+
+    def __post_init__(self) -> None:
+        if self.display_name is None:  # type: ignore
+            self.display_name = self.identifier
+        if self.description_title is None:  # type: ignore
+            self.description_title = self.display_name
+
+
+@dataclass
+class ButtonOption(BaseOption):
+    pass
+
+
+@dataclass
+class BoolOption(BaseOption):
+    value: bool = False
+    true_text: str | None = None
+    false_text: str | None = None
+    on_change: Callable[[Any, bool], None] | None = field(default=None, kw_only=True)
+
+
+@dataclass
+class DropdownOption(BaseOption):
+    value: str = ""
+    choices: list[str] = field(default_factory=list[str])
+
+
+@dataclass
+class SpinnerOption(BaseOption):
+    value: str = ""
+    choices: list[str] = field(default_factory=list[str])
+    wrap_enabled: bool = False
+
+
+@dataclass
+class SliderOption(BaseOption):
+    value: float = 0
+    min_value: float = 0
+    max_value: float = 100
+    step: float = 1
+    is_integer: bool = True
+
+
+@dataclass
+class KeybindOption(BaseOption):
+    value: str | None = None
+
+
+@dataclass
+class GroupedOption(BaseOption):
+    children: Sequence[BaseOption] = ()
+
+
+@dataclass
+class NestedOption(BaseOption):
+    children: Sequence[BaseOption] = ()
+
+
+@dataclass
+class Mod:
+    name: str
+    author: str = "Unknown Author"
+    description: str = ""
+    version: str = "Unknown Version"
+    supported_games: Game = Game.BL3 | Game.WL
+    coop_support: CoopSupport = CoopSupport.Unknown
+    keybinds: Sequence[Any] = ()
+    options: Sequence[BaseOption] = ()
+    hooks: Sequence[Any] = ()
+    commands: Sequence[Any] = ()
+    enabling_locked: bool = False
+    is_enabled: bool = False
+
+    def enable(self) -> None:
+        self.is_enabled = True
+
+    def disable(self, dont_update_setting: bool = False) -> None:  # noqa: ARG002
+        self.is_enabled = False
+
+    def get_status(self) -> str:
+        return "Enabled" if self.is_enabled else "Disabled"
+
+    def iter_display_options(self) -> Iterator[BaseOption]:
+        yield from self.options
+
+    def save_settings(self) -> None:
+        pass
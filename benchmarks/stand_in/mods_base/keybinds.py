@@ -0,0 +1,20 @@
+from enum import Enum
+
+from unrealsdk.hooks import Block
+
+__all__: tuple[str, ...] = (
+    "EInputEvent",
+    "KeybindBlockSignal",
+)
+
+
+class EInputEvent(Enum):
+    IE_Pressed = 0
+    IE_Released = 1
+    IE_Repeat = 2
+    IE_DoubleClick = 3
+    IE_Axis = 4
+    IE_MAX = 5
+
+
+type KeybindBlockSignal = Block | type[Block] | None
@@ -0,0 +1,24 @@
+from . import Mod
+
+__all__: tuple[str, ...] = (
+    "deregister_mod",
+    "mod_list",
+    "register_base_mod",
+    "register_mod",
+)
+
+mod_list: list[Mod] = []
+
+
+def register_mod(mod: Mod) -> None:
+    if mod not in mod_list:
+        mod_list.append(mod)
+
+
+def deregister_mod(mod: Mod) -> None:
+    if mod in mod_list:
+        mod_list.remove(mod)
+
+
+def register_base_mod() -> None:
+    pass
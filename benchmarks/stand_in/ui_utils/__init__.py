@@ -0,0 +1,2 @@
+# Stand-in for the ui utils package. The real python submodules get loaded into this package by the
+# benchmarks.
@@ -0,0 +1,36 @@
+"""
+Minimal stand-in for `unrealsdk`, just enough to run the init script and menu code headlessly.
+
+This is *not* a general purpose mock, it only implements what the benchmarks touch.
+"""
+
+from typing import Any
+
+from . import hooks, logging, unreal
+from .unreal import WrappedStruct
+
+__all__: tuple[str, ...] = (
+    "config",
+    "find_class",
+    "hooks",
+    "logging",
+    "make_struct",
+    "unreal",
+)
+
+config: dict[str, Any] = {}
+
+
+class _StandInObject:
+    def __getattr__(self, name: str) -> Any:
+        raise AttributeError(name)
+
+
+def find_class(name: str) -> Any:  # noqa: ARG001
+    """Stand-in for `unrealsdk.find_class`."""
+    return _StandInObject()
+
+
+def make_struct(struct_name: str, **fields: Any) -> WrappedStruct:  # noqa: ARG001
+    """Stand-in for `unrealsdk.make_struct`."""
+    return WrappedStruct(**fields)
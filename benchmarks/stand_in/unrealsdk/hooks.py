@@ -0,0 +1,27 @@
+from enum import Enum, auto
+from typing import Any
+
+__all__: tuple[str, ...] = (
+    "Block",
+    "Type",
+    "add_hook",
+    "remove_hook",
+)
+
+
+class Type(Enum):
+    PRE = auto()
+    POST = auto()
+    POST_UNCONDITIONAL = auto()
+
+
+class Block:
+    pass
+
+
+def add_hook(func: str, type: Type, identifier: str, callback: Any) -> None:  # noqa: A002
+    pass
+
+
+def remove_hook(func: str, type: Type, identifier: str) -> bool:  # noqa: A002, ARG001
+    return False
@@ -0,0 +1,60 @@
+from enum import Enum, auto
+
+__all__: tuple[str, ...] = (
+    "Level",
+    "Logger",
+    "dev_warning",
+    "error",
+    "info",
+    "is_console_ready",
+    "messages",
+    "misc",
+    "warning",
+)
+
+# Rather than printing, all log messages are stored here, so they don't drown out benchmark results
+messages: list[tuple[str, str]] = []
+
+
+class Level(Enum):
+    ERROR = auto()
+    WARNING = auto()
+    INFO = auto()
+    DEV_WARNING = auto()
+    MISC = auto()
+
+
+class Logger:
+    def __init__(self, level: Level) -> None:
+        self.level = level
+
+    def write(self, text: str) -> int:
+        messages.append((self.level.name, text))
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def error(msg: str) -> None:
+    messages.append((Level.ERROR.name, msg))
+
+
+def warning(msg: str) -> None:
+    messages.append((Level.WARNING.name, msg))
+
+
+def info(msg: str) -> None:
+    messages.append((Level.INFO.name, msg))
+
+
+def dev_warning(msg: str) -> None:
+    messages.append((Level.DEV_WARNING.name, msg))
+
+
+def misc(msg: str) -> None:
+    messages.append((Level.MISC.name, msg))
+
+
+def is_console_ready() -> bool:
+    return True
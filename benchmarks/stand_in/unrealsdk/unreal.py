@@ -0,0 +1,22 @@
+from typing import Any
+
+__all__: tuple[str, ...] = (
+    "BoundFunction",
+    "UObject",
+    "WrappedStruct",
+)
+
+
+class UObject:
+    pass
+
+
+class BoundFunction:
+    pass
+
+
+class WrappedStruct:
+    """Simple attribute bag, standing in for a struct."""
+
+    def __init__(self, **fields: Any) -> None:
+        self.__dict__.update(fields)
@@ -14,17 +14,35 @@
 from __future__ import annotations
 
 import contextlib
+import hashlib
+import heapq
 import importlib
+import importlib.util
 import json
+import marshal
+import math
+import mmap
+import os
+import py_compile
 import re
+import stat
+import struct
 import sys
+import threading
+import time
+import tomllib
 import traceback
 import warnings
 import zipfile
+import zipimport
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from functools import cache, wraps
+from functools import cache, partial, wraps
+from importlib.abc import InspectLoader, MetaPathFinder
+from importlib.machinery import ModuleSpec, PathFinder
 from pathlib import Path
-from typing import TYPE_CHECKING, TextIO
+from typing import TYPE_CHECKING, Any, TextIO, cast
 
 # Note we try to import as few third party modules as possible before the console is ready, in case
 # any of them cause errors we'd like to have logged
@@ -33,7 +51,22 @@ import unrealsdk
 from unrealsdk import logging
 
 if TYPE_CHECKING:
-    from collections.abc import Collection, Sequence
+    from collections.abc import Callable, Collection, Generator, Iterator, Sequence
+    from importlib.abc import Loader, ResourceReader
+    from os import stat_result
+    from types import CodeType, ModuleType
+
+    from mods_base import BaseOption, Mod
+
+    # The real type is created at runtime, by `get_placeholder_mod_type`
+    class PlaceholderMod(Mod):
+        mod_info: ModInfo | None
+        status: str
+        loaded_mods: list[Mod]
+
+        def load(self, profiler: StartupProfiler | None = None) -> list[Mod]:
+            """Imports the real mod, if not already imported."""
+
 
 # If true, displays the full traceback when a mod fails to import, rather than the shortened one
 FULL_TRACEBACKS: bool = False
@@ -41,12 +74,141 @@ FULL_TRACEBACKS: bool = False
 # happen at import time
 WAIT_FOR_CLIENT: bool = False
 
+SETTINGS_DIR = Path(__file__).parent / "settings"
+# Files which aren't settings, but which we still want to persist between launches. Since this
+# starts with a dot, it's ignored when looking for mods, and by anything iterating over settings.
+CACHE_DIR = SETTINGS_DIR / ".cache"
+
 
 @dataclass
 class ModInfo:
     module: str
     location: Path
     duplicates: list[ModInfo] = field(default_factory=list["ModInfo"])
+    # Filled in from the discovery index, or the first time it's needed, see `get_manifest_info`
+    manifest_info: ModManifestInfo | None = None
+
+    @property
+    def import_info(self) -> ModInfo:
+        """The info of the copy of this mod which will actually be imported."""
+        # All folders always have higher priority than any files
+        all_infos = (self, *self.duplicates)
+        return next(
+            (info for info in all_infos if info.location.suffix.lower() != ".sdkmod"),
+            self,
+        )
+
+    @property
+    def import_location(self) -> Path:
+        """The location this mod will actually be imported from."""
+        return self.import_info.location
+
+
+def get_config() -> dict[str, Any]:
+    """
+    Gets the mod manager section of the unrealsdk config.
+
+    Returns:
+        The `mod_manager` config dict, or an empty dict if it's not set/invalid.
+    """
+    config = unrealsdk.config.get("mod_manager", {})
+    if not isinstance(config, dict):
+        return {}
+    return config  # pyright: ignore[reportUnknownVariableType]
+
+
+def get_config_number[T: (int, float)](
+    key: str,
+    default: T,
+    min_value: T,
+    max_value: T | None = None,
+) -> T:
+    """
+    Gets a number from the mod manager section of the unrealsdk config.
+
+    Since this is used during init, an invalid value should never stop mods from loading, so falls
+    back to the default rather than throwing.
+
+    Args:
+        key: The config key to get.
+        default: The default value, used if the key is not set or is invalid. The returned value is
+                 converted to the same type.
+        min_value: The minimum allowed value.
+        max_value: The maximum allowed value, or None if unbounded.
+    Returns:
+        The config value, clamped to the given range.
+    """
+    raw_value = get_config().get(key, default)
+    try:
+        # Bools are technically ints, but `true` is almost certainly a mistake
+        if isinstance(raw_value, bool):
+            raise TypeError
+        value = type(default)(raw_value)
+    except (TypeError, ValueError, OverflowError):
+        log(logging.dev_warning, f"Invalid value for 'mod_manager.{key}' config, using {default}")
+        return default
+
+    # NaN compares false to everything, so would skip clamping
+    if isinstance(value, float) and math.isnan(value):
+        return default
+
+    value = max(value, min_value)
+    if max_value is not None:
+        value = min(value, max_value)
+    return value
+
+
+_log_capture = threading.local()
+
+
+@contextlib.contextmanager
+def capture_logs() -> Iterator[list[tuple[Callable[[str], None], str]]]:
+    """
+    Context manager which captures any messages logged via `log` on the current thread.
+
+    Rather than being printed, messages are stored in the returned list, as tuples of the log
+    function and the message, to be replayed later via `replay_logs`.
+
+    Yields:
+        The list captured messages are stored in.
+    """
+    previous = getattr(_log_capture, "records", None)
+    records: list[tuple[Callable[[str], None], str]] = []
+    _log_capture.records = records
+    try:
+        yield records
+    finally:
+        _log_capture.records = previous
+
+
+def log(log_func: Callable[[str], None], msg: str) -> None:
+    """
+    Logs a message, or captures it if running inside of `capture_logs`.
+
+    Args:
+        log_func: The logging function to use, e.g. `logging.error`.
+        msg: The message to log.
+    """
+    records: list[tuple[Callable[[str], None], str]] | None = getattr(
+        _log_capture,
+        "records",
+        None,
+    )
+    if records is None:
+        log_func(msg)
+    else:
+        records.append((log_func, msg))
+
+
+def replay_logs(records: Sequence[tuple[Callable[[str], None], str]]) -> None:
+    """
+    Logs all messages previously captured by `capture_logs`.
+
+    Args:
+        records: The captured messages.
+    """
+    for log_func, msg in records:
+        log(log_func, msg)
 
 
 def init_debugpy() -> None:
@@ -123,7 +285,8 @@ def validate_folder_in_mods_folder(folder: Path) -> bool:
     # Usually this silently fails - we import `MyCoolMod` but there's nothing there
     # Detect this and give a proper error message
     if not (folder / "__init__.py").exists() and (folder / folder.name / "__init__.py").exists():
-        logging.error(
+        log(
+            logging.error,
             f"'{folder.name}' appears to be double nested, which may prevent it from being it from"
             f" being loaded. Move the inner folder up a level.",
         )
@@ -134,7 +297,8 @@ def validate_folder_in_mods_folder(folder: Path) -> bool:
     # When this happens we're likely also double nested - `sdk_mods/My Cool Mod v1.2/MyCoolMod`
     # - but we can't detect that as easily, and the problem's the same anyway
     if "." in folder.name:
-        logging.error(
+        log(
+            logging.error,
             f"'{folder.name}' is not a valid python module - have you extracted the right folder?",
         )
         return False
@@ -151,8 +315,6 @@ def validate_file_in_mods_folder(file: Path) -> bool:
     """
     Checks if a folder inside the mods folder is actually a mod we should try import.
 
-    Sets up sys.path as required.
-
     Args:
         file: The file to analyse.
     Returns:
@@ -163,7 +325,8 @@ def validate_file_in_mods_folder(file: Path) -> bool:
         # about what we can
         # OHL often uses .url files to download the latest version of a mod, so also match that
         case ".bl3hotfix" | ".wlhotfix" | ".url":
-            logging.error(
+            log(
+                logging.error,
                 f"'{file.name}' appears to be a hotfix mod, not an SDK mod. Move it to your hotfix"
                 f" mods folder.",
             )
@@ -176,97 +339,2550 @@ def validate_file_in_mods_folder(file: Path) -> bool:
         case _:
             return False
 
-    valid_zip = False
+    archive = str(file)
+    root_name: str | None = None
+    single_root = True
+    directory: dict[str, zipfile.ZipInfo] = {}
+    with (
+        contextlib.suppress(zipfile.BadZipFile, OSError, ValueError),
+        contextlib.closing(iter_zip_central_directory(archive)) as zip_iter,
+    ):
+        for info in zip_iter:
+            entry_root = info.filename.partition("/")[0]
+            if root_name is None:
+                root_name = entry_root
+            elif entry_root != root_name:
+                # No need to look at the rest of the entries, we already know this is invalid
+                single_root = False
+                break
+            directory[info.filename] = info
+
+    valid_zip = single_root and root_name == file.stem
     name_suggestion: str | None = None
-    with contextlib.suppress(zipfile.BadZipFile, StopIteration, OSError):
-        zip_iter = zipfile.Path(file).iterdir()
-        zip_entry = next(zip_iter)
-        valid_zip = zip_entry.name == file.stem and next(zip_iter, None) is None
-
-        if (
-            not valid_zip
-            and (match := RE_NUMBERED_DUPLICATE.match(file.name))
-            and (base_name := match.group(1)) == zip_entry.name
-        ):
-            name_suggestion = base_name + ".sdkmod"
+    if valid_zip:
+        # Save the directory so the loader doesn't need to parse it again
+        sdkmod_directories[archive] = directory
+    elif (
+        root_name is not None
+        and (match := RE_NUMBERED_DUPLICATE.match(file.name))
+        and (base_name := match.group(1)) == root_name
+    ):
+        name_suggestion = base_name + ".sdkmod"
 
     if not valid_zip:
         error_msg = f"'{file.name}' does not appear to be valid, and has been ignored."
         if name_suggestion is not None:
             error_msg += f" Is it supposed to be called '{name_suggestion}'?"
-        logging.error(error_msg)
-        logging.dev_warning(
+        log(logging.error, error_msg)
+        log(
+            logging.dev_warning,
             "'.sdkmod' files must be a zip, and may only contain a single root folder, which must"
             " be named the same as the zip (excluding suffix).",
         )
         return False
 
-    str_path = str(file)
-    if str_path not in sys.path:
-        sys.path.append(str_path)
-
     return True
 
 
-def find_mods_to_import(all_mod_folders: Sequence[Path]) -> Collection[ModInfo]:
+DISCOVERY_INDEX_FILE = CACHE_DIR / "discovery_index.json"
+DISCOVERY_INDEX_VERSION = 2
+
+
+@dataclass
+class DiscoveryIndexEntry:
+    mtime_ns: int
+    size: int
+    is_dir: bool
+    module: str
+    # Only stored for '.sdkmod's - editing a folder mod's manifest doesn't change the folder's stat
+    dependencies: list[str] | None = None
+    deferred_import: bool = False
+
+
+@dataclass
+class DiscoveryIndex:
     """
-    Given the sequence of mod folders, find all individual mod modules within them to try import.
+    Persistent record of which entries in the mod folders were valid mods last launch.
+
+    Entries are keyed on their path, and store the stat signature they had when they were validated.
+    If an entry's signature hasn't changed, we can accept it without re-validating its contents -
+    which for '.sdkmod's means we skip opening the zip. '.sdkmod' entries also store the parts of
+    their manifest we need before importing, so we don't need to open the zip to read that either.
+
+    Only entries which validated cleanly get stored, anything which was invalid or which logged an
+    error is re-validated every launch, so that the user keeps seeing the messages about it.
+    """
+
+    entries: dict[str, DiscoveryIndexEntry] = field(
+        default_factory=dict[str, DiscoveryIndexEntry],
+    )
+    seen: set[str] = field(default_factory=set[str])
+    dirty: bool = False
+
+    @staticmethod
+    def load(path: Path = DISCOVERY_INDEX_FILE) -> DiscoveryIndex:
+        """
+        Loads the discovery index from disk.
+
+        Args:
+            path: The file to load from.
+        Returns:
+            The loaded index. If the file doesn't exist or is invalid, returns an empty index.
+        """
+        index = DiscoveryIndex()
+        try:
+            data = json.loads(path.read_text(encoding="utf8"))
+            if data["version"] != DISCOVERY_INDEX_VERSION:
+                return index
+            index.entries = {
+                entry_path: DiscoveryIndexEntry(**entry_data)
+                for entry_path, entry_data in data["entries"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            index.entries = {}
+        return index
+
+    def save(self, path: Path = DISCOVERY_INDEX_FILE) -> None:
+        """
+        Saves the discovery index to disk, if it was changed.
+
+        Any entries which weren't looked up or updated since loading are dropped.
+
+        Args:
+            path: The file to save to.
+        """
+        if self.seen != self.entries.keys():
+            self.entries = {k: v for k, v in self.entries.items() if k in self.seen}
+            self.dirty = True
+        if not self.dirty:
+            return
+
+        with contextlib.suppress(OSError):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                json.dumps(
+                    {
+                        "version": DISCOVERY_INDEX_VERSION,
+                        "entries": {k: vars(v) for k, v in self.entries.items()},
+                    },
+                    indent=4,
+                ),
+                encoding="utf8",
+            )
+        self.dirty = False
+
+    def lookup(self, entry: Path, entry_stat: stat_result) -> ModInfo | None:
+        """
+        Looks up an entry, to see if we can skip validating it.
+
+        Args:
+            entry: The path of the entry.
+            entry_stat: The entry's current stat result.
+        Returns:
+            The entry's mod info if it's unchanged since it was last validated, or None.
+        """
+        key = str(entry)
+        self.seen.add(key)
+
+        cached = self.entries.get(key)
+        if (
+            cached is None
+            or cached.mtime_ns != entry_stat.st_mtime_ns
+            or cached.size != entry_stat.st_size
+            or cached.is_dir != stat.S_ISDIR(entry_stat.st_mode)
+        ):
+            return None
+
+        mod_info = ModInfo(cached.module, entry)
+        if cached.dependencies is not None:
+            mod_info.manifest_info = ModManifestInfo(cached.dependencies, cached.deferred_import)
+        return mod_info
+
+    def update(self, entry: Path, entry_stat: stat_result, mod_info: ModInfo | None) -> None:
+        """
+        Updates an entry after validating it.
+
+        Args:
+            entry: The path of the entry.
+            entry_stat: The entry's stat result, from before it was validated.
+            mod_info: The entry's mod info if it validated cleanly, or None if it should be
+                      re-validated next launch.
+        """
+        key = str(entry)
+        self.seen.add(key)
+
+        if mod_info is None:
+            if self.entries.pop(key, None) is not None:
+                self.dirty = True
+            return
+
+        is_dir = stat.S_ISDIR(entry_stat.st_mode)
+        manifest_info = None if is_dir else get_manifest_info(mod_info)
+        self.entries[key] = DiscoveryIndexEntry(
+            mtime_ns=entry_stat.st_mtime_ns,
+            size=entry_stat.st_size,
+            is_dir=is_dir,
+            module=mod_info.module,
+            dependencies=None if manifest_info is None else manifest_info.dependencies,
+            deferred_import=manifest_info is not None and manifest_info.deferred_import,
+        )
+        self.dirty = True
+
+
+def discover_mod(entry: Path, index: DiscoveryIndex | None = None) -> ModInfo | None:
+    """
+    Checks if a single entry inside a mod folder is a mod we should try import.
+
+    Args:
+        entry: The entry to check.
+        index: If not None, the discovery index to check before validating, and to update after.
+    Returns:
+        The mod info for the entry, or None if it's not a valid mod.
+    """
+    try:
+        entry_stat = entry.stat()
+    except OSError:
+        return None
+
+    if index is not None and (cached := index.lookup(entry, entry_stat)) is not None:
+        return cached
+
+    mod_info: ModInfo | None = None
+    cacheable = False
+    if stat.S_ISDIR(entry_stat.st_mode):
+        if validate_folder_in_mods_folder(entry):
+            mod_info = ModInfo(entry.name, entry)
+            # Don't cache double nested folders, so they keep showing their error
+            cacheable = (entry / "__init__.py").exists()
+    elif stat.S_ISREG(entry_stat.st_mode) and validate_file_in_mods_folder(entry):
+        mod_info = ModInfo(entry.stem, entry)
+        cacheable = True
+
+    if index is not None:
+        index.update(entry, entry_stat, mod_info if cacheable else None)
+
+    return mod_info
+
+
+def list_mod_folder(folder: Path) -> list[Path]:
+    """
+    Lists all the entries in a mod folder which might be mods.
+
+    Args:
+        folder: The mod folder to list.
+    Returns:
+        A list of entries, in directory iteration order.
+    """
+    if not folder.exists():
+        return []
+    return [entry for entry in folder.iterdir() if not entry.name.startswith(".")]
+
+
+def discover_mod_captured(
+    entry: Path,
+    index: DiscoveryIndex | None,
+) -> tuple[ModInfo | None, list[tuple[Callable[[str], None], str]]]:
+    """
+    Wrapper around `discover_mod` which captures any messages it logs.
+
+    Args:
+        entry: The entry to check.
+        index: The discovery index to use, or None.
+    Returns:
+        A tuple of the mod info (or None if not a valid mod), and the messages which were logged.
+    """
+    with capture_logs() as records:
+        mod_info = discover_mod(entry, index)
+    return mod_info, records
+
+
+# Discovery is mostly waiting on disk, there's no benefit to more threads than this
+MAX_DISCOVERY_THREADS = 32
+
 
-    Any '.sdkmod's found are added to `sys.path` as part of this step.
+def find_mods_to_import(
+    all_mod_folders: Sequence[Path],
+    index: DiscoveryIndex | None = None,
+    max_workers: int = 1,
+) -> Collection[ModInfo]:
+    """
+    Given the sequence of mod folders, find all individual mod modules within them to try import.
 
     Args:
         all_mod_folders: A sequence of all mod folders to import from, in the order they are listed
                          in `sys.path`.
+        index: If not None, the discovery index to use to skip validating unchanged entries.
+        max_workers: If greater than 1, scans folders and validates entries concurrently, on a
+                     thread pool of this size. Results, and any messages logged, are processed in
+                     the same order as when running serially.
     Returns:
         A collection of the module names to import.
     """
+    all_entries: Sequence[Path]
+    discovered: Iterator[tuple[ModInfo | None, Sequence[tuple[Callable[[str], None], str]]]]
+
+    if max_workers > 1:
+        # `Executor.map` always yields results in submission order, so we're deterministic
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mod_discovery")
+        all_entries = [
+            entry for entries in executor.map(list_mod_folder, all_mod_folders) for entry in entries
+        ]
+        discovered = executor.map(partial(discover_mod_captured, index=index), all_entries)
+        executor.shutdown(wait=False)
+    else:
+        all_entries = [entry for folder in all_mod_folders for entry in list_mod_folder(folder)]
+        discovered = ((discover_mod(entry, index), ()) for entry in all_entries)
+
     mods_to_import: dict[str, ModInfo] = {}
 
-    for folder in all_mod_folders:
-        if not folder.exists():
+    for mod_info, records in discovered:
+        replay_logs(records)
+        if mod_info is None:
             continue
 
-        for entry in folder.iterdir():
-            if entry.name.startswith("."):
+        if mod_info.module in mods_to_import:
+            mods_to_import[mod_info.module].duplicates.append(mod_info)
+        else:
+            mods_to_import[mod_info.module] = mod_info
+
+    return mods_to_import.values()
+
+
+BYTECODE_CACHE_DIR = CACHE_DIR / "bytecode"
+# magic + flags + crc + size
+BYTECODE_CACHE_HEADER_SIZE = 16
+
+ZIP_EOCD_STRUCT = struct.Struct("<4s4H2LH")
+ZIP_EOCD64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+ZIP_EOCD64_STRUCT = struct.Struct("<4sQ2H2L4Q")
+ZIP_CENTRAL_DIR_STRUCT = struct.Struct("<4s6H3L5H2L")
+ZIP_EXTRA_HEADER_STRUCT = struct.Struct("<2H")
+ZIP_LOCAL_HEADER_STRUCT = struct.Struct("<4s5H3L2H")
+ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+ZIP_MAX_COMMENT = 0xFFFF
+ZIP_EOCD_SIGNATURE = b"PK\x05\x06"
+ZIP_EOCD64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP_EOCD64_SIGNATURE = b"PK\x06\x06"
+ZIP_CENTRAL_DIR_SIGNATURE = b"PK\x01\x02"
+# Stored in place of a size or offset which overflowed, to indicate the real value is in the zip64
+# extra field
+ZIP64_SENTINEL = 0xFFFFFFFF
+
+sdkmod_directories: dict[str, dict[str, zipfile.ZipInfo]] = {}
+
+
+def locate_zip_central_directory(data: mmap.mmap, archive: str) -> tuple[int, int, int, int]:
+    """
+    Finds the central directory of a zip, using its end of central directory record(s).
+
+    Args:
+        data: The zip's contents.
+        archive: The path to the zip, used in error messages.
+    Returns:
+        A tuple of the central directory's start position, the position it must end by, the number
+        of entries in it, and the offset to add to any other positions stored in the zip, to account
+        for any data prepended to it.
+    """
+    eocd_pos = data.rfind(
+        ZIP_EOCD_SIGNATURE,
+        max(0, len(data) - ZIP_EOCD_STRUCT.size - ZIP_MAX_COMMENT),
+    )
+    if eocd_pos < 0 or eocd_pos + ZIP_EOCD_STRUCT.size > len(data):
+        raise zipfile.BadZipFile(f"Couldn't find end of central directory in {archive}")
+
+    _, _, _, _, num_entries, cd_size, cd_offset, _ = ZIP_EOCD_STRUCT.unpack_from(data, eocd_pos)
+    cd_end = eocd_pos
+
+    locator_pos = eocd_pos - ZIP_EOCD64_LOCATOR_STRUCT.size
+    if locator_pos >= 0 and data[locator_pos : locator_pos + 4] == ZIP_EOCD64_LOCATOR_SIGNATURE:
+        _, _, eocd64_offset, _ = ZIP_EOCD64_LOCATOR_STRUCT.unpack_from(data, locator_pos)
+        eocd64_pos = locator_pos - ZIP_EOCD64_STRUCT.size
+        if data[eocd64_pos : eocd64_pos + 4] != ZIP_EOCD64_SIGNATURE:
+            raise zipfile.BadZipFile(f"Bad zip64 end of central directory in {archive}")
+        eocd64 = ZIP_EOCD64_STRUCT.unpack_from(data, eocd64_pos)
+        num_entries, cd_size, cd_offset = eocd64[-3:]
+        cd_end = eocd64_pos
+        # Any data prepended to the zip shifts where everything actually is
+        concat = eocd64_pos - eocd64_offset
+    else:
+        concat = eocd_pos - cd_size - cd_offset
+
+    pos = cd_offset + concat
+    if pos < 0 or pos + cd_size > cd_end:
+        raise zipfile.BadZipFile(f"Bad central directory offset in {archive}")
+
+    return pos, cd_end, num_entries, concat
+
+
+def read_zip_central_directory_entry(
+    data: mmap.mmap,
+    pos: int,
+    cd_end: int,
+    archive: str,
+) -> tuple[zipfile.ZipInfo, int]:
+    """
+    Reads a single entry out of a zip's central directory.
+
+    Args:
+        data: The zip's contents.
+        pos: The position of the entry.
+        cd_end: The position the central directory must end by.
+        archive: The path to the zip, used in error messages.
+    Returns:
+        A tuple of the entry's zip info, and the position of the next entry. The header offset is
+        not adjusted for any data prepended to the zip.
+    """
+    if pos + ZIP_CENTRAL_DIR_STRUCT.size > cd_end:
+        raise zipfile.BadZipFile(f"Truncated central directory in {archive}")
+    (
+        signature,
+        _,
+        _,
+        flag_bits,
+        compress_type,
+        dos_time,
+        dos_date,
+        crc,
+        compress_size,
+        file_size,
+        name_len,
+        extra_len,
+        comment_len,
+        _,
+        _,
+        external_attr,
+        header_offset,
+    ) = ZIP_CENTRAL_DIR_STRUCT.unpack_from(data, pos)
+    if signature != ZIP_CENTRAL_DIR_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad central directory entry in {archive}")
+    pos += ZIP_CENTRAL_DIR_STRUCT.size
+
+    name_bytes = data[pos : pos + name_len]
+    pos += name_len
+    extra = data[pos : pos + extra_len]
+    pos += extra_len + comment_len
+
+    try:
+        filename = name_bytes.decode("utf8" if flag_bits & 0x800 else "cp437")
+    except UnicodeDecodeError:
+        raise zipfile.BadZipFile(f"Bad entry name in {archive}") from None
+
+    info = zipfile.ZipInfo(
+        filename,
+        (
+            (dos_date >> 9) + 1980,
+            (dos_date >> 5) & 0xF,
+            dos_date & 0x1F,
+            dos_time >> 11,
+            (dos_time >> 5) & 0x3F,
+            (dos_time & 0x1F) * 2,
+        ),
+    )
+    info.flag_bits = flag_bits
+    info.compress_type = compress_type
+    info.CRC = crc
+    info.external_attr = external_attr
+    info.extra = extra
+
+    # Zip64 sizes and offsets are stored in an extra field, in this order, but only if the regular
+    # field overflowed
+    sizes = [file_size, compress_size, header_offset]
+    if ZIP64_SENTINEL in sizes:
+        zip64_values = iter(read_zip64_extra(extra))
+        try:
+            sizes = [next(zip64_values) if value == ZIP64_SENTINEL else value for value in sizes]
+        except StopIteration:
+            raise zipfile.BadZipFile(f"Bad zip64 extra field in {archive}") from None
+
+    info.file_size, info.compress_size, info.header_offset = sizes
+    return info, pos
+
+
+def iter_zip_central_directory(archive: str) -> Generator[zipfile.ZipInfo]:
+    """
+    Iterates over the central directory of a zip, without reading any of the rest of the file.
+
+    The zip is memory mapped, so only the pages containing the end of central directory record and
+    the central directory itself ever get read. Since this is a generator, callers may stop early,
+    in which case the rest of the central directory isn't read either.
+
+    Args:
+        archive: The path to the zip.
+    Yields:
+        The zip info of each entry, in the order they're stored.
+    """
+    with open(archive, "rb") as file:  # noqa: PTH123
+        # Can't map an empty file, but we already know it's not a valid zip
+        if os.fstat(file.fileno()).st_size == 0:
+            raise zipfile.BadZipFile(f"{archive} is empty")
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with data:
+        pos, cd_end, num_entries, concat = locate_zip_central_directory(data, archive)
+        for _ in range(num_entries):
+            info, pos = read_zip_central_directory_entry(data, pos, cd_end, archive)
+            info.header_offset += concat
+            yield info
+
+
+def read_zip64_extra(extra: bytes) -> list[int]:
+    """
+    Reads the values out of the zip64 extended information extra field of a central directory entry.
+
+    Args:
+        extra: The entry's full extra data.
+    Returns:
+        The values in the zip64 field, or an empty list if there isn't one.
+    """
+    pos = 0
+    while pos + ZIP_EXTRA_HEADER_STRUCT.size <= len(extra):
+        header_id, size = ZIP_EXTRA_HEADER_STRUCT.unpack_from(extra, pos)
+        pos += ZIP_EXTRA_HEADER_STRUCT.size
+        if header_id == 0x0001:
+            field_data = extra[pos : pos + size]
+            return [
+                int.from_bytes(field_data[idx : idx + 8], "little")
+                for idx in range(0, len(field_data) - 7, 8)
+            ]
+        pos += size
+    return []
+
+
+def get_sdkmod_directory(archive: str) -> dict[str, zipfile.ZipInfo]:
+    """
+    Gets the central directory of a '.sdkmod', parsing it if this is the first time it's used.
+
+    If the mod was validated this launch, this reuses the directory parsed during validation.
+
+    Args:
+        archive: The path to the '.sdkmod'.
+    Returns:
+        A dict mapping entry names to their zip info.
+    """
+    directory = sdkmod_directories.get(archive)
+    if directory is None:
+        directory = {info.filename: info for info in iter_zip_central_directory(archive)}
+        sdkmod_directories[archive] = directory
+    return directory
+
+
+def read_sdkmod_entry(archive: str, info: zipfile.ZipInfo) -> bytes:
+    """
+    Reads a single entry out of a '.sdkmod', using it's already parsed zip info.
+
+    Args:
+        archive: The path to the '.sdkmod'.
+        info: The zip info of the entry to read.
+    Returns:
+        The entry's uncompressed contents.
+    """
+    if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        # Rare enough to not be worth handling ourselves
+        with zipfile.ZipFile(archive) as zip_file:
+            return zip_file.read(info)
+
+    with open(archive, "rb") as file:  # noqa: PTH123
+        file.seek(info.header_offset)
+        local_header = file.read(ZIP_LOCAL_HEADER_STRUCT.size)
+        if (
+            len(local_header) != ZIP_LOCAL_HEADER_STRUCT.size
+            or local_header[:4] != ZIP_LOCAL_HEADER_SIGNATURE
+        ):
+            raise zipfile.BadZipFile(f"Bad local file header for {info.filename} in {archive}")
+
+        *_, name_len, extra_len = ZIP_LOCAL_HEADER_STRUCT.unpack(local_header)
+        file.seek(name_len + extra_len, os.SEEK_CUR)
+        data = file.read(info.compress_size)
+
+    if info.compress_type == zipfile.ZIP_DEFLATED:
+        data = zlib.decompress(data, -zlib.MAX_WBITS)
+    if zlib.crc32(data) != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC for {info.filename} in {archive}")
+    return data
+
+
+def get_sdkmod_filename(archive: str, info: zipfile.ZipInfo) -> str:
+    """
+    Gets the filename to use for an entry inside a '.sdkmod'.
+
+    Args:
+        archive: The path to the '.sdkmod'.
+        info: The zip info of the entry.
+    Returns:
+        The entry's filename.
+    """
+    return os.path.join(archive, *info.filename.split("/"))  # noqa: PTH118
+
+
+def get_sdkmod_code(archive: str, info: zipfile.ZipInfo, filename: str) -> CodeType:
+    """
+    Gets the code object for a python file inside a '.sdkmod', using the bytecode cache.
+
+    Python's zipimport never writes bytecode, so without this zipped mods would get recompiled from
+    source every launch. Cache files are named after the zip path and entry name, and store the
+    entry's CRC, so they get invalidated (and overwritten) whenever the mod is updated.
+
+    Args:
+        archive: The path to the '.sdkmod'.
+        info: The zip info of the python file.
+        filename: The filename to use for the compiled code object.
+    Returns:
+        The compiled code object.
+    """
+    key = hashlib.sha1(f"{archive}\0{info.filename}".encode(), usedforsecurity=False).hexdigest()
+    cache_file = BYTECODE_CACHE_DIR / f"{key}.pyc"
+    expected_header = (
+        importlib.util.MAGIC_NUMBER
+        + (0).to_bytes(4, "little")
+        + info.CRC.to_bytes(4, "little")
+        + (info.file_size & 0xFFFFFFFF).to_bytes(4, "little")
+    )
+
+    with contextlib.suppress(OSError, ValueError, EOFError, TypeError):
+        data = cache_file.read_bytes()
+        if data[:BYTECODE_CACHE_HEADER_SIZE] == expected_header:
+            return marshal.loads(data[BYTECODE_CACHE_HEADER_SIZE:])  # noqa: S302 - our own cache
+
+    code = compile(read_sdkmod_entry(archive, info), filename, "exec", dont_inherit=True)
+
+    if not sys.dont_write_bytecode:
+        with contextlib.suppress(OSError):
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first, in case multiple threads are warming the same entry
+            temp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+            temp_file.write_bytes(expected_header + marshal.dumps(code))
+            temp_file.replace(cache_file)
+
+    return code
+
+
+def warm_sdkmod_bytecode(mods: Collection[ModInfo], stop: threading.Event) -> None:
+    """
+    Fills the bytecode cache for every python file in every '.sdkmod' which will be imported.
+
+    Args:
+        mods: The mods to warm.
+        stop: An event which, when set, causes this to stop early.
+    """
+    for mod in mods:
+        archive = str(mod.import_location)
+        if not archive.lower().endswith(".sdkmod"):
+            continue
+
+        try:
+            directory = get_sdkmod_directory(archive)
+        except (OSError, zipfile.BadZipFile):
+            continue
+
+        for info in directory.values():
+            if stop.is_set():
+                return
+            if not info.filename.endswith(".py"):
                 continue
 
-            mod_info: ModInfo
-            if entry.is_dir() and validate_folder_in_mods_folder(entry):
-                mod_info = ModInfo(entry.name, entry)
+            # Any errors will be properly reported when the mod actually gets imported
+            with contextlib.suppress(
+                SyntaxError,
+                ValueError,
+                OSError,
+                zipfile.BadZipFile,
+                zlib.error,
+            ):
+                get_sdkmod_code(archive, info, get_sdkmod_filename(archive, info))
+
 
-            elif entry.is_file() and validate_file_in_mods_folder(entry):
-                mod_info = ModInfo(entry.stem, entry)
+def is_bytecode_fresh(source: str, source_stat: os.stat_result) -> bool:
+    """
+    Checks if a source file's `__pycache__` entry is up to date, the same way import would.
+
+    Args:
+        source: The path to the source file.
+        source_stat: The stat result of the source file.
+    Returns:
+        True if the cached bytecode is up to date.
+    """
+    try:
+        with open(importlib.util.cache_from_source(source), "rb") as file:  # noqa: PTH123
+            header = file.read(16)
+    except (OSError, ValueError, NotImplementedError):
+        return False
+
+    return (
+        header[:4] == importlib.util.MAGIC_NUMBER
+        and header[4:8] == b"\0\0\0\0"
+        and int.from_bytes(header[8:12], "little") == (int(source_stat.st_mtime) & 0xFFFFFFFF)
+        and int.from_bytes(header[12:16], "little") == (source_stat.st_size & 0xFFFFFFFF)
+    )
+
+
+def precompile_folder_mods(
+    mods: Collection[ModInfo],
+    stop: threading.Event,
+    compiled: dict[str, int],
+) -> None:
+    """
+    Compiles every out of date python file in every folder mod which will be imported.
+
+    Args:
+        mods: The mods to compile.
+        stop: An event which, when set, causes this to stop early.
+        compiled: A dict to fill with the path of each file compiled, mapped to the time it took,
+                  in nanoseconds.
+    """
+    if sys.dont_write_bytecode:
+        return
+
+    for mod in mods:
+        location = mod.import_location
+        if not location.is_dir():
+            continue
+
+        for root, dirs, files in os.walk(location):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__" and not d.startswith("."))
+            for name in sorted(files):
+                if stop.is_set():
+                    return
+                if not name.endswith(".py"):
+                    continue
+
+                source = os.path.join(root, name)  # noqa: PTH118
+                try:
+                    if is_bytecode_fresh(source, os.stat(source)):  # noqa: PTH116
+                        continue
+
+                    start = time.perf_counter_ns()
+                    py_compile.compile(
+                        source,
+                        doraise=True,
+                        invalidation_mode=py_compile.PycInvalidationMode.TIMESTAMP,
+                    )
+                    compiled[os.path.normcase(os.path.abspath(source))] = (  # noqa: PTH100
+                        time.perf_counter_ns() - start
+                    )
+                except (py_compile.PyCompileError, OSError, ValueError):
+                    # Any errors will be properly reported when the mod actually gets imported
+                    continue
+
+
+def report_precompile_savings(compiled: dict[str, int]) -> None:
+    """
+    Logs how much import time was saved by precompiling folder mods.
+
+    Args:
+        compiled: The dict of files which were compiled, filled by `precompile_folder_mods`.
+    """
+    imported_files = {
+        os.path.normcase(os.path.abspath(file))  # noqa: PTH100
+        for module in list(sys.modules.values())
+        if isinstance(file := getattr(module, "__file__", None), str)
+    }
+    saved = [ns for source, ns in compiled.items() if source in imported_files]
+    if not saved:
+        return
+
+    logging.info(
+        f"Precompiled {len(saved)} folder mod file(s) in the background, saving"
+        f" {sum(saved) / 1e6:.2f}ms during import.",
+    )
+
+
+class SdkmodLoader(InspectLoader):
+    """
+    Loader for python files inside a '.sdkmod', which caches their bytecode.
+
+    Like a `zipimporter`, each loader handles a single folder inside the zip.
+    """
+
+    archive: str
+    prefix: str
+
+    def __init__(self, archive: str, prefix: str = "") -> None:
+        """
+        Creates a new loader.
+
+        Args:
+            archive: The path to the '.sdkmod'.
+            prefix: The folder inside the zip this loader handles, using forward slashes, with a
+                    trailing slash. An empty string for the root.
+        """
+        self.archive = archive
+        self.prefix = prefix
+
+    def _get_entry(self, fullname: str) -> tuple[zipfile.ZipInfo, bool] | None:
+        directory = get_sdkmod_directory(self.archive)
+        name = self.prefix + fullname.rpartition(".")[2]
+
+        if (info := directory.get(name + "/__init__.py")) is not None:
+            return info, True
+        if (info := directory.get(name + ".py")) is not None:
+            return info, False
+        return None
+
+    def _get_entry_or_raise(self, fullname: str) -> tuple[zipfile.ZipInfo, bool]:
+        entry = self._get_entry(fullname)
+        if entry is None:
+            raise ImportError(f"can't find module {fullname!r}", name=fullname)
+        return entry
+
+    def find_spec(self, fullname: str, target: ModuleType | None = None) -> ModuleSpec | None:  # noqa: ARG002
+        """
+        Finds the spec for a module inside the folder this loader handles.
+
+        Args:
+            fullname: The fully qualified name of the module being imported.
+            target: The module being reloaded, if applicable.
+        Returns:
+            The module spec, or None if the module doesn't exist in this folder.
+        """
+        entry = self._get_entry(fullname)
+        if entry is None:
+            return None
+        return importlib.util.spec_from_loader(fullname, self, is_package=entry[1])
+
+    def is_package(self, fullname: str) -> bool:  # noqa: D102
+        return self._get_entry_or_raise(fullname)[1]
+
+    def get_filename(self, fullname: str) -> str:  # noqa: D102
+        info, _ = self._get_entry_or_raise(fullname)
+        return get_sdkmod_filename(self.archive, info)
+
+    def get_source(self, fullname: str) -> str | None:  # noqa: D102
+        info, _ = self._get_entry_or_raise(fullname)
+        return importlib.util.decode_source(read_sdkmod_entry(self.archive, info))
+
+    def get_code(self, fullname: str) -> CodeType:  # noqa: D102
+        info, _ = self._get_entry_or_raise(fullname)
+        return get_sdkmod_code(self.archive, info, self.get_filename(fullname))
+
+    def get_data(self, path: str) -> bytes:
+        """
+        Reads an arbitrary file out of the '.sdkmod'.
+
+        Args:
+            path: The path to read, either absolute, or relative to the zip.
+        Returns:
+            The file's contents.
+        """
+        if path.startswith(self.archive + os.sep):
+            path = path[len(self.archive) + 1 :]
+        name = path.replace(os.sep, "/")
+
+        info = get_sdkmod_directory(self.archive).get(name)
+        if info is None:
+            raise OSError(0, "", name)
+        return read_sdkmod_entry(self.archive, info)
+
+    def get_resource_reader(self, fullname: str) -> ResourceReader:  # noqa: D102
+        from importlib.readers import ZipReader  # noqa: PLC0415 - rarely used
+
+        # This only needs our `archive` and `prefix`, which work the same as a `zipimporter`'s
+        return ZipReader(self, fullname)  # type: ignore
+
+
+class ModFinder(MetaPathFinder):
+    """
+    Meta path finder which maps top level mod modules directly to their folder or '.sdkmod'.
+
+    Rather than adding every '.sdkmod' to `sys.path`, where every single import in the process would
+    have to probe every zip in turn, we look up the module name in a dict. Imports of anything which
+    isn't a mod fall straight through to the next finder.
+
+    Modules inside '.sdkmod's are loaded using a `SdkmodLoader`, so that their bytecode is cached,
+    which means we also have to handle submodules of zipped packages. Submodules of folder mods are
+    found via the package's `__path__` as usual. The mod folders themselves are still left on
+    `sys.path`, for anything else which may be in them.
+    """
+
+    mod_locations: dict[str, Path]
+    bytecode_cache: bool
+    sdkmod_loaders: dict[str, SdkmodLoader]
+    zip_importers: dict[Path, zipimport.zipimporter]
+
+    def __init__(self, mods: Collection[ModInfo], bytecode_cache: bool = True) -> None:
+        """
+        Creates a new finder.
+
+        Args:
+            mods: The mods to be able to find.
+            bytecode_cache: If true, loads modules inside '.sdkmod's using the bytecode cache. If
+                            false, falls back to a standard `zipimporter`.
+        """
+        self.mod_locations = {}
+        self.bytecode_cache = bytecode_cache
+        self.sdkmod_loaders = {}
+        self.zip_importers = {}
+
+        for mod in mods:
+            self.mod_locations[mod.module] = mod.import_location
+
+    def _find_sdkmod_spec(self, loader: SdkmodLoader, fullname: str) -> ModuleSpec | None:
+        spec = loader.find_spec(fullname)
+        if spec is not None and spec.submodule_search_locations:
+            # Register a loader for the package's folder, so we can pick up it's submodules
+            package_path = spec.submodule_search_locations[0]
+            if package_path not in self.sdkmod_loaders:
+                self.sdkmod_loaders[package_path] = SdkmodLoader(
+                    loader.archive,
+                    loader.prefix + fullname.rpartition(".")[2] + "/",
+                )
+        return spec
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        """
+        Finds the spec for a top level mod module, or a submodule of a zipped mod.
+
+        Args:
+            fullname: The fully qualified name of the module being imported.
+            path: The parent package's `__path__`, or None for top level modules.
+            target: The module being reloaded, if applicable.
+        Returns:
+            The module spec, or None if this isn't a mod module.
+        """
+        if path is not None:
+            for entry in path:
+                if (loader := self.sdkmod_loaders.get(entry)) is not None:
+                    return self._find_sdkmod_spec(loader, fullname)
+            return None
+
+        # Don't let mods shadow the standard library - they would've been after it on `sys.path`
+        if fullname in sys.stdlib_module_names:
+            return None
+
+        location = self.mod_locations.get(fullname)
+        if location is None:
+            return None
+
+        if location.suffix.lower() != ".sdkmod":
+            return PathFinder.find_spec(fullname, [str(location.parent)], target)
+
+        if self.bytecode_cache:
+            return self._find_sdkmod_spec(SdkmodLoader(str(location)), fullname)
+
+        importer = self.zip_importers.get(location)
+        if importer is None:
+            importer = zipimport.zipimporter(str(location))
+            self.zip_importers[location] = importer
+        return importer.find_spec(fullname, target)
+
+    def invalidate_caches(self) -> None:
+        """Invalidates all cached zip directories, in case any zips changed."""
+        sdkmod_directories.clear()
+        for importer in self.zip_importers.values():
+            importer.invalidate_caches()
+
+    def install(self) -> None:
+        """Adds this finder to `sys.meta_path`, right before the default path based finder."""
+        try:
+            idx = sys.meta_path.index(PathFinder)
+        except ValueError:
+            idx = len(sys.meta_path)
+        sys.meta_path.insert(idx, self)
+
+
+STARTUP_PROFILE_FILE = CACHE_DIR / "startup_profile.json"
+STARTUP_TRACE_FILE = CACHE_DIR / "startup_trace.json"
+
+
+@dataclass
+class ProfileSpan:
+    name: str
+    category: str
+    thread_id: int
+    start_ns: int
+    end_ns: int = 0
+    # Index of the span this one was started inside of, on the same thread
+    parent: int | None = None
+
+    @property
+    def duration_ns(self) -> int:  # noqa: D102
+        return self.end_ns - self.start_ns
+
+
+class _TimedLoader:
+    """Loader proxy, which times how long the wrapped loader takes to execute a module."""
+
+    def __init__(self, loader: Loader, profiler: StartupProfiler) -> None:
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType | None:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        try:
+            with self._profiler.span(module.__name__, "import"):
+                self._loader.exec_module(module)
+        finally:
+            # Don't leave the proxy lying around after the import
+            module.__loader__ = self._loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = self._loader
+
+
+class _ImportTimingHook(MetaPathFinder):
+    """Meta path finder which wraps the loaders found by all other finders, to time them."""
+
+    def __init__(self, profiler: StartupProfiler) -> None:
+        self._profiler = profiler
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        for finder in sys.meta_path:
+            if finder is self or (find_spec := getattr(finder, "find_spec", None)) is None:
+                continue
+
+            spec: ModuleSpec | None = find_spec(fullname, path, target)
+            if spec is None:
+                continue
+
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)  # type: ignore
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Opt-in profiler which records how long each part of startup takes.
+
+    Records a span for each startup stage, each mod import, and each individual module import
+    (including those nested inside mods). When disabled, all methods are essentially no-ops.
+    """
+
+    enabled: bool
+    spans: list[ProfileSpan]
+    start_ns: int
+    thread_names: dict[int, str]
+
+    _open_spans: dict[int, list[int]]
+    _import_hook: _ImportTimingHook | None
+
+    def __init__(self, enabled: bool) -> None:
+        """
+        Creates a new profiler.
+
+        Args:
+            enabled: True if to actually record anything.
+        """
+        self.enabled = enabled
+        self.spans = []
+        self.start_ns = time.perf_counter_ns()
+        self.thread_names = {}
+        self._open_spans = {}
+        self._import_hook = None
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "stage") -> Iterator[None]:
+        """
+        Context manager which records a span covering it's body.
+
+        Args:
+            name: The name of the span.
+            category: The span's category.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        thread_id = threading.get_ident()
+        if thread_id not in self.thread_names:
+            self.thread_names[thread_id] = threading.current_thread().name
+        open_spans = self._open_spans.setdefault(thread_id, [])
+
+        idx = len(self.spans)
+        span = ProfileSpan(
+            name,
+            category,
+            thread_id,
+            time.perf_counter_ns(),
+            parent=open_spans[-1] if open_spans else None,
+        )
+        self.spans.append(span)
+        open_spans.append(idx)
+        try:
+            yield
+        finally:
+            span.end_ns = time.perf_counter_ns()
+            open_spans.pop()
+
+    def install_import_hook(self) -> None:
+        """If enabled, installs an import hook to time every individual module import."""
+        if not self.enabled or self._import_hook is not None:
+            return
+        self._import_hook = _ImportTimingHook(self)
+        sys.meta_path.insert(0, self._import_hook)
+
+    def remove_import_hook(self) -> None:
+        """Removes the import hook, if it was installed."""
+        if self._import_hook is None:
+            return
+        with contextlib.suppress(ValueError):
+            sys.meta_path.remove(self._import_hook)
+        self._import_hook = None
+
+    def get_child_import_ns(self, idx: int) -> int:
+        """
+        Gets how much of a mod's import time was spent importing other top level modules.
+
+        Args:
+            idx: The index of the mod's span.
+        Returns:
+            The cumulative time spent in child imports, in nanoseconds.
+        """
+        mod_span = self.spans[idx]
+        total = 0
+        for child in self.spans[idx + 1 :]:
+            if child.start_ns >= mod_span.end_ns:
+                break
+            if child.category != "import" or child.thread_id != mod_span.thread_id:
+                continue
+            if child.name.partition(".")[0] == mod_span.name:
+                continue
+
+            # Only count the outermost external import, the nested ones are already included in it
+            parent = child.parent
+            while parent is not None and parent != idx:
+                parent_span = self.spans[parent]
+                if parent_span.category == "import" and (
+                    parent_span.name.partition(".")[0] != mod_span.name
+                ):
+                    break
+                parent = parent_span.parent
             else:
+                total += child.duration_ns
+        return total
+
+    def report(self, output: Path = STARTUP_PROFILE_FILE) -> None:
+        """
+        Logs a summary of the recorded profile, and writes the full results to a json file.
+
+        Args:
+            output: The json file to write to.
+        """
+        if not self.enabled:
+            return
+
+        stages = [span for span in self.spans if span.category == "stage"]
+        mods = [
+            (span, self.get_child_import_ns(idx))
+            for idx, span in enumerate(self.spans)
+            if span.category == "mod"
+        ]
+        mods.sort(key=lambda x: x[0].duration_ns, reverse=True)
+
+        name_width = max((len(span.name) for span in (*stages, *(m for m, _ in mods))), default=0)
+        lines = [
+            "Startup profile:",
+            f"{'Stage':<{name_width}}  {'Total (ms)':>10}",
+            *(f"{span.name:<{name_width}}  {span.duration_ns / 1e6:>10.2f}" for span in stages),
+            "",
+            (
+                f"{'Mod':<{name_width}}  {'Total (ms)':>10}  {'Self (ms)':>10}"
+                f"  {'Child Imports (ms)':>18}"
+            ),
+            *(
+                f"{span.name:<{name_width}}  {span.duration_ns / 1e6:>10.2f}"
+                f"  {(span.duration_ns - child_ns) / 1e6:>10.2f}  {child_ns / 1e6:>18.2f}"
+                for span, child_ns in mods
+            ),
+        ]
+        logging.info("\n".join(lines))
+
+        with contextlib.suppress(OSError):
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(
+                json.dumps(
+                    {
+                        "stages": [
+                            {"name": span.name, "total_ms": span.duration_ns / 1e6}
+                            for span in stages
+                        ],
+                        "mods": [
+                            {
+                                "module": span.name,
+                                "total_ms": span.duration_ns / 1e6,
+                                "self_ms": (span.duration_ns - child_ns) / 1e6,
+                                "child_imports_ms": child_ns / 1e6,
+                            }
+                            for span, child_ns in mods
+                        ],
+                        "imports": [
+                            {
+                                "module": span.name,
+                                "start_ms": (span.start_ns - self.start_ns) / 1e6,
+                                "total_ms": span.duration_ns / 1e6,
+                            }
+                            for span in self.spans
+                            if span.category == "import"
+                        ],
+                    },
+                    indent=4,
+                ),
+                encoding="utf8",
+            )
+            logging.info(f"Wrote startup profile to {output}")
+
+    def write_trace(self, output: Path = STARTUP_TRACE_FILE) -> None:
+        """
+        Writes all recorded spans as a Chrome trace event json file.
+
+        The file can be opened in `chrome://tracing`, or https://ui.perfetto.dev, to view startup as
+        a timeline.
+
+        Args:
+            output: The json file to write to.
+        """
+        if not self.enabled:
+            return
+
+        # Anything still running on another thread (e.g. bytecode warming) gets cut off at now
+        now_ns = time.perf_counter_ns()
+        pid = os.getpid()
+        events: list[dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread_id,
+                "args": {"name": name},
+            }
+            for thread_id, name in self.thread_names.items()
+        ]
+        events.extend(
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "pid": pid,
+                "tid": span.thread_id,
+                "ts": (span.start_ns - self.start_ns) / 1e3,
+                "dur": ((span.end_ns or now_ns) - span.start_ns) / 1e3,
+            }
+            for span in self.spans
+        )
+
+        with contextlib.suppress(OSError):
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(
+                json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}),
+                encoding="utf8",
+            )
+            logging.info(f"Wrote startup trace to {output}")
+
+
+@cache
+def read_mod_manifest(location: Path, module: str) -> dict[str, Any]:
+    """
+    Reads a mod's `pyproject.toml`, without importing it.
+
+    Args:
+        location: The location the mod will be imported from.
+        module: The mod's module name.
+    Returns:
+        The parsed manifest, or an empty dict if the mod doesn't have one.
+    """
+    try:
+        if location.suffix.lower() == ".sdkmod":
+            archive = str(location)
+            info = get_sdkmod_directory(archive).get(f"{module}/pyproject.toml")
+            if info is None:
+                return {}
+            data = read_sdkmod_entry(archive, info)
+        else:
+            data = (location / "pyproject.toml").read_bytes()
+        return tomllib.loads(data.decode("utf8"))
+    except (OSError, ValueError, zipfile.BadZipFile, zlib.error):
+        return {}
+
+
+RE_REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def normalize_mod_name(name: str) -> str:
+    """
+    Normalizes a mod or package name, so that names differing only in case or separators match.
+
+    Args:
+        name: The name to normalize.
+    Returns:
+        The normalized name.
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@dataclass
+class ModManifestInfo:
+    """The parts of a mod's `pyproject.toml` which we need before importing it."""
+
+    # The normalized names of everything in `project.dependencies`
+    dependencies: list[str]
+    deferred_import: bool
+
+
+def get_manifest_info(mod: ModInfo) -> ModManifestInfo:
+    """
+    Gets the parts of a mod's manifest we need before importing it, reading it if not yet known.
+
+    Args:
+        mod: The mod to get the manifest info of.
+    Returns:
+        The manifest info of the copy of the mod which will be imported.
+    """
+    import_info = mod.import_info
+    if import_info.manifest_info is not None:
+        return import_info.manifest_info
+
+    manifest = read_mod_manifest(import_info.location, import_info.module)
+
+    project = manifest.get("project", {})
+    requirements = project.get("dependencies", []) if isinstance(project, dict) else []
+    dependencies: list[str] = []
+    if isinstance(requirements, list):
+        for requirement in requirements:  # pyright: ignore[reportUnknownVariableType]
+            if not isinstance(requirement, str):
+                continue
+            if (match := RE_REQUIREMENT_NAME.match(requirement)) is None:
                 continue
+            dependencies.append(normalize_mod_name(match.group(1)))
+
+    deferred_import = bool(manifest.get("tool", {}).get("sdkmod", {}).get("deferred_import", False))
+
+    import_info.manifest_info = ModManifestInfo(dependencies, deferred_import)
+    return import_info.manifest_info
+
+
+def is_deferred_import(mod: ModInfo) -> bool:
+    """
+    Checks if a mod has opted in to having it's import deferred until it's actually used.
+
+    Mods opt in by setting `tool.sdkmod.deferred_import` in their `pyproject.toml`. Even if they
+    have, if the mod was left enabled last time, we still need to import it immediately.
+
+    Args:
+        mod: The mod to check.
+    Returns:
+        True if the mod's import should be deferred.
+    """
+    if not get_manifest_info(mod).deferred_import:
+        return False
 
-            if mod_info.module in mods_to_import:
-                mods_to_import[mod_info.module].duplicates.append(mod_info)
+    settings: Any = None
+    with contextlib.suppress(OSError, ValueError):
+        settings = json.loads((SETTINGS_DIR / f"{mod.module}.json").read_text(encoding="utf8"))
+    return not (isinstance(settings, dict) and settings.get("enabled", False))  # pyright: ignore[reportUnknownMemberType]
+
+
+def get_mod_dependencies(mod: ModInfo, installed: dict[str, str]) -> list[str]:
+    """
+    Gets which other installed mods a mod depends on.
+
+    Mods declare dependencies using the standard `project.dependencies` field in their
+    `pyproject.toml`. Any requirements which don't match an installed mod are ignored.
+
+    Args:
+        mod: The mod to get the dependencies of.
+        installed: A dict mapping the normalized names of all installed mods to their module names.
+    Returns:
+        The module names of the mods it depends on.
+    """
+    dependencies: list[str] = []
+    for name in get_manifest_info(mod).dependencies:
+        module = installed.get(name)
+        if module is not None and module != mod.module and module not in dependencies:
+            dependencies.append(module)
+    return dependencies
+
+
+def order_mods_by_dependencies(mods: Sequence[ModInfo], max_workers: int = 1) -> list[ModInfo]:
+    """
+    Sorts mods so that each mod comes after all the other mods it depends on.
+
+    The sort is stable, mods which don't depend on each other stay in their original order. Mods in
+    a dependency cycle are logged, and then put at the end, in their original order.
+
+    Args:
+        mods: The mods to sort.
+        max_workers: The max amount of workers to use when reading manifests.
+    Returns:
+        The sorted list of mods.
+    """
+    if max_workers > 1:
+        # Read all the manifests up front, they get cached so the rest of this can just use them.
+        # Most '.sdkmod's will already have been filled in from the discovery index.
+        with ThreadPoolExecutor(max_workers, thread_name_prefix="mod_manifest") as executor:
+            executor.map(
+                get_manifest_info,
+                [mod for mod in mods if mod.import_info.manifest_info is None],
+            )
+
+    installed = {normalize_mod_name(mod.module): mod.module for mod in mods}
+    indexes = {mod.module: idx for idx, mod in enumerate(mods)}
+
+    dependents: list[list[int]] = [[] for _ in mods]
+    remaining_deps: list[int] = [0] * len(mods)
+    for idx, mod in enumerate(mods):
+        for dependency in get_mod_dependencies(mod, installed):
+            dependents[indexes[dependency]].append(idx)
+            remaining_deps[idx] += 1
+
+    ready = [idx for idx, count in enumerate(remaining_deps) if count == 0]
+    heapq.heapify(ready)
+    ordered: list[ModInfo] = []
+    while ready:
+        idx = heapq.heappop(ready)
+        ordered.append(mods[idx])
+        for dependent in dependents[idx]:
+            remaining_deps[dependent] -= 1
+            if remaining_deps[dependent] == 0:
+                heapq.heappush(ready, dependent)
+
+    if len(ordered) != len(mods):
+        # Anything left is either in a cycle, or depends on one
+        remaining = {idx for idx, count in enumerate(remaining_deps) if count > 0}
+        for cycle in find_dependency_cycles(remaining, dependents):
+            log(
+                logging.warning,
+                "Found a dependency cycle between mods: "
+                + ", ".join(f"'{mods[idx].module}'" for idx in cycle)
+                + ". They will be imported in their default order.",
+            )
+        ordered.extend(mods[idx] for idx in sorted(remaining))
+
+    return ordered
+
+
+def find_dependency_cycles(
+    remaining: Collection[int],
+    dependents: Sequence[Sequence[int]],
+) -> list[list[int]]:
+    """
+    Finds all the dependency cycles within a set of mods.
+
+    Mods which only depend on a cycle, without being part of it, are not included.
+
+    Args:
+        remaining: The indexes of the mods to search.
+        dependents: For each mod index, the indexes of the mods which depend on it.
+    Returns:
+        The sorted indexes of the mods in each cycle.
+    """
+    # There are only ever a handful of these, no need for anything smarter than a search from each
+    reachable: dict[int, set[int]] = {}
+    for start in remaining:
+        seen: set[int] = set()
+        stack = [start]
+        while stack:
+            for dependent in dependents[stack.pop()]:
+                if dependent in remaining and dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        reachable[start] = seen
+
+    cycles: list[list[int]] = []
+    found: set[int] = set()
+    for idx in sorted(remaining):
+        if idx in found or idx not in reachable[idx]:
+            continue
+        cycle = sorted(other for other in reachable[idx] if idx in reachable[other])
+        found.update(cycle)
+        cycles.append(cycle)
+    return cycles
+
+
+class PlaceholderModBehaviour:
+    """
+    Behaviour for a stand in for a mod which hasn't actually been imported yet.
+
+    The real mod gets imported the first time this is enabled, or it's options are opened, at which
+    point this placeholder removes itself from the mod list. If the import fails, the placeholder
+    stays, to show the error state.
+
+    This needs to be combined with `Mod` to be useful, see `get_placeholder_mod_type`.
+    """
+
+    name: str
+    is_enabled: bool
+
+    mod_info: ModInfo | None
+    status: str
+    loaded_mods: list[Mod]
+    _load_lock: threading.RLock
+
+    def load(self, profiler: StartupProfiler | None = None) -> list[Mod]:
+        """
+        Imports the real mod, if not already imported.
+
+        Args:
+            profiler: If not None, the profiler to record the import time in.
+        Returns:
+            A list of all mods which were registered by the import.
+        """
+        from mods_base.mod_list import deregister_mod, register_mod  # noqa: PLC0415 - after finder
+
+        with self._load_lock:
+            if self.mod_info is None or self.status == "Loaded":
+                return self.loaded_mods
+
+            deregister_mod(cast("Mod", self))
+
+            if self.mod_info.module in sys.modules or import_mod(self.mod_info, profiler):
+                # If another mod already imported this one directly, rather than via `import_mod`,
+                # it's mods got recorded under that mod instead, so we won't find any here. They're
+                # still in the mod list though, so it's fine to just drop the placeholder.
+                self.loaded_mods = registered_mods.get(self.mod_info.module, [])
+                self.status = "Loaded"
             else:
-                mods_to_import[mod_info.module] = mod_info
+                # Keep showing the placeholder, so it's obvious something went wrong
+                self.status = "Failed to Load"
+                register_mod(cast("Mod", self))
+
+            return self.loaded_mods
+
+    def enable(self) -> None:
+        """Imports the real mod, and enables everything it registered."""
+        for mod in self.load():
+            mod.enable()
+        self.is_enabled = any(mod.is_enabled for mod in self.loaded_mods)
+
+    def disable(self, dont_update_setting: bool = False) -> None:
+        """
+        Disables everything the real mod registered.
+
+        Args:
+            dont_update_setting: If true, prevents updating the enabled flag in the settings file.
+        """
+        for mod in self.loaded_mods:
+            mod.disable(dont_update_setting)
+        self.is_enabled = False
+
+    def get_status(self) -> str:
+        """
+        Gets the current status of this mod.
+
+        Returns:
+            The real mod's status if it's been loaded, otherwise the placeholder's.
+        """
+        if self.loaded_mods:
+            return self.loaded_mods[0].get_status()
+        return self.status
+
+    def iter_display_options(self) -> Iterator[BaseOption]:
+        """
+        Imports the real mod, and iterates through the options it displays.
+
+        Yields:
+            Options, in the order they should be displayed.
+        """
+        for mod in self.load():
+            yield from mod.iter_display_options()
+
+
+@cache
+def get_placeholder_mod_type() -> type[PlaceholderMod]:
+    """
+    Gets the placeholder mod type.
+
+    This needs to subclass `Mod`, so we can't create it until after we're allowed to import
+    mods_base.
+
+    Returns:
+        The placeholder mod type.
+    """
+    from mods_base import Mod  # noqa: PLC0415 - after finder
+
+    @dataclass
+    class PlaceholderMod(PlaceholderModBehaviour, Mod):
+        mod_info: ModInfo | None = None
+        status: str = "Not Loaded"
+        loaded_mods: list[Mod] = field(default_factory=list["Mod"])
+
+        # The menus may try load us at the same time as the init script does
+        _load_lock: threading.RLock = field(
+            default_factory=threading.RLock,
+            compare=False,
+            repr=False,
+        )
+
+    return PlaceholderMod  # type: ignore
+
+
+def create_placeholder_mod(mod: ModInfo, status: str = "Not Loaded") -> PlaceholderMod:
+    """
+    Creates and registers a placeholder for a mod which hasn't been imported yet.
+
+    Args:
+        mod: The mod to create a placeholder for.
+        status: The status to display on the placeholder.
+    Returns:
+        The new placeholder.
+    """
+    from mods_base.mod_list import register_mod  # noqa: PLC0415 - after finder
+
+    manifest = read_mod_manifest(mod.import_location, mod.module)
+    project = manifest.get("project", {})
+    sdkmod = manifest.get("tool", {}).get("sdkmod", {})
+
+    authors = [author["name"] for author in project.get("authors", ()) if "name" in author]
+
+    placeholder = get_placeholder_mod_type()(
+        name=sdkmod.get("name", project.get("name", mod.module)),
+        author=", ".join(authors) or "Unknown Author",
+        description=project.get("description", ""),
+        version=sdkmod.get("version", project.get("version", "Unknown Version")),
+        keybinds=[],
+        options=[],
+        hooks=[],
+        commands=[],
+        mod_info=mod,
+        status=status,
+    )
+    register_mod(placeholder)
+    return placeholder
+
+
+FAILED_IMPORT_CACHE_FILE = CACHE_DIR / "failed_imports.json"
+
+
+def get_mod_signature(mod: ModInfo) -> str:
+    """
+    Gets a signature of a mod's contents, which changes whenever any of it's files do.
+
+    Args:
+        mod: The mod to get the signature of.
+    Returns:
+        The mod's signature.
+    """
+    location = mod.import_location
+    hasher = hashlib.sha1(usedforsecurity=False)
+    with contextlib.suppress(OSError):
+        files = sorted(location.rglob("*")) if location.is_dir() else [location]
+        for file in files:
+            relative_parts = file.relative_to(location).parts
+            if (
+                "__pycache__" in relative_parts
+                or any(part.startswith(".") for part in relative_parts)
+                or not file.is_file()
+            ):
+                continue
+            file_stat = file.stat()
+            hasher.update(f"{file}|{file_stat.st_mtime_ns}|{file_stat.st_size}\n".encode())
+    return hasher.hexdigest()
+
+
+def get_environment_signature(mods: Collection[ModInfo]) -> str:
+    """
+    Gets a signature of all installed mods, which changes if any mods are added/removed/updated.
+
+    This only stats each mod's top level location, the same as the discovery index does, so that
+    it stays cheap to check every launch. This means editing a file deep inside a folder mod won't
+    change it, but a '.sdkmod' being replaced, or any mod being added or removed, will.
+
+    Args:
+        mods: All installed mods.
+    Returns:
+        The environment's signature.
+    """
+    hasher = hashlib.sha1(sys.version.encode(), usedforsecurity=False)
+    for mod in mods:
+        # The settings folder gets picked up as a namespace package, but it changes all the time
+        if mod.import_location == SETTINGS_DIR:
+            continue
+        try:
+            location_stat = mod.import_location.stat()
+        except OSError:
+            continue
+        hasher.update(
+            f"{mod.module}|{mod.import_location}|{location_stat.st_mtime_ns}"
+            f"|{location_stat.st_size}\n".encode(),
+        )
+    return hasher.hexdigest()
+
+
+@dataclass
+class FailedImportCache:
+    """
+    Persistent record of mods which failed to import, so we can skip them until they change.
+
+    Entries are keyed on the mod's module name, and store the signature of it's contents at the
+    time it failed. The whole cache is also tied to the environment signature, so that if any other
+    mod gets added, removed or replaced, every failed mod gets retried, in case it was a dependency.
+    """
+
+    mods: Collection[ModInfo]
+    entries: dict[str, tuple[str, str]] = field(default_factory=dict[str, tuple[str, str]])
+    skipped: list[tuple[str, str]] = field(default_factory=list[tuple[str, str]])
+    dirty: bool = False
+
+    @staticmethod
+    def load(mods: Collection[ModInfo], path: Path = FAILED_IMPORT_CACHE_FILE) -> FailedImportCache:
+        """
+        Loads the failed import cache from disk.
+
+        Args:
+            mods: All installed mods.
+            path: The file to load from.
+        Returns:
+            The loaded cache. If the file doesn't exist, is invalid, or is for a different set of
+            installed mods, returns an empty cache.
+        """
+        cache = FailedImportCache(mods)
+        try:
+            data = json.loads(path.read_text(encoding="utf8"))
+            entries = {
+                module: (signature, error) for module, (signature, error) in data["mods"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return cache
+
+        # No need to check anything if nothing failed
+        if entries and data.get("environment") == get_environment_signature(mods):
+            cache.entries = entries
+        else:
+            cache.dirty = True
+        return cache
+
+    def save(self, path: Path = FAILED_IMPORT_CACHE_FILE) -> None:
+        """
+        Saves the failed import cache to disk, if it was changed.
+
+        Args:
+            path: The file to save to.
+        """
+        if not self.dirty:
+            return
+
+        environment = get_environment_signature(self.mods) if self.entries else None
+        with contextlib.suppress(OSError):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                json.dumps({"environment": environment, "mods": self.entries}, indent=4),
+                encoding="utf8",
+            )
+        self.dirty = False
+
+    def should_skip(self, mod: ModInfo) -> bool:
+        """
+        Checks if a mod is known to fail to import, and hasn't changed since.
+
+        Args:
+            mod: The mod to check.
+        Returns:
+            True if the mod should be skipped.
+        """
+        entry = self.entries.get(mod.module)
+        if entry is None:
+            return False
+
+        signature, error = entry
+        if signature != get_mod_signature(mod):
+            return False
+
+        self.skipped.append((mod.module, error))
+        return True
+
+    def record_failure(self, mod: ModInfo, error: str) -> None:
+        """
+        Records that a mod failed to import.
+
+        Args:
+            mod: The mod which failed.
+            error: A short description of the error.
+        """
+        self.entries[mod.module] = (get_mod_signature(mod), error)
+        self.dirty = True
+
+    def record_success(self, mod: ModInfo) -> None:
+        """
+        Records that a mod imported successfully.
+
+        Args:
+            mod: The mod which was imported.
+        """
+        if self.entries.pop(mod.module, None) is not None:
+            self.dirty = True
+
+    def log_summary(self) -> None:
+        """Logs a summary of all the mods which were skipped."""
+        if not self.skipped:
+            return
+
+        logging.error(
+            f"Skipped importing {len(self.skipped)} mod(s) which failed last launch, and haven't"
+            f" changed since:\n"
+            + "\n".join(f"'{module}': {error}" for module, error in self.skipped)
+            + "\nUpdate the mod, or set `mod_manager.failed_import_cache = false`, to retry.",
+        )
+
+
+# While set, `import_mod` skips mods which are known to fail. Only used during startup, if the user
+# explicitly tries to load a deferred mod later, it should always actually be retried.
+failed_import_cache: FailedImportCache | None = None
+# The mods registered by each import done via `import_mod`, so that placeholders can find their real
+# mods, and so that they can be hot reloaded later
+registered_mods: dict[str, list[Mod]] = {}
+
+
+SLOW_IMPORTS_FILE = CACHE_DIR / "slow_imports.json"
+# How many frames of the importing thread's stack to show when a mod goes over budget
+IMPORT_WATCHDOG_STACK_DEPTH = 5
 
-    return mods_to_import.values()
 
+class ImportWatchdog(threading.Thread):
+    """
+    Thread which warns about mods which take longer than a set budget to import.
+
+    As soon as an import goes over budget, logs the mod and what it's currently doing, so there's
+    feedback even if it's stuck. Also records each mod's total time, so that mods which went over
+    budget can be imported later on the next launch.
+    """
+
+    budget_ns: int
+    previous_slow_imports: dict[str, float]
+    slow_imports: dict[str, float]
+
+    _current: tuple[str, int, int] | None
+    _condition: threading.Condition
+    _stopped: bool
+
+    def __init__(self, budget_ms: float) -> None:
+        """
+        Creates the thread. It still needs to be started.
+
+        Args:
+            budget_ms: How long each mod may take to import, in milliseconds.
+        """
+        super().__init__(name="mod_import_watchdog", daemon=True)
+        self.budget_ns = int(budget_ms * 1e6)
+        self.previous_slow_imports = {}
+        with contextlib.suppress(OSError, ValueError, TypeError):
+            self.previous_slow_imports = {
+                str(module): float(duration)
+                for module, duration in json.loads(
+                    SLOW_IMPORTS_FILE.read_text(encoding="utf8"),
+                ).items()
+            }
+        self.slow_imports = {}
+
+        self._current = None
+        self._condition = threading.Condition()
+        self._stopped = False
+
+    def run(self) -> None:  # noqa: D102
+        with self._condition:
+            while not self._stopped:
+                current = self._current
+                if current is None:
+                    self._condition.wait()
+                    continue
+
+                module, thread_id, start_ns = current
+                remaining_ns = start_ns + self.budget_ns - time.perf_counter_ns()
+                if remaining_ns > 0:
+                    self._condition.wait(remaining_ns / 1e9)
+                    continue
+
+                self._warn_in_progress(module, thread_id)
+                # Only warn once per import
+                while self._current is current and not self._stopped:
+                    self._condition.wait()
+
+    def _warn_in_progress(self, module: str, thread_id: int) -> None:
+        """
+        Warns about an import which just went over budget, showing where it currently is.
+
+        Args:
+            module: The mod being imported.
+            thread_id: The id of the thread importing it.
+        """
+        frame = sys._current_frames().get(thread_id)  # pyright: ignore[reportPrivateUsage]
+        stack = [
+            frame_summary
+            for frame_summary in (traceback.extract_stack(frame) if frame is not None else [])
+            if not frame_summary.filename.startswith("<frozen ")
+        ][-IMPORT_WATCHDOG_STACK_DEPTH:]
+
+        logging.warning(
+            f"Mod '{module}' has been importing for over {self.budget_ns / 1e6:.0f}ms. It's"
+            f" currently at:\n" + "".join(traceback.format_list(stack)),
+        )
+
+    @contextlib.contextmanager
+    def watch(self, module: str) -> Iterator[None]:
+        """
+        Context manager which watches a mod's import.
+
+        Args:
+            module: The mod being imported.
+        """
+        start_ns = time.perf_counter_ns()
+        with self._condition:
+            previous = self._current
+            self._current = (module, threading.get_ident(), start_ns)
+            self._condition.notify()
+        try:
+            yield
+        finally:
+            duration_ns = time.perf_counter_ns() - start_ns
+            with self._condition:
+                self._current = previous
+                self._condition.notify()
+
+            if duration_ns > self.budget_ns:
+                self.slow_imports[module] = duration_ns / 1e6
+                logging.warning(
+                    f"Mod '{module}' took {duration_ns / 1e6:.0f}ms to import, over the"
+                    f" {self.budget_ns / 1e6:.0f}ms budget.",
+                )
+
+    def stop(self) -> None:
+        """Stops the thread, and saves which mods went over budget for next launch."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+        with contextlib.suppress(OSError):
+            SLOW_IMPORTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            SLOW_IMPORTS_FILE.write_text(json.dumps(self.slow_imports, indent=4), encoding="utf8")
+
+
+# While set, `import_mod` measures each import against the watchdog's budget
+import_watchdog: ImportWatchdog | None = None
+
+
+def split_slow_imports(
+    mods: Sequence[ModInfo],
+    slow_imports: Collection[str],
+) -> tuple[list[ModInfo], list[ModInfo]]:
+    """
+    Splits out mods which were slow to import last launch, so they can be imported later.
+
+    Any mods which depend on a slow mod are also split out, so they still get imported after it.
+
+    Args:
+        mods: The mods to split.
+        slow_imports: The module names of the mods which were slow to import.
+    Returns:
+        A tuple of the mods to import as normal, and the mods to import later.
+    """
+    installed = {normalize_mod_name(mod.module): mod.module for mod in mods}
+    queued = set(slow_imports)
+
+    # Mods are already in dependency order, so one pass is enough to catch everything downstream
+    for mod in mods:
+        if any(dep in queued for dep in get_mod_dependencies(mod, installed)):
+            queued.add(mod.module)
+
+    return (
+        [mod for mod in mods if mod.module not in queued],
+        [mod for mod in mods if mod.module in queued],
+    )
 
-def import_mods(mods_to_import: Collection[ModInfo]) -> None:
+
+def import_mod(mod: ModInfo, profiler: StartupProfiler | None = None) -> bool:
+    """
+    Tries to import a single mod, logging any errors.
+
+    Args:
+        mod: The mod to import.
+        profiler: If not None, the profiler to record the import time in.
+    Returns:
+        True if the mod was imported successfully.
+    """
+    if profiler is None:
+        profiler = StartupProfiler(False)
+
+    if failed_import_cache is not None and failed_import_cache.should_skip(mod):
+        return False
+
+    from mods_base.mod_list import mod_list  # noqa: PLC0415 - after finder
+
+    existing_mods = {id(registered) for registered in mod_list}
+
+    try:
+        with (
+            profiler.span(mod.module, "mod"),
+            import_watchdog.watch(mod.module)
+            if import_watchdog is not None
+            else contextlib.nullcontext(),
+        ):
+            importlib.import_module(mod.module)
+
+    except Exception as ex:  # noqa: BLE001
+        logging.error(f"Failed to import mod '{mod.module}'")
+
+        tb = traceback.extract_tb(ex.__traceback__)
+        if not FULL_TRACEBACKS:
+            tb = tb[-1:]
+
+        exception_only = "".join(traceback.format_exception_only(ex))
+        logging.error(exception_only)
+        logging.error("".join(traceback.format_list(tb)))
+
+        if failed_import_cache is not None:
+            failed_import_cache.record_failure(mod, exception_only.strip().splitlines()[-1])
+        return False
+
+    if failed_import_cache is not None:
+        failed_import_cache.record_success(mod)
+    registered_mods[mod.module] = [
+        registered for registered in mod_list if id(registered) not in existing_mods
+    ]
+    return True
+
+
+# Mods which make up the mod manager itself, which `import_mod_manager_first` imports first
+MOD_MANAGER_MODULES: frozenset[str] = frozenset(
+    {"bl3_mod_menu", "console_mod_menu", "keybinds", "mods_base", "ui_utils"},
+)
+
+
+def get_deferred_imports(
+    mods_to_import: Collection[ModInfo],
+    dependencies: dict[str, list[str]],
+) -> set[str]:
+    """
+    Works out which mods should have their import deferred.
+
+    Args:
+        mods_to_import: The list of mods being imported.
+        dependencies: A dict mapping each mod's module name to the module names it depends on.
+    Returns:
+        The module names of the mods to defer.
+    """
+    deferred = {mod.module for mod in mods_to_import if is_deferred_import(mod)}
+
+    # Any deferred mods which a regular mod depends on are going to get imported anyway, do so up
+    # front, so that their import doesn't get hidden inside their dependent's
+    stack = [mod.module for mod in mods_to_import if mod.module not in deferred]
+    while stack:
+        for dependency in dependencies[stack.pop()]:
+            if dependency in deferred:
+                deferred.discard(dependency)
+                stack.append(dependency)
+
+    return deferred
+
+
+def import_mods(
+    mods_to_import: Collection[ModInfo],
+    profiler: StartupProfiler | None = None,
+    allow_deferred: bool = True,
+    failed: set[str] | None = None,
+) -> None:
     """
     Tries to import a list of mods.
 
     Args:
         mods_to_import: The list of mods to import.
+        profiler: If not None, the profiler to record import times in.
+        allow_deferred: If true, mods which opt in to deferred imports get a placeholder registered
+                        instead of being imported.
+        failed: If not None, the module names of mods which already failed to import, in an earlier
+                call. Any mods depending on them are skipped. Gets updated with any new failures.
     """
+    if failed is None:
+        failed = set()
+
+    installed = {normalize_mod_name(mod.module): mod.module for mod in mods_to_import}
+    # Make sure dependencies on mods which failed in an earlier call still get picked up
+    installed.update((normalize_mod_name(module), module) for module in failed)
+    dependencies = {mod.module: get_mod_dependencies(mod, installed) for mod in mods_to_import}
+
+    deferred = get_deferred_imports(mods_to_import, dependencies) if allow_deferred else set()
+
+    def has_failed_dependencies(mod: ModInfo) -> bool:
+        failed_dependencies = [dep for dep in dependencies[mod.module] if dep in failed]
+        if not failed_dependencies:
+            return False
+
+        logging.error(
+            f"Skipped importing mod '{mod.module}', since it depends on "
+            + ", ".join(f"'{dep}'" for dep in failed_dependencies)
+            + ", which failed to import.",
+        )
+        failed.add(mod.module)
+        return True
+
+    placeholders: list[PlaceholderMod] = []
     for mod in mods_to_import:
+        if mod.module in deferred:
+            placeholders.append(create_placeholder_mod(mod))
+        elif not has_failed_dependencies(mod) and not import_mod(mod, profiler):
+            failed.add(mod.module)
+
+    # If another mod imported any deferred mods while it was being imported, swap to the real ones
+    for placeholder in placeholders:
+        if placeholder.mod_info is not None and placeholder.mod_info.module in sys.modules:
+            placeholder.load()
+
+
+class BackgroundDiscovery(threading.Thread):
+    """
+    Thread which runs mod discovery while we're still waiting for the console to be ready.
+
+    Any messages logged during discovery are held until `wait_for_mods` is called, after the
+    console is ready, so that they don't get lost. After discovery finishes, uses any remaining idle
+    time to compile folder mods, and to warm the bytecode cache.
+    """
+
+    mod_folders: Sequence[Path]
+    index: DiscoveryIndex | None
+    max_workers: int
+    precompile: bool
+    warm_bytecode: bool
+    profiler: StartupProfiler
+
+    mods: Collection[ModInfo]
+    precompiled: dict[str, int]
+    logs: list[tuple[Callable[[str], None], str]]
+    exception: BaseException | None
+
+    discovery_done: threading.Event
+    stop: threading.Event
+
+    def __init__(
+        self,
+        mod_folders: Sequence[Path],
+        index: DiscoveryIndex | None,
+        *,
+        max_workers: int,
+        precompile: bool,
+        warm_bytecode: bool,
+        profiler: StartupProfiler,
+    ) -> None:
+        """
+        Creates the thread. It still needs to be started.
+
+        Args:
+            mod_folders: The mod folders to discover mods in.
+            index: The discovery index to use, or None.
+            max_workers: The max amount of workers to use for discovery.
+            precompile: True if to compile folder mods after discovery.
+            warm_bytecode: True if to warm the bytecode cache after discovery.
+            profiler: The startup profiler to record in.
+        """
+        super().__init__(name="mod_discovery", daemon=True)
+        self.mod_folders = mod_folders
+        self.index = index
+        self.max_workers = max_workers
+        self.precompile = precompile
+        self.warm_bytecode = warm_bytecode
+        self.profiler = profiler
+
+        self.mods = ()
+        self.precompiled = {}
+        self.logs = []
+        self.exception = None
+
+        self.discovery_done = threading.Event()
+        self.stop = threading.Event()
+
+    def run(self) -> None:  # noqa: D102
         try:
-            importlib.import_module(mod.module)
+            with capture_logs() as self.logs:
+                with self.profiler.span("find_mods_to_import"):
+                    self.mods = find_mods_to_import(self.mod_folders, self.index, self.max_workers)
+                    if self.index is not None:
+                        self.index.save()
+
+                # Do this before precompiling/warming, so mods get warmed in import order
+                with self.profiler.span("order_mods_by_dependencies"):
+                    self.mods = order_mods_by_dependencies(list(self.mods), self.max_workers)
+        except BaseException as ex:  # noqa: BLE001
+            # Re-raised on the main thread, once the console's ready to show it
+            self.exception = ex
+        finally:
+            self.discovery_done.set()
+
+        if self.precompile:
+            with self.profiler.span("precompile_folder_mods"):
+                precompile_folder_mods(self.mods, self.stop, self.precompiled)
+
+        if self.warm_bytecode:
+            with self.profiler.span("warm_sdkmod_bytecode"):
+                warm_sdkmod_bytecode(self.mods, self.stop)
+
+    def wait_for_mods(self) -> Collection[ModInfo]:
+        """
+        Waits for discovery to finish, and logs any messages it held.
+
+        Any precompiling or bytecode warming is stopped, since we're about to start importing.
+
+        Returns:
+            The discovered mods.
+        """
+        self.discovery_done.wait()
+        self.stop.set()
+
+        replay_logs(self.logs)
+        if self.exception is not None:
+            raise self.exception
+        return self.mods
+
+
+def clear_manifest_caches(mod: ModInfo) -> None:
+    """
+    Clears anything cached from a mod's manifest, so it gets re-read the next time it's needed.
 
-        except Exception as ex:  # noqa: BLE001
-            logging.error(f"Failed to import mod '{mod.module}'")
+    Args:
+        mod: The mod to clear the caches of.
+    """
+    read_mod_manifest.cache_clear()
+    for info in (mod, *mod.duplicates):
+        info.manifest_info = None
 
-            tb = traceback.extract_tb(ex.__traceback__)
-            if not FULL_TRACEBACKS:
-                tb = tb[-1:]
 
-            logging.error("".join(traceback.format_exception_only(ex)))
-            logging.error("".join(traceback.format_list(tb)))
+def reload_mod(mod: ModInfo) -> None:
+    """
+    Reloads a single mod which has been modified since it was imported.
+
+    Any mods it registered are disabled and removed, all of it's modules are unloaded, and then it
+    gets imported again, re-enabling any mods which were previously enabled. Only mods registered
+    via `import_mod` can be reloaded.
+
+    Args:
+        mod: The mod to reload.
+    """
+    from mods_base.mod_list import deregister_mod, mod_list  # noqa: PLC0415 - after finder
+
+    if mod.module not in sys.modules and any(
+        isinstance(registered, get_placeholder_mod_type())
+        and registered.mod_info is not None
+        and registered.mod_info.module == mod.module
+        for registered in mod_list
+    ):
+        # Still deferred, it'll pick up the changes whenever it actually gets imported
+        clear_manifest_caches(mod)
+        return
+
+    previously_enabled: set[str] = set()
+    for registered in registered_mods.pop(mod.module, []):
+        if registered.is_enabled:
+            previously_enabled.add(registered.name)
+            # Don't update the setting, so it's still enabled if it fails to reload, and we restart
+            registered.disable(dont_update_setting=True)
+        deregister_mod(registered)
+
+    for name in [
+        name for name in sys.modules if name == mod.module or name.startswith(mod.module + ".")
+    ]:
+        del sys.modules[name]
+    importlib.invalidate_caches()
+    clear_manifest_caches(mod)
+
+    logging.info(f"Reloading mod '{mod.module}'")
+    if not import_mod(mod):
+        return
+
+    for registered in registered_mods.get(mod.module, []):
+        if registered.name in previously_enabled and not registered.is_enabled:
+            registered.enable()
+
+
+# inotify constants, from `sys/inotify.h`
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+IN_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT_STRUCT = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Thin wrapper around an inotify instance. Linux only."""
+
+    libc: Any
+    fd: int
+    watches: dict[int, str]
+
+    def __init__(self) -> None:
+        import ctypes  # noqa: PLC0415 - dev only
+
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+
+    def add_watch(self, path: str, recursive: bool) -> None:
+        """
+        Starts watching a folder.
+
+        Args:
+            path: The folder to watch.
+            recursive: If true, also watches all it's subfolders.
+        """
+        wd: int = self.libc.inotify_add_watch(self.fd, os.fsencode(path), IN_WATCH_MASK)
+        if wd < 0:
+            return
+        self.watches[wd] = path
+        if not recursive:
+            return
+        with contextlib.suppress(OSError), os.scandir(path) as it:
+            for entry in it:
+                if (
+                    entry.is_dir()
+                    and entry.name != "__pycache__"
+                    and not entry.name.startswith(".")
+                ):
+                    self.add_watch(entry.path, True)
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Waits for any events to be ready to read.
+
+        Args:
+            timeout: The max time to wait, in seconds.
+        Returns:
+            True if there are events to read.
+        """
+        import select  # noqa: PLC0415 - dev only
+
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        return bool(ready)
+
+    def read_events(self) -> list[tuple[str, int]]:
+        """
+        Reads all pending events.
+
+        Returns:
+            A list of the path and mask of each event.
+        """
+        events: list[tuple[str, int]] = []
+        with contextlib.suppress(BlockingIOError):
+            while data := os.read(self.fd, 0x10000):
+                pos = 0
+                while pos + INOTIFY_EVENT_STRUCT.size <= len(data):
+                    wd, mask, _, name_len = INOTIFY_EVENT_STRUCT.unpack_from(data, pos)
+                    pos += INOTIFY_EVENT_STRUCT.size
+                    name = data[pos : pos + name_len].rstrip(b"\0")
+                    pos += name_len
+
+                    if mask & IN_Q_OVERFLOW:
+                        logging.dev_warning("Hot reload event queue overflowed, missed changes")
+                    elif wd in self.watches:
+                        path = os.path.join(self.watches[wd], os.fsdecode(name))  # noqa: PTH118
+                        events.append((path, mask))
+        return events
+
+
+# The console command which reloads all mods which have changed
+HOT_RELOAD_COMMAND = "reload_mods"
+
+
+class HotReloader(threading.Thread):
+    """
+    Development mode thread which watches mod folders, for mods which get modified.
+
+    Uses inotify on Linux. Everywhere else, only works if polling is enabled. Changes are debounced,
+    a mod is only counted as changed once it's stopped changing for a short while.
+
+    Reloading a mod runs it's imports again, which may touch game state, so this must happen on the
+    game thread rather than this one. Changed mods are queued, and get reloaded when the
+    `reload_mods` console command is run.
+    """
+
+    mod_folders: Sequence[Path]
+    mods: dict[str, ModInfo]
+    debounce: float
+    poll_interval: float | None
+    stop: threading.Event
+
+    ready_mods: dict[str, ModInfo]
+    ready_lock: threading.Lock
+
+    def __init__(
+        self,
+        mod_folders: Sequence[Path],
+        mods: Collection[ModInfo],
+        debounce: float = 0.5,
+        poll_interval: float | None = None,
+    ) -> None:
+        """
+        Creates the thread. It still needs to be started.
+
+        Args:
+            mod_folders: The mod folders to watch.
+            mods: The mods which may be reloaded.
+            debounce: How long, in seconds, to wait after the last change before reloading.
+            poll_interval: If not None, and inotify isn't available, polls for changes at this
+                           interval, in seconds. Since this needs to stat every file of every mod,
+                           it may be expensive.
+        """
+        super().__init__(name="mod_hot_reload", daemon=True)
+        self.mod_folders = mod_folders
+        self.mods = {
+            os.path.normcase(os.path.abspath(mod.import_location)): mod  # noqa: PTH100
+            for mod in mods
+            if mod.module not in MOD_MANAGER_MODULES and mod.import_location != SETTINGS_DIR
+        }
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.stop = threading.Event()
+        self.ready_mods = {}
+        self.ready_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Starts watching for changes, and adds the console command to reload them."""
+        from unrealsdk import commands  # noqa: PLC0415 - dev only
+
+        commands.add_command(HOT_RELOAD_COMMAND, lambda _line, _cmd_len: self.reload_ready_mods())
+        super().start()
+
+    def run(self) -> None:  # noqa: D102
+        wait_for_changes: Callable[[float | None], set[str]] | None = None
+        if sys.platform == "linux":
+            with contextlib.suppress(OSError, AttributeError):
+                wait_for_changes = self._create_inotify_watcher()
+        if wait_for_changes is None:
+            if self.poll_interval is None:
+                logging.dev_warning(
+                    "Hot reloading can't watch for changes on this platform. Set"
+                    " `mod_manager.hot_reload_poll_interval` to poll for them instead.",
+                )
+                return
+            wait_for_changes = self._create_polling_watcher(self.poll_interval)
+
+        pending: dict[str, ModInfo] = {}
+        while not self.stop.is_set():
+            changed = wait_for_changes(self.debounce if pending else None)
+            if changed:
+                pending.update((key, self.mods[key]) for key in changed)
+                continue
+            if not pending:
+                continue
+
+            with self.ready_lock:
+                self.ready_mods.update(pending)
+            logging.info(
+                "Mods changed: "
+                + ", ".join(f"'{mod.module}'" for mod in pending.values())
+                + f". Run `{HOT_RELOAD_COMMAND}` to reload them.",
+            )
+            pending.clear()
+
+    def reload_ready_mods(self) -> None:
+        """Reloads all mods which were changed. Must be run on the game thread."""
+        with self.ready_lock:
+            mods = list(self.ready_mods.values())
+            self.ready_mods.clear()
+
+        if not mods:
+            logging.info("No mods have changed since they were last reloaded.")
+
+        for mod in mods:
+            try:
+                reload_mod(mod)
+            except Exception:  # noqa: BLE001
+                logging.error(f"Failed to reload mod '{mod.module}'")
+                logging.error(traceback.format_exc())
+
+    def _find_mod(self, path: str) -> str | None:
+        """
+        Finds the mod which a modified path belongs to.
+
+        Args:
+            path: The modified path.
+        Returns:
+            The key of the mod in `self.mods`, or None if it doesn't belong to any.
+        """
+        path = os.path.normcase(os.path.abspath(path))  # noqa: PTH100
+        name = os.path.basename(path)  # noqa: PTH119
+        if name == "__pycache__" or name.startswith(".") or name.endswith("~"):
+            return None
+
+        while True:
+            if path in self.mods:
+                return path
+            parent = os.path.dirname(path)  # noqa: PTH120
+            if parent == path:
+                return None
+            if os.path.basename(parent) == "__pycache__":  # noqa: PTH119
+                return None
+            path = parent
+
+    def _create_polling_watcher(self, interval: float) -> Callable[[float | None], set[str]]:
+        """
+        Creates a watcher which polls each mod's signature for changes.
+
+        Args:
+            interval: How often to poll, in seconds.
+        Returns:
+            A function which waits for the next changes (ignoring the timeout, in favour of the poll
+            interval), and returns the keys of all changed mods.
+        """
+        signatures = {key: get_mod_signature(mod) for key, mod in self.mods.items()}
+
+        def wait_for_changes(_timeout: float | None) -> set[str]:
+            self.stop.wait(interval)
+            changed: set[str] = set()
+            for key, mod in self.mods.items():
+                signature = get_mod_signature(mod)
+                if signature != signatures[key]:
+                    signatures[key] = signature
+                    changed.add(key)
+            return changed
+
+        return wait_for_changes
+
+    def _create_inotify_watcher(self) -> Callable[[float | None], set[str]]:
+        """
+        Creates a watcher which uses inotify to wait for changes.
+
+        Returns:
+            A function which waits up to the given timeout for changes, and returns the keys of all
+            changed mods.
+        """
+        watcher = InotifyWatcher()
+        for folder in self.mod_folders:
+            watcher.add_watch(str(folder), False)
+        for key in self.mods:
+            if os.path.isdir(key):  # noqa: PTH112
+                watcher.add_watch(key, True)
+
+        def wait_for_changes(timeout: float | None) -> set[str]:
+            # Wake up at least once a second to check if we've been stopped
+            if not watcher.wait(1 if timeout is None else timeout):
+                return set()
+
+            changed: set[str] = set()
+            for path, mask in watcher.read_events():
+                key = self._find_mod(path)
+                if key is None:
+                    continue
+                changed.add(key)
+
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    watcher.add_watch(path, True)
+            return changed
+
+        return wait_for_changes
+
+
+def wait_for_console() -> None:
+    """Waits for the console to be ready, sleeping between checks rather than spinning."""
+    delay = 0.001
+    while not logging.is_console_ready():
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
 
 
 def hookup_warnings() -> None:
@@ -339,26 +2955,52 @@ def check_proton_bugs() -> None:
 
 # Do as little as possible before console's ready
 
+profile_startup = bool(get_config().get("profile_startup", False))
+trace_startup = bool(get_config().get("trace_startup", False))
+profiler = StartupProfiler(profile_startup or trace_startup)
+profiler.install_import_hook()
+
 # Add all mod folders to `sys.path` first
-mod_folders = get_all_mod_folders()
+with profiler.span("get_all_mod_folders"):
+    mod_folders = get_all_mod_folders()
 for folder in mod_folders:
     sys.path.append(str(folder.resolve()))
 
-init_debugpy()
-
-while not logging.is_console_ready():
-    pass
+# Start discovering mods in the background, so we can overlap it with waiting for the console
+bytecode_cache_enabled = bool(get_config().get("sdkmod_bytecode_cache", True))
+# The console's not ready yet, so hold onto any invalid config warnings until it is
+with capture_logs() as early_config_logs:
+    discovery_threads = get_config_number("discovery_threads", 1, 1, MAX_DISCOVERY_THREADS)
+background_discovery = BackgroundDiscovery(
+    mod_folders,
+    DiscoveryIndex.load() if get_config().get("discovery_index", True) else None,
+    max_workers=discovery_threads,
+    precompile=bool(get_config().get("precompile_folder_mods", True)),
+    warm_bytecode=bytecode_cache_enabled,
+    profiler=profiler,
+)
+background_discovery.start()
+
+with profiler.span("init_debugpy"):
+    init_debugpy()
+
+with profiler.span("wait_for_console"):
+    wait_for_console()
 
 # Now that the console's ready, hook up the warnings system, and show some other warnings users may
 # be interested in
 hookup_warnings()
+replay_logs(early_config_logs)
 
-check_proton_bugs()
+with profiler.span("check_proton_bugs"):
+    check_proton_bugs()
 for folder in mod_folders:
     if not folder.exists() or not folder.is_dir():
         logging.dev_warning(f"Extra mod folder does not exist: {folder}")
 
-mods_to_import = find_mods_to_import(mod_folders)
+mods_to_import = background_discovery.wait_for_mods()
+# Mod manager modules get shipped as .sdkmods too, so this must come before we import any of them
+ModFinder(mods_to_import, bytecode_cache=bytecode_cache_enabled).install()
 
 # Warn about duplicate mods
 for mod in mods_to_import:
@@ -374,10 +3016,96 @@ for mod in mods_to_import:
 # Import any mod manager modules which have specific initialization order requirements.
 # Most modules are fine to get imported as a mod/by another mod, but we need to do a few manually.
 # Prefer to import these after console is ready so we can show errors
-import keybinds  # noqa: F401, E402  # pyright: ignore[reportUnusedImport]
+with profiler.span("import keybinds"):
+    import keybinds
+keybinds.set_stats_enabled(bool(get_config().get("keybind_stats", False)))
+keybinds.set_slow_callback_threshold(
+    get_config_number("keybind_slow_callback_ms", 0.0, 0.0) / 1000,
+)
 from mods_base.mod_list import register_base_mod  # noqa: E402
 
-import_mods(mods_to_import)
+hot_reload_enabled = bool(get_config().get("hot_reload", False))
+if get_config().get("failed_import_cache", False):
+    failed_import_cache = FailedImportCache.load(mods_to_import)
+
+import_budget_ms = get_config_number("import_budget_ms", 0.0, 0.0)
+# Keep `mods_to_import` as the full set, the hot reloader still needs to watch any queued mods
+immediate_mods: Collection[ModInfo] = mods_to_import
+queued_mods: list[ModInfo] = []
+if import_budget_ms > 0:
+    import_watchdog = ImportWatchdog(import_budget_ms)
+    import_watchdog.start()
+    if get_config().get("queue_slow_imports", False):
+        immediate_mods, queued_mods = split_slow_imports(
+            list(mods_to_import),
+            import_watchdog.previous_slow_imports,
+        )
+
+allow_deferred_imports = bool(get_config().get("allow_deferred_imports", True))
+# Shared between every import pass, so mods depending on one which failed earlier get skipped
+failed_imports: set[str] = set()
+import_mod_manager_first = bool(get_config().get("import_mod_manager_first", False))
+if import_mod_manager_first:
+    # Get the mod manager itself up and running first, then import everything else after
+    with profiler.span("import_mod_manager"):
+        import_mods(
+            [mod for mod in immediate_mods if mod.module in MOD_MANAGER_MODULES],
+            profiler,
+            allow_deferred=allow_deferred_imports,
+            failed=failed_imports,
+        )
+    with profiler.span("register_base_mod"):
+        register_base_mod()
+    with profiler.span("import_mods"):
+        import_mods(
+            [mod for mod in immediate_mods if mod.module not in MOD_MANAGER_MODULES],
+            profiler,
+            allow_deferred=allow_deferred_imports,
+            failed=failed_imports,
+        )
+else:
+    with profiler.span("import_mods"):
+        import_mods(
+            immediate_mods,
+            profiler,
+            allow_deferred=allow_deferred_imports,
+            failed=failed_imports,
+        )
+
+    # After importing everything, register the base mod
+    with profiler.span("register_base_mod"):
+        register_base_mod()
+
+if queued_mods:
+    # Now that everything else is up and running, import anything which was slow last time
+    with profiler.span("import_queued_mods"):
+        import_mods(
+            queued_mods,
+            profiler,
+            allow_deferred=allow_deferred_imports,
+            failed=failed_imports,
+        )
 
-# After importing everything, register the base mod
-register_base_mod()
+if import_watchdog is not None:
+    import_watchdog.stop()
+    import_watchdog = None
+
+if failed_import_cache is not None:
+    failed_import_cache.log_summary()
+    failed_import_cache.save()
+    failed_import_cache = None
+
+report_precompile_savings(background_discovery.precompiled)
+
+profiler.remove_import_hook()
+if profile_startup:
+    profiler.report()
+if trace_startup:
+    profiler.write_trace()
+
+if hot_reload_enabled:
+    HotReloader(
+        mod_folders,
+        mods_to_import,
+        poll_interval=get_config_number("hot_reload_poll_interval", 0.0, 0.0) or None,
+    ).start()
@@ -1,25 +1,54 @@
-from functools import wraps
-from typing import cast
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import partial, wraps
+from typing import Any, cast
 
-from mods_base import KeybindType
-from mods_base.keybinds import KeybindCallback_Event, KeybindCallback_NoArgs
+from unrealsdk.hooks import Type
+from unrealsdk.unreal import BoundFunction, UObject, WrappedStruct
+
+from mods_base import KeybindType, hook
+from mods_base.keybinds import EInputEvent, KeybindCallback_Event, KeybindCallback_NoArgs
 from mods_base.mod_list import base_mod
 
-from .keybinds import deregister_keybind, register_keybind
+from .keybinds import (
+    DEFAULT_TAP_WINDOW,
+    _invalidate_menu_state,  # pyright: ignore[reportPrivateUsage]
+    deregister_keybind,
+    register_gesture,
+    register_keybind,
+)
+from .stats import (
+    KeybindStats,
+    get_stats,
+    reset_stats,
+    set_slow_callback_threshold,
+    set_stats_enabled,
+)
 
 __all__: tuple[str, ...] = (
+    "ExtendedKeybindType",
+    "KeybindStats",
     "__author__",
     "__version__",
     "__version_info__",
+    "get_stats",
+    "reset_stats",
+    "set_slow_callback_threshold",
+    "set_stats_enabled",
 )
 
-__version_info__: tuple[int, int] = (2, 5)
+__version_info__: tuple[int, int] = (2, 6)
 __version__: str = f"{__version_info__[0]}.{__version_info__[1]}"
 __author__: str = "bl-sdk"
 
 
 @wraps(KeybindType._enable)  # pyright: ignore[reportPrivateUsage]
-def enable_keybind(self: KeybindType) -> None:
+def enable_keybind(
+    self: KeybindType,
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
+) -> None:
     if self.key is None or self.callback is None:
         return
 
@@ -30,6 +59,8 @@ def enable_keybind(self: KeybindType) -> None:
             self.event_filter,
             True,
             cast(KeybindCallback_Event, self.callback),
+            repeat_interval=repeat_interval,
+            wheel_interval=wheel_interval,
         )
     else:
         handle = register_keybind(
@@ -37,6 +68,8 @@ def enable_keybind(self: KeybindType) -> None:
             self.event_filter,
             True,
             cast(KeybindCallback_NoArgs, self.callback),
+            repeat_interval=repeat_interval,
+            wheel_interval=wheel_interval,
         )
 
     self._kb_handle = handle  # type: ignore
@@ -68,10 +101,68 @@ def rebind_keybind(self: KeybindType, new_key: str | None) -> None:
 
     if self.is_enabled:
         self.key = new_key
-        enable_keybind(self)
+        self._enable()  # pyright: ignore[reportPrivateUsage]
 
 
 KeybindType._rebind = rebind_keybind  # pyright: ignore[reportPrivateUsage]
 
 
+@dataclass(kw_only=True)
+class ExtendedKeybindType(KeybindType):
+    """
+    A keybind which also supports the extra features of the native dispatcher.
+
+    Gestures:
+        modifiers: Keys which must all be held when the key is pressed.
+        hold_time: The minimum time the key must be held, in seconds.
+        taps: How many times the key must be pressed.
+        tap_window: The maximum time between two taps, in seconds.
+
+    Throttling (ignored for gestures):
+        repeat_interval: The minimum time between two key repeat events, in seconds.
+        wheel_interval: The minimum time between two mouse wheel ticks, in seconds.
+    """
+
+    modifiers: Sequence[str] = ()
+    hold_time: float = 0.0
+    taps: int = 1
+    tap_window: float = DEFAULT_TAP_WINDOW
+
+    repeat_interval: float = 0.0
+    wheel_interval: float = 0.0
+
+    def _enable(self) -> None:
+        if self.key is None or self.callback is None:
+            return
+
+        if not (self.modifiers or self.hold_time > 0 or self.taps > 1):
+            enable_keybind(
+                self,
+                repeat_interval=self.repeat_interval,
+                wheel_interval=self.wheel_interval,
+            )
+            return
+
+        callback = self.callback
+        if self.event_filter is None:
+            # Gestures aren't completed by any specific event, report them the same as a press
+            callback = partial(cast(KeybindCallback_Event, callback), EInputEvent.IE_Pressed)
+
+        self._kb_handle = register_gesture(  # type: ignore
+            self.key,
+            True,
+            cast(KeybindCallback_NoArgs, callback),
+            modifiers=self.modifiers,
+            hold_time=self.hold_time,
+            taps=self.taps,
+            tap_window=self.tap_window,
+        )
+
+
+@hook("/Script/OakGame.GFxFrontendMenu:OnMenuStackChanged", Type.POST, immediately_enable=True)
+def menu_stack_change_hook(_1: UObject, _2: WrappedStruct, _3: Any, _4: BoundFunction) -> None:
+    """Hook to make the native side re-check if we're in a menu on the next key event."""
+    _invalidate_menu_state()
+
+
 base_mod.components.append(base_mod.ComponentInfo("Keybinds", __version__))
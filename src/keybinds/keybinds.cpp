@@ -27,20 +27,519 @@ namespace {
 
 using AOakPlayerController = UObject;
 using EInputEvent = uint32_t;
+using Clock = std::chrono::steady_clock;
+
+const constexpr EInputEvent IE_PRESSED = 0;
+const constexpr EInputEvent IE_RELEASED = 1;
+const constexpr EInputEvent IE_REPEAT = 2;
 
 namespace processing {
 
 pyunrealsdk::StaticPyObject input_event_enum = pyunrealsdk::unreal::enum_as_py_enum(
     validate_type<UEnum>(unrealsdk::find_object(L"Enum", L"/Script/Engine.EInputEvent")));
 
+// The upper bounds of each bucket in the callback time histogram. There's an extra overflow bucket
+// for anything slower than the last.
+const constexpr std::array<std::chrono::microseconds, 12> HISTOGRAM_BOUNDS{{
+    std::chrono::microseconds{10},
+    std::chrono::microseconds{25},
+    std::chrono::microseconds{50},
+    std::chrono::microseconds{100},
+    std::chrono::microseconds{250},
+    std::chrono::microseconds{500},
+    std::chrono::microseconds{1000},
+    std::chrono::microseconds{2500},
+    std::chrono::microseconds{5000},
+    std::chrono::microseconds{10000},
+    std::chrono::microseconds{25000},
+    std::chrono::microseconds{50000},
+}};
+
+struct KeybindStats {
+    uint64_t calls{};
+    Clock::duration total_time{};
+    Clock::duration max_time{};
+    std::array<uint64_t, HISTOGRAM_BOUNDS.size() + 1> histogram{};
+};
+
+struct GestureData {
+    // Keys which must all be held when the key is pressed.
+    std::vector<FName> modifiers;
+    // How long the key must be held for, or zero if it fires on press.
+    Clock::duration hold_time{};
+    // How many presses are required, and the maximum time between two of them.
+    uint32_t taps = 1;
+    Clock::duration tap_window{};
+
+    bool pressed{};
+    bool hold_fired{};
+    Clock::time_point press_start{};
+    uint32_t tap_count{};
+    Clock::time_point last_tap{};
+};
+
+struct KeybindData;
+using KeybindList = std::vector<std::shared_ptr<KeybindData>>;
+using KeybindRegistry = std::unordered_map<FName, KeybindList>;
+using KeybindHandle = uint64_t;
+
 struct PY_OBJECT_VISIBILITY KeybindData {
     pyunrealsdk::StaticPyObject callback;
     std::optional<EInputEvent> event;
     bool gameplay_bind{};
+
+    FName key;
+    // The registry this bind is in, and its position in its key's list in it.
+    KeybindRegistry* registry{};
+    size_t idx{};
+    KeybindHandle handle{};
+
+    // The minimum time between delivering two repeat events, or two mouse wheel ticks.
+    Clock::duration repeat_interval{};
+    Clock::duration wheel_interval{};
+
+    Clock::time_point last_repeat{};
+    Clock::time_point last_wheel{};
+    bool wheel_press_delivered{};
+    // If the callback blocked the last event it was run on - throttled events reuse this.
+    bool last_blocked{};
+    // If this bind was throttled for the event currently being processed.
+    bool throttled{};
+
+    // If set, this bind is a gesture, it ignores the event filter and runs only when it completes.
+    std::optional<GestureData> gesture;
+    // If this bind's gesture completed on the event currently being processed.
+    bool gesture_completed{};
+
+    KeybindStats stats{};
 };
 
+/**
+ * @brief Converts a time in seconds, as is used on the Python side, to a clock duration.
+ *
+ * @param seconds The time in seconds.
+ * @return The equivalent duration.
+ */
+Clock::duration seconds_to_duration(double seconds) {
+    return std::chrono::duration_cast<Clock::duration>(std::chrono::duration<double>(seconds));
+}
+
 const FName ANY_KEY{0, 0};
-std::unordered_multimap<FName, std::shared_ptr<KeybindData>> all_keybinds{};
+const FName MOUSE_SCROLL_UP = L"MouseScrollUp"_fn;
+const FName MOUSE_SCROLL_DOWN = L"MouseScrollDown"_fn;
+
+/*
+Mods toggling, and raw keybind frames being pushed/popped, both (de)register binds in bulk, so we
+want both to be constant time, rather than searching through every single bind.
+
+Each key maps to an unordered list of its binds, and each bind knows its own position in that
+list, so it can be swap-removed. Handles are unique ids, which we keep a map of to their binds, so
+that we can validate any handle we're given from Python - even one of a bind which was since freed.
+
+Raw keybinds work off of a stack of frames, where only binds in the top frame are active. Each frame
+has its own registry, so pushing or popping a frame only needs to push/pop the registry, rather
+than disabling/enabling each bind in it. Anything not in a frame goes in the global registry, which
+is always active.
+*/
+KeybindRegistry all_keybinds{};
+// Kept behind pointers so that the binds' registry pointers stay valid when the stack grows
+std::vector<std::unique_ptr<KeybindRegistry>> frame_stack{};
+std::unordered_map<KeybindHandle, KeybindData*> all_handles{};
+KeybindHandle next_handle = 1;
+
+/**
+ * @brief Adds a new keybind to a registry.
+ *
+ * @param data The keybind to add.
+ * @param registry The registry to add it to.
+ * @return The new keybind's handle.
+ */
+KeybindHandle add_keybind(const std::shared_ptr<KeybindData>& data, KeybindRegistry& registry) {
+    auto& list = registry[data->key];
+    data->registry = &registry;
+    data->idx = list.size();
+    data->handle = next_handle++;
+    list.push_back(data);
+    all_handles.emplace(data->handle, data.get());
+    return data->handle;
+}
+
+/**
+ * @brief Removes a keybind from its registry.
+ *
+ * @param handle The handle of the keybind to remove. May be invalid.
+ */
+void remove_keybind(KeybindHandle handle) {
+    auto handle_iter = all_handles.find(handle);
+    if (handle_iter == all_handles.end()) {
+        return;
+    }
+    const auto* data = handle_iter->second;
+    all_handles.erase(handle_iter);
+
+    auto& registry = *data->registry;
+    auto list_iter = registry.find(data->key);
+    auto& list = list_iter->second;
+
+    // Swap the last bind into the removed one's slot. Keep the removed bind alive until we're done
+    // with it, since the list holds the only reference.
+    auto idx = data->idx;
+    auto removed = std::move(list[idx]);
+    if (idx != list.size() - 1) {
+        list[idx] = std::move(list.back());
+        list[idx]->idx = idx;
+    }
+    list.pop_back();
+
+    if (list.empty()) {
+        registry.erase(list_iter);
+    }
+}
+
+/**
+ * @brief Removes all keybinds from a registry.
+ *
+ * @param registry The registry to clear.
+ */
+void clear_registry(KeybindRegistry& registry) {
+    for (const auto& [key, list] : registry) {
+        for (const auto& data : list) {
+            all_handles.erase(data->handle);
+        }
+    }
+    registry.clear();
+}
+
+/**
+ * @brief Gets the list of keybinds registered to the given key.
+ *
+ * @param registry The registry to look in. May be null.
+ * @param key The key to look up.
+ * @return The list of keybinds, which may be empty.
+ */
+const KeybindList& get_keybinds(const KeybindRegistry* registry, FName key) {
+    static const KeybindList empty{};
+    if (registry == nullptr) {
+        return empty;
+    }
+    auto iter = registry->find(key);
+    return iter == registry->end() ? empty : iter->second;
+}
+
+/**
+ * @brief Runs a function on every registered keybind, in every registry.
+ *
+ * @param func The function to run, taking the keybind's data.
+ */
+void for_each_keybind(const std::function<void(KeybindData&)>& func) {
+    auto run_on_registry = [&func](const KeybindRegistry& registry) {
+        for (const auto& [key, list] : registry) {
+            for (const auto& data : list) {
+                func(*data);
+            }
+        }
+    };
+    run_on_registry(all_keybinds);
+    for (const auto& frame : frame_stack) {
+        run_on_registry(*frame);
+    }
+}
+
+/*
+When running callbacks, we need to copy the matching binds out of the registry, in case the
+callbacks (de)register any binds. Key repeats and scrolling can fire a lot of events, so rather than
+allocating new lists on every single one, we reuse a set of per-thread scratch lists, which only
+ever allocate until they've grown big enough.
+
+A callback may indirectly trigger another key event on the same thread (e.g. by calling back into
+unreal), so there's a separate set of lists for each level of nesting. They're kept behind pointers
+so that a nested event growing the outer vector doesn't move the lists an outer event is using.
+*/
+struct ScratchBinds {
+    KeybindList raw_binds;
+    KeybindList gameplay_binds;
+};
+thread_local std::vector<std::unique_ptr<ScratchBinds>> scratch_binds_stack{};
+thread_local size_t scratch_binds_depth = 0;
+
+/**
+ * @brief RAII helper which claims the scratch lists for the current nesting level.
+ * @note Must be destroyed while holding the GIL, since it releases references to the binds, which
+ *       may drop the last reference to a callback.
+ */
+class DispatchScratch {
+   private:
+    ScratchBinds* binds;
+
+   public:
+    DispatchScratch(void) {
+        if (scratch_binds_depth >= scratch_binds_stack.size()) {
+            scratch_binds_stack.push_back(std::make_unique<ScratchBinds>());
+        }
+        this->binds = scratch_binds_stack[scratch_binds_depth++].get();
+    }
+    ~DispatchScratch() {
+        this->binds->raw_binds.clear();
+        this->binds->gameplay_binds.clear();
+        scratch_binds_depth--;
+    }
+
+    DispatchScratch(const DispatchScratch&) = delete;
+    DispatchScratch(DispatchScratch&&) = delete;
+    DispatchScratch& operator=(const DispatchScratch&) = delete;
+    DispatchScratch& operator=(DispatchScratch&&) = delete;
+
+    ScratchBinds& operator*(void) const { return *this->binds; }
+};
+
+/*
+Holding a key down, or scrolling quickly, can send a lot of events, which binds might not care about
+every single one of. Binds may set a minimum interval between repeats, or between mouse wheel ticks,
+and any events within it are dropped before ever reaching Python. A dropped event blocks if the
+last event delivered to the bind did, so that a bind can't suddenly stop blocking halfway through a
+burst.
+
+The wheel sends a press and a release for each tick, the release is only delivered if the press was.
+*/
+
+/**
+ * @brief Checks if a keybind should be skipped for the current event, due to its throttling.
+ *
+ * @param data The keybind to check.
+ * @param is_wheel True if the current event is for a mouse wheel key.
+ * @param input_event What type of event it was.
+ * @param now The time of the current event.
+ * @return True if the keybind's callback should not be run.
+ */
+bool is_throttled(KeybindData& data,
+                  bool is_wheel,
+                  EInputEvent input_event,
+                  Clock::time_point now) {
+    if (input_event == IE_REPEAT) {
+        return data.repeat_interval.count() > 0 && now - data.last_repeat < data.repeat_interval;
+    }
+
+    if (is_wheel && data.wheel_interval.count() > 0) {
+        if (input_event == IE_PRESSED) {
+            // Set when the press actually gets delivered
+            data.wheel_press_delivered = false;
+            return now - data.last_wheel < data.wheel_interval;
+        }
+        if (input_event == IE_RELEASED) {
+            return !data.wheel_press_delivered;
+        }
+    }
+
+    return false;
+}
+
+/**
+ * @brief Updates a keybind's throttling state after it's been delivered an event.
+ *
+ * @param data The keybind which was run.
+ * @param is_wheel True if the current event is for a mouse wheel key.
+ * @param input_event What type of event it was.
+ * @param now The time of the current event.
+ */
+void mark_delivered(KeybindData& data,
+                    bool is_wheel,
+                    EInputEvent input_event,
+                    Clock::time_point now) {
+    if (input_event == IE_REPEAT) {
+        data.last_repeat = now;
+    } else if (is_wheel && input_event == IE_PRESSED) {
+        data.last_wheel = now;
+        data.wheel_press_delivered = true;
+    }
+}
+
+/*
+Gestures let mods use chords, holds, and multi-taps, without needing a Python state machine which
+has to run on every single key event. We track the state of each gesture here, and only run its
+callback when it completes.
+
+To check chords, we need to know which keys are currently held. This only ever holds a handful of
+keys at once, so a plain vector is fine - and it doesn't need to allocate after the first few.
+
+We only see key events while the game has focus, so a release can go missing (e.g. alt-tabbing
+while holding a key), which would leave a modifier held forever. Keyboard and controller keys keep
+sending repeat events while held, so we drop any which haven't had an event in a while. Mouse
+buttons don't repeat, so those only get cleared by their release, or by a raw keybind frame being
+pushed/popped (i.e. a menu opening or closing).
+*/
+struct HeldKey {
+    FName key;
+    Clock::time_point last_event;
+};
+std::vector<HeldKey> held_keys{};
+
+const constexpr auto HELD_KEY_TIMEOUT = std::chrono::seconds{2};
+const std::array<FName, 5> MOUSE_BUTTONS{{
+    L"LeftMouseButton"_fn,
+    L"RightMouseButton"_fn,
+    L"MiddleMouseButton"_fn,
+    L"ThumbMouseButton"_fn,
+    L"ThumbMouseButton2"_fn,
+}};
+
+/**
+ * @brief Updates the list of held keys for a new key event.
+ *
+ * @param key_name The key's name.
+ * @param input_event What type of event it was.
+ * @param now The time of the event.
+ */
+void update_held_keys(FName key_name, EInputEvent input_event, Clock::time_point now) {
+    std::erase_if(held_keys, [now](const auto& held) {
+        return now - held.last_event > HELD_KEY_TIMEOUT
+               && std::ranges::find(MOUSE_BUTTONS, held.key) == MOUSE_BUTTONS.end();
+    });
+
+    auto iter = std::ranges::find(held_keys, key_name, &HeldKey::key);
+    if (input_event == IE_PRESSED || input_event == IE_REPEAT) {
+        if (iter == held_keys.end()) {
+            // Only start holding on a press, we may have expired the key ourselves
+            if (input_event == IE_PRESSED) {
+                held_keys.push_back({.key = key_name, .last_event = now});
+            }
+        } else {
+            iter->last_event = now;
+        }
+    } else if (input_event == IE_RELEASED) {
+        if (iter != held_keys.end()) {
+            held_keys.erase(iter);
+        }
+    }
+}
+
+/**
+ * @brief Updates a gesture's state for a new event on its key.
+ *
+ * @param gesture The gesture to update.
+ * @param input_event What type of event it was.
+ * @param now The time of the current event.
+ * @return True if the gesture completed on this event.
+ */
+bool update_gesture(GestureData& gesture, EInputEvent input_event, Clock::time_point now) {
+    const bool is_hold = gesture.hold_time.count() > 0;
+
+    switch (input_event) {
+        case IE_PRESSED: {
+            const bool modifiers_held = std::ranges::all_of(gesture.modifiers, [](auto modifier) {
+                return std::ranges::find(held_keys, modifier, &HeldKey::key) != held_keys.end();
+            });
+            if (!modifiers_held) {
+                gesture.pressed = false;
+                gesture.tap_count = 0;
+                return false;
+            }
+
+            gesture.pressed = true;
+            gesture.hold_fired = false;
+            gesture.press_start = now;
+            if (is_hold) {
+                return false;
+            }
+
+            if (gesture.tap_count > 0 && now - gesture.last_tap > gesture.tap_window) {
+                gesture.tap_count = 0;
+            }
+            gesture.tap_count++;
+            gesture.last_tap = now;
+
+            if (gesture.tap_count >= gesture.taps) {
+                gesture.tap_count = 0;
+                return true;
+            }
+            return false;
+        }
+
+        // We don't have anything to tick on, so holds complete on the first repeat after the hold
+        // time, or on release if there wasn't one
+        case IE_REPEAT:
+        case IE_RELEASED: {
+            const bool completed = is_hold && gesture.pressed && !gesture.hold_fired
+                                   && now - gesture.press_start >= gesture.hold_time;
+            if (completed) {
+                gesture.hold_fired = true;
+            }
+            if (input_event == IE_RELEASED) {
+                gesture.pressed = false;
+            }
+            return completed;
+        }
+
+        default:
+            return false;
+    }
+}
+
+/*
+To help track down which callbacks are adding input latency, we can optionally time every callback.
+Stats collection keeps a histogram of each bind's call times, and the slow callback threshold warns
+whenever a single call takes longer than it. Both are off by default, we don't even read the clock
+unless one is on.
+*/
+bool stats_enabled = false;
+Clock::duration slow_callback_threshold{};
+
+/**
+ * @brief Gets a user-facing name for a keybind's callback.
+ * @note Requires the GIL.
+ *
+ * @param callback The callback.
+ * @return The callback's name.
+ */
+std::string get_callback_name(const py::object& callback) {
+    auto qualname = py::getattr(callback, "__qualname__", py::none());
+    if (qualname.is_none()) {
+        return py::repr(callback);
+    }
+
+    auto module = py::getattr(callback, "__module__", py::none());
+    if (module.is_none()) {
+        return py::str(qualname);
+    }
+    return std::format("{}.{}", py::str(module).cast<std::string>(),
+                       py::str(qualname).cast<std::string>());
+}
+
+/**
+ * @brief Records how long a keybind's callback took to run.
+ * @note Requires the GIL.
+ *
+ * @param data The keybind which was run.
+ * @param elapsed How long the callback took.
+ */
+void record_callback_time(KeybindData& data, Clock::duration elapsed) {
+    if (stats_enabled) {
+        auto& stats = data.stats;
+        stats.calls++;
+        stats.total_time += elapsed;
+        stats.max_time = std::max(stats.max_time, elapsed);
+
+        auto bucket = std::ranges::lower_bound(HISTOGRAM_BOUNDS, elapsed);
+        stats.histogram.at(bucket - HISTOGRAM_BOUNDS.begin())++;
+    }
+
+    if (slow_callback_threshold.count() > 0 && elapsed >= slow_callback_threshold) {
+        auto key_name = data.key == ANY_KEY ? std::string{"<any>"} : std::format("{}", data.key);
+        LOG(DEV_WARNING, "Keybind callback '{}' on key '{}' took {:.2f}ms",
+            get_callback_name(data.callback), key_name,
+            std::chrono::duration<double, std::milli>(elapsed).count());
+    }
+}
+
+/*
+On BL3, checking if we're in a menu calls a UFunction, which is relatively slow, and we may need to
+do it on every single input event. Instead, we cache the result, and only check again once something
+suggests the menu state changed:
+- The menu stack changed. This is tracked via a Python hook, which invalidates the cache.
+- We're given a different player controller.
+- The mouse cursor was shown or hidden. This is a cheap property read, and changes on most menu
+  transitions, so it acts as a fallback for any which don't go through the menu stack.
+*/
+bool menu_state_valid = false;
 
 /**
  * @brief Checks if the given player controller is in a menu.
@@ -53,55 +552,122 @@ bool is_in_menu(AOakPlayerController* player_controller) {
     static auto is_bl3 =
         unrealsdk::utils::get_executable().filename().string() == "Borderlands3.exe";
 
+    // Since this uses a generic playercontroller property, rather than something oak-specific, we
+    // can always rely on it existing
+    static auto show_mouse_cursor = validate_type<UBoolProperty>(unrealsdk::find_object(
+        L"BoolProperty", L"/Script/Engine.PlayerController:bShowMouseCursor"));
+    const bool cursor_shown = player_controller->get<UBoolProperty>(show_mouse_cursor);
+
     if (is_bl3) {
         // This is the more correct method - but it doesn't work under WL
         static auto is_in_menu = validate_type<UFunction>(
             unrealsdk::find_object(L"Function", L"/Script/OakGame.OakPlayerController:IsInMenu"));
 
-        return BoundFunction{.func = is_in_menu, .object = player_controller}.call<UBoolProperty>();
+        static AOakPlayerController* cached_player_controller = nullptr;
+        static bool cached_cursor_shown = false;
+        static bool cached_is_in_menu = false;
+
+        if (!menu_state_valid || player_controller != cached_player_controller
+            || cursor_shown != cached_cursor_shown) {
+            cached_is_in_menu =
+                BoundFunction{.func = is_in_menu, .object = player_controller}.call<UBoolProperty>();
+            cached_player_controller = player_controller;
+            cached_cursor_shown = cursor_shown;
+            menu_state_valid = true;
+        }
+        return cached_is_in_menu;
 
     } else {  // NOLINT(readability-else-after-return)
 
         // This is less correct, but it seems to work well enough, even works on controller when no
         // cursor is actually drawn
-        // Since this uses a generic playercontroller property, rather than something oak-specific,
-        // we default to it on unknown executables
-        static auto show_mouse_cursor = validate_type<UBoolProperty>(unrealsdk::find_object(
-            L"BoolProperty", L"/Script/Engine.PlayerController:bShowMouseCursor"));
+        // We default to it on unknown executables
+        return cursor_shown;
+    }
+}
 
-        return player_controller->get<UBoolProperty>(show_mouse_cursor);
+/*
+To be able to test and benchmark dispatch outside of the game, we allow recording the raw stream of
+input events, in the same form `handle_key_event` sees them. The recording itself is done in Python,
+since it's only ever turned on temporarily.
+
+Checking if we're in a menu may be slow, so recording shouldn't force it on every event. We only
+record it if dispatching already needed to check it.
+*/
+pyunrealsdk::StaticPyObject input_recorder{};
+
+/**
+ * @brief Passes an input event to the input recorder, if one is set.
+ *
+ * @param key_name The key's name.
+ * @param input_event What type of event it was.
+ * @param in_menu True if the event was done in a menu, or empty if this wasn't checked.
+ * @param now The time of the event.
+ */
+void record_input(FName key_name,
+                  EInputEvent input_event,
+                  std::optional<bool> in_menu,
+                  Clock::time_point now) {
+    const py::gil_scoped_acquire gil{};
+    // A callback may have stopped recording while we were dispatching the event
+    if (!input_recorder) {
+        return;
+    }
+
+    try {
+        input_recorder(key_name, input_event, in_menu,
+                       std::chrono::duration<double>(now.time_since_epoch()).count());
+    } catch (const std::exception& ex) {
+        // Don't let recording break actually processing the event
+        pyunrealsdk::logging::log_python_exception(ex);
     }
 }
 
 /**
- * @brief Handles a key event.
+ * @brief Dispatches a key event to all matching keybinds.
  *
  * @param key_name The key's name.
  * @param input_event What type of event it was.
- * @param check_is_in_menu A function which checks if this input was done in a menu.
+ * @param menu_checker A function which checks if this input was done in a menu.
+ * @param now The time of the event.
  * @return True if to block key processing, false to allow it through.
  */
-bool handle_key_event(FName key_name,
-                      EInputEvent input_event,
-                      const std::function<bool(void)>& menu_checker) {
+bool dispatch_key_event(FName key_name,
+                        EInputEvent input_event,
+                        const std::function<bool(void)>& menu_checker,
+                        Clock::time_point now) {
     // The original keybind implementation was mostly python. It caused massive lockups if you
     // scrolled, even without freescroll it was relatively easy to trigger half second freezes.
 
     // In this implementation, we therefore try our best to keep everything as fast as possible,
     // which also means touching python as little as possible
 
-    const auto any_key_match = all_keybinds.equal_range(ANY_KEY);
-    const auto specific_key_match = all_keybinds.equal_range(key_name);
+    update_held_keys(key_name, input_event, now);
+    // Gestures can only be registered globally
+    for (const auto& data : get_keybinds(&all_keybinds, key_name)) {
+        if (data->gesture.has_value()) {
+            data->gesture_completed = update_gesture(*data->gesture, input_event, now);
+        }
+    }
 
-    const std::array<std::ranges::subrange<decltype(all_keybinds)::iterator>, 2> both_matches{{
-        std::ranges::subrange(any_key_match.first, any_key_match.second),
-        std::ranges::subrange(specific_key_match.first, specific_key_match.second),
+    // Only the global registry and the top raw keybind frame are active
+    const KeybindRegistry* top_frame = frame_stack.empty() ? nullptr : frame_stack.back().get();
+    const std::array<std::reference_wrapper<const KeybindList>, 4> all_matches{{
+        get_keybinds(&all_keybinds, ANY_KEY),
+        get_keybinds(top_frame, ANY_KEY),
+        get_keybinds(&all_keybinds, key_name),
+        get_keybinds(top_frame, key_name),
     }};
-    auto with_matching_key = both_matches | std::views::join;
+    auto with_matching_key =
+        all_matches
+        | std::views::transform([](const auto& list) -> const KeybindList& { return list.get(); })
+        | std::views::join;
 
     auto with_matching_event =
-        with_matching_key | std::views::filter([input_event](const auto& ittr) {
-            auto data = ittr.second;
+        with_matching_key | std::views::filter([input_event](const auto& data) {
+            if (data->gesture.has_value()) {
+                return data->gesture_completed;
+            }
             return !(data->event.has_value() && data->event != input_event);
         });
 
@@ -115,7 +681,7 @@ bool handle_key_event(FName key_name,
     // Assuming the range is probably quite small at this point, so iterating through it an extra
     // time now should be faster than doing some allocations.
     const bool has_gameplay_bind = std::ranges::any_of(
-        with_matching_event, [](const auto& val) { return val.second->gameplay_bind; });
+        with_matching_event, [](const auto& val) { return val->gameplay_bind; });
 
     // Checking if we're in a menu is potentially slow (it may call an unreal function), so don't
     // need to do it if we don't have any gameplay binds
@@ -123,58 +689,136 @@ bool handle_key_event(FName key_name,
 
     if (dont_run_gameplay_binds) {
         const bool has_raw_bind = std::ranges::any_of(
-            with_matching_event, [](const auto& val) { return !val.second->gameplay_bind; });
+            with_matching_event, [](const auto& val) { return !val->gameplay_bind; });
         if (!has_raw_bind) {
             return false;
         }
     }
 
-    // Now we're definitely going to run the callback, copy into vectors
-    std::vector<decltype(all_keybinds)::value_type> raw_binds{};
-    std::vector<decltype(all_keybinds)::value_type> gameplay_binds{};
-    std::ranges::partition_copy(with_matching_event, std::back_inserter(gameplay_binds),
-                                std::back_inserter(raw_binds),
-                                [](const auto& val) { return val.second->gameplay_bind; });
+    // Drop any throttled binds. If that leaves nothing to run, we can skip touching python at all.
+    const bool is_wheel = key_name == MOUSE_SCROLL_UP || key_name == MOUSE_SCROLL_DOWN;
+
+    bool raw_throttled_block = false;
+    bool gameplay_throttled_block = false;
+    bool has_unthrottled_bind = false;
+    for (const auto& data : with_matching_event) {
+        if (data->gameplay_bind && dont_run_gameplay_binds) {
+            continue;
+        }
+
+        data->throttled = is_throttled(*data, is_wheel, input_event, now);
+        if (!data->throttled) {
+            has_unthrottled_bind = true;
+        } else if (data->last_blocked) {
+            (data->gameplay_bind ? gameplay_throttled_block : raw_throttled_block) = true;
+        }
+    }
+
+    if (!has_unthrottled_bind) {
+        return raw_throttled_block || gameplay_throttled_block;
+    }
 
     const py::gil_scoped_acquire gil{};
 
-    // We might be able to get away with skipping creating this enum, saves us some more time.
+    // Now we're definitely going to run the callback, copy into our scratch buffers
+    const DispatchScratch scratch{};
+    auto& [raw_binds, gameplay_binds] = *scratch;
+    std::ranges::partition_copy(
+        with_matching_event | std::views::filter([](const auto& val) { return !val->throttled; }),
+        std::back_inserter(gameplay_binds), std::back_inserter(raw_binds),
+        [](const auto& val) { return val->gameplay_bind; });
+
+    // We might be able to get away with skipping creating these objects, saves us some more time.
+    py::object key_as_str{};
     py::object event_as_enum{};
 
-    auto run_callbacks = [key_name, &event_as_enum, input_event](const auto& range) {
+    auto run_callbacks = [key_name, &key_as_str, &event_as_enum, input_event, is_wheel,
+                          now](const auto& range) {
         bool should_block = false;
-        for (const auto& ittr : range) {
-            auto [key, data] = ittr;
+        for (const auto& data : range) {
+            mark_delivered(*data, is_wheel, input_event, now);
 
-            py::list args;
-            if (key == ANY_KEY) {
-                args.append(key_name);
+            // Leave a spare slot at the front, which vectorcall is allowed to temporarily overwrite
+            // (e.g. to prepend self for bound methods), saves it needing to allocate a new tuple
+            std::array<PyObject*, 3> args{};
+            size_t nargs = 0;
+
+            if (data->key == ANY_KEY) {
+                if (!key_as_str) {
+                    key_as_str = py::cast(key_name);
+                }
+                args.at(1 + nargs++) = key_as_str.ptr();
             }
-            if (!data->event.has_value()) {
+            if (!data->event.has_value() && !data->gesture.has_value()) {
                 if (!event_as_enum) {
                     event_as_enum = input_event_enum(input_event);
                 }
-                args.append(event_as_enum);
+                args.at(1 + nargs++) = event_as_enum.ptr();
+            }
+
+            const bool timed = stats_enabled || slow_callback_threshold.count() > 0;
+            const auto call_start = timed ? Clock::now() : Clock::time_point{};
+
+            auto ret = py::reinterpret_steal<py::object>(
+                PyObject_Vectorcall(data->callback.ptr(), &args.at(1),
+                                    nargs | PY_VECTORCALL_ARGUMENTS_OFFSET, nullptr));
+            if (!ret) {
+                throw py::error_already_set();
             }
 
-            auto ret = data->callback(*args);
-            if (pyunrealsdk::hooks::is_block_sentinel(ret)) {
+            if (timed) {
+                record_callback_time(*data, Clock::now() - call_start);
+            }
+            data->last_blocked = pyunrealsdk::hooks::is_block_sentinel(ret);
+            if (data->last_blocked) {
                 should_block = true;
             }
         }
         return should_block;
     };
 
-    if (run_callbacks(raw_binds)) {
+    if (run_callbacks(raw_binds) || raw_throttled_block) {
         return true;
     }
-    if (!dont_run_gameplay_binds && run_callbacks(gameplay_binds)) {
+    if (!dont_run_gameplay_binds
+        && (run_callbacks(gameplay_binds) || gameplay_throttled_block)) {
         return true;
     }
 
     return false;
 }
 
+/**
+ * @brief Handles a key event.
+ *
+ * @param key_name The key's name.
+ * @param input_event What type of event it was.
+ * @param menu_checker A function which checks if this input was done in a menu.
+ * @param now The time of the event. Only intended to be overwritten when replaying inputs.
+ * @return True if to block key processing, false to allow it through.
+ */
+bool handle_key_event(FName key_name,
+                      EInputEvent input_event,
+                      const std::function<bool(void)>& menu_checker,
+                      Clock::time_point now = Clock::now()) {
+    if (!input_recorder) {
+        return dispatch_key_event(key_name, input_event, menu_checker, now);
+    }
+
+    std::optional<bool> in_menu{};
+    auto ret = dispatch_key_event(
+        key_name, input_event,
+        [&menu_checker, &in_menu]() {
+            if (!in_menu.has_value()) {
+                in_menu = menu_checker();
+            }
+            return *in_menu;
+        },
+        now);
+    record_input(key_name, input_event, in_menu, now);
+    return ret;
+}
+
 }  // namespace processing
 
 namespace hook {
@@ -272,6 +916,8 @@ uintptr_t handle_raw_input_hook(void* self,
 
 }  // namespace
 
+const constexpr auto DEFAULT_TAP_WINDOW = 0.3;
+
 // NOLINTNEXTLINE(readability-identifier-length)
 PYBIND11_MODULE(keybinds, m) {
     detour(hook::OAKPC_INPUTKEY_PATTERN, hook::oakpc_inputkey_hook, &hook::oakpc_inputkey_ptr,
@@ -282,12 +928,23 @@ PYBIND11_MODULE(keybinds, m) {
     m.def(
         "register_keybind",
         [](const std::optional<FName>& key, const std::optional<EInputEvent>& event,
-           bool gameplay_bind, const py::object& callback) -> void* {
+           bool gameplay_bind, const py::object& callback, double repeat_interval,
+           double wheel_interval, bool in_frame) {
+            if (repeat_interval < 0 || wheel_interval < 0) {
+                throw std::invalid_argument("Keybind intervals cannot be negative!");
+            }
+            if (in_frame && processing::frame_stack.empty()) {
+                throw std::out_of_range("Can't register a keybind in a frame, none are pushed!");
+            }
+
             auto key_name = key.has_value() ? *key : processing::ANY_KEY;
-            auto data = std::make_shared<processing::KeybindData>(callback, event, gameplay_bind);
+            auto data = std::make_shared<processing::KeybindData>(callback, event, gameplay_bind,
+                                                                  key_name);
+            data->repeat_interval = processing::seconds_to_duration(repeat_interval);
+            data->wheel_interval = processing::seconds_to_duration(wheel_interval);
 
-            processing::all_keybinds.emplace(std::make_pair(key_name, data));
-            return data.get();
+            return processing::add_keybind(data, in_frame ? *processing::frame_stack.back()
+                                                          : processing::all_keybinds);
         },
         "Registers a new keybind.\n"
         "\n"
@@ -298,23 +955,83 @@ PYBIND11_MODULE(keybinds, m) {
         "The callback may return the sentinel `Block` type (or an instance thereof) in\n"
         "order to block normal processing of the key event.\n"
         "\n"
+        "Repeat events, and mouse wheel ticks, may optionally be throttled. Events within\n"
+        "the interval since the last one the callback was run on are dropped without\n"
+        "running it, they block if the last event the callback was run on did.\n"
+        "\n"
+        "Keybinds may be registered in the current raw keybind frame, in which case\n"
+        "they're only active while it's on top of the stack, and are removed when it's\n"
+        "popped.\n"
+        "\n"
         "Args:\n"
         "    key: The key to match, or None to match any.\n"
         "    event: The key event to match, or None to match any.\n"
         "    gameplay_bind: True if this keybind should only trigger during gameplay.\n"
         "    callback: The callback to use.\n"
+        "    repeat_interval: The minimum time between repeat events, in seconds.\n"
+        "    wheel_interval: The minimum time between mouse wheel ticks, in seconds.\n"
+        "    in_frame: True if to register in the current raw keybind frame.\n"
         "Returns:\n"
         "    An opaque handle to be used in calls to deregister_keybind.",
-        "key"_a, "event"_a, "gameplay_bind"_a, "callback"_a);
+        "key"_a, "event"_a, "gameplay_bind"_a, "callback"_a, py::kw_only{},
+        "repeat_interval"_a = 0.0, "wheel_interval"_a = 0.0, "in_frame"_a = false);
 
     m.def(
-        "deregister_keybind",
-        [](void* handle) {
-            std::erase_if(processing::all_keybinds, [handle](const auto& entry) {
-                const auto& [key, data] = entry;
-                return data.get() == handle;
-            });
+        "register_gesture",
+        [](FName key, bool gameplay_bind, const py::object& callback,
+           const std::vector<FName>& modifiers, double hold_time, uint32_t taps,
+           double tap_window) {
+            if (hold_time < 0 || tap_window < 0) {
+                throw std::invalid_argument("Gesture times cannot be negative!");
+            }
+            if (taps < 1) {
+                throw std::invalid_argument("Gestures require at least one tap!");
+            }
+            if (taps > 1 && hold_time > 0) {
+                throw std::invalid_argument("Gestures cannot be both a hold and a multi-tap!");
+            }
+
+            auto data = std::make_shared<processing::KeybindData>(callback, std::nullopt,
+                                                                  gameplay_bind, key);
+            data->gesture = processing::GestureData{
+                .modifiers = modifiers,
+                .hold_time = processing::seconds_to_duration(hold_time),
+                .taps = taps,
+                .tap_window = processing::seconds_to_duration(tap_window),
+            };
+
+            return processing::add_keybind(data, processing::all_keybinds);
         },
+        "Registers a new gesture keybind.\n"
+        "\n"
+        "Gestures may require other modifier keys to be held when the key is pressed\n"
+        "(chords), the key to be held for a minimum time, or the key to be pressed\n"
+        "multiple times in a row. The callback is run with no args, only once the whole\n"
+        "gesture completes.\n"
+        "\n"
+        "Holds complete on the first repeat event after the hold time passes, or on\n"
+        "release if there wasn't one.\n"
+        "\n"
+        "The callback may return the sentinel `Block` type (or an instance thereof) in\n"
+        "order to block normal processing of the key event which completed the gesture.\n"
+        "\n"
+        "Args:\n"
+        "    key: The key to match.\n"
+        "    gameplay_bind: True if this keybind should only trigger during gameplay.\n"
+        "    callback: The callback to use.\n"
+        "    modifiers: Keys which must all be held when the key is pressed.\n"
+        "    hold_time: The minimum time the key must be held, in seconds.\n"
+        "    taps: How many times the key must be pressed.\n"
+        "    tap_window: The maximum time between two taps, in seconds.\n"
+        "Returns:\n"
+        "    An opaque handle to be used in calls to deregister_keybind.",
+        "key"_a, "gameplay_bind"_a, "callback"_a, py::kw_only{},
+        "modifiers"_a = std::vector<FName>{}, "hold_time"_a = 0.0, "taps"_a = 1,
+        "tap_window"_a = DEFAULT_TAP_WINDOW);
+
+    m.def(
+        "deregister_keybind",
+        [](processing::KeybindHandle handle) { processing::remove_keybind(handle); },
         "Removes a previously registered keybind.\n"
         "\n"
         "Does nothing if the passed handle is invalid.\n"
@@ -327,10 +1044,21 @@ PYBIND11_MODULE(keybinds, m) {
         "_deregister_by_key",
         [](const std::optional<FName>& key) {
             auto key_to_erase = key.has_value() ? *key : processing::ANY_KEY;
-            std::erase_if(processing::all_keybinds, [key_to_erase](const auto& entry) {
-                const auto& [key_in_map, data] = entry;
-                return key_to_erase == key_in_map;
-            });
+            auto erase_from = [key_to_erase](processing::KeybindRegistry& registry) {
+                auto iter = registry.find(key_to_erase);
+                if (iter == registry.end()) {
+                    return;
+                }
+                for (const auto& data : iter->second) {
+                    processing::all_handles.erase(data->handle);
+                }
+                registry.erase(iter);
+            };
+
+            erase_from(processing::all_keybinds);
+            for (const auto& frame : processing::frame_stack) {
+                erase_from(*frame);
+            }
         },
         "Deregisters all keybinds matching the given key.\n"
         "\n"
@@ -341,9 +1069,153 @@ PYBIND11_MODULE(keybinds, m) {
         "    key: The key to remove all keybinds of.");
 
     m.def(
-        "_deregister_all", []() { processing::all_keybinds.clear(); },
+        "_deregister_all",
+        []() {
+            // Leave the frames themselves alone, so they stay in sync with the python side
+            processing::clear_registry(processing::all_keybinds);
+            for (const auto& frame : processing::frame_stack) {
+                processing::clear_registry(*frame);
+            }
+        },
         "Deregisters all keybinds.\n"
         "\n"
         "Not intended for regular use, only exists for recovery during debugging, in case\n"
         "a handle was lost.");
+
+    m.def(
+        "push_frame",
+        []() {
+            processing::frame_stack.push_back(std::make_unique<processing::KeybindRegistry>());
+            processing::held_keys.clear();
+        },
+        "Pushes a new raw keybind frame.\n"
+        "\n"
+        "While a frame is on top of the stack, only keybinds registered in it, and\n"
+        "keybinds not registered in any frame, are active.");
+
+    m.def(
+        "pop_frame",
+        []() {
+            if (processing::frame_stack.empty()) {
+                throw std::out_of_range("Can't pop raw keybind frame, none are pushed!");
+            }
+            processing::clear_registry(*processing::frame_stack.back());
+            processing::frame_stack.pop_back();
+            processing::held_keys.clear();
+        },
+        "Pops the current raw keybind frame, deregistering all keybinds in it.");
+
+    m.def(
+        "_invalidate_menu_state",
+        []() { processing::menu_state_valid = false; },
+        "Invalidates the cached menu state, so the next key event checks it again.\n"
+        "\n"
+        "Not intended for regular use, only exists to be called when the menu stack\n"
+        "changes.");
+
+    m.def(
+        "_set_input_recorder",
+        [](const py::object& recorder) {
+            processing::input_recorder = recorder.is_none() ? py::object{} : recorder;
+        },
+        "Sets a callback to be passed every input event, after it's processed.\n"
+        "\n"
+        "Not intended for regular use, only exists to record inputs to replay for\n"
+        "testing.\n"
+        "\n"
+        "Args:\n"
+        "    recorder: A callback taking the key, the event as an int, if the event was\n"
+        "              done in a menu (or None if processing it didn't need to check),\n"
+        "              and the event's timestamp in seconds, on an arbitrary monotonic\n"
+        "              clock. None to stop recording.",
+        "recorder"_a);
+
+    m.def(
+        "_handle_key_event",
+        [](FName key, EInputEvent event, bool in_menu, double timestamp) {
+            return processing::handle_key_event(
+                key, event, [in_menu]() { return in_menu; },
+                Clock::time_point{processing::seconds_to_duration(timestamp)});
+        },
+        "Processes a key event, as if it were sent by the game.\n"
+        "\n"
+        "Not intended for regular use, only exists to replay recorded inputs for\n"
+        "testing.\n"
+        "\n"
+        "Args:\n"
+        "    key: The key's name.\n"
+        "    event: The event, as an int.\n"
+        "    in_menu: True if to process the event as if in a menu.\n"
+        "    timestamp: The time of the event, in seconds, on an arbitrary monotonic clock.\n"
+        "Returns:\n"
+        "    True if the event should be blocked.",
+        "key"_a, "event"_a, "in_menu"_a, "timestamp"_a);
+
+    m.attr("DEFAULT_TAP_WINDOW") = DEFAULT_TAP_WINDOW;
+
+    m.attr("_STATS_HISTOGRAM_BOUNDS") = [] {
+        py::list bounds{};
+        for (auto bound : processing::HISTOGRAM_BOUNDS) {
+            bounds.append(std::chrono::duration<double>(bound).count());
+        }
+        return py::tuple(bounds);
+    }();
+
+    m.def(
+        "set_stats_enabled", [](bool enabled) { processing::stats_enabled = enabled; },
+        "Sets if to collect timing stats on every keybind callback.\n"
+        "\n"
+        "Args:\n"
+        "    enabled: True if to collect stats.",
+        "enabled"_a);
+
+    m.def(
+        "set_slow_callback_threshold",
+        [](double threshold) {
+            if (threshold < 0) {
+                throw std::invalid_argument("Slow callback threshold cannot be negative!");
+            }
+            processing::slow_callback_threshold = processing::seconds_to_duration(threshold);
+        },
+        "Sets the threshold over which a keybind callback is considered slow.\n"
+        "\n"
+        "Any callback which takes longer than this to run prints a dev warning.\n"
+        "\n"
+        "Args:\n"
+        "    threshold: The threshold, in seconds, or 0 to disable.",
+        "threshold"_a);
+
+    m.def(
+        "reset_stats",
+        []() { processing::for_each_keybind([](auto& data) { data.stats = {}; }); },
+        "Resets the timing stats of every keybind.");
+
+    m.def(
+        "_get_stats",
+        []() {
+            py::list all_stats{};
+            processing::for_each_keybind([&all_stats](const auto& data) {
+                const auto& stats = data.stats;
+
+                py::list histogram{};
+                for (auto count : stats.histogram) {
+                    histogram.append(count);
+                }
+
+                all_stats.append(py::make_tuple(
+                    data.key == processing::ANY_KEY ? py::none() : py::cast(data.key),
+                    data.event.has_value() ? processing::input_event_enum(*data.event)
+                                           : py::object{py::none()},
+                    data.gameplay_bind, data.callback, stats.calls,
+                    std::chrono::duration<double>(stats.total_time).count(),
+                    std::chrono::duration<double>(stats.max_time).count(),
+                    py::tuple(histogram)));
+            });
+            return all_stats;
+        },
+        "Gets the timing stats of every keybind.\n"
+        "\n"
+        "Returns:\n"
+        "    A list of tuples of each keybind's key, event, gameplay bind flag, callback,\n"
+        "    call count, total time, max time, and call time histogram.");
 }
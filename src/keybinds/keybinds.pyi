@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from typing import NewType, overload
 
 from unrealsdk.hooks import Block
@@ -8,12 +8,32 @@ from unrealsdk.hooks import Block
 from mods_base import EInputEvent
 
 __all__: tuple[str, ...] = (
+    "DEFAULT_TAP_WINDOW",
     "deregister_keybind",
+    "pop_frame",
+    "push_frame",
+    "register_gesture",
     "register_keybind",
+    "reset_stats",
+    "set_slow_callback_threshold",
+    "set_stats_enabled",
 )
 
 _KeybindHandle = NewType("_KeybindHandle", object)
 type _BlockSignal = None | Block | type[Block]
+type _RawKeybindStats = tuple[
+    str | None,
+    EInputEvent | None,
+    bool,
+    Callable[..., _BlockSignal],
+    int,
+    float,
+    float,
+    tuple[int, ...],
+]
+
+DEFAULT_TAP_WINDOW: float
+_STATS_HISTOGRAM_BOUNDS: tuple[float, ...]
 
 @overload
 def register_keybind(
@@ -21,6 +41,10 @@ def register_keybind(
     event: EInputEvent,
     gameplay_bind: bool,
     callback: Callable[[], _BlockSignal],
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
+    in_frame: bool = False,
 ) -> _KeybindHandle: ...
 @overload
 def register_keybind(
@@ -28,6 +52,10 @@ def register_keybind(
     event: EInputEvent,
     gameplay_bind: bool,
     callback: Callable[[str], _BlockSignal],
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
+    in_frame: bool = False,
 ) -> _KeybindHandle: ...
 @overload
 def register_keybind(
@@ -35,6 +63,10 @@ def register_keybind(
     event: None,
     gameplay_bind: bool,
     callback: Callable[[EInputEvent], _BlockSignal],
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
+    in_frame: bool = False,
 ) -> _KeybindHandle: ...
 @overload
 def register_keybind(
@@ -42,12 +74,20 @@ def register_keybind(
     event: None,
     gameplay_bind: bool,
     callback: Callable[[str, EInputEvent], _BlockSignal],
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
+    in_frame: bool = False,
 ) -> _KeybindHandle: ...
 def register_keybind(
     key: str | None,
     event: EInputEvent | None,
     gameplay_bind: bool,
     callback: Callable[..., _BlockSignal],
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
+    in_frame: bool = False,
 ) -> _KeybindHandle:
     """
     Registers a new keybind.
@@ -59,11 +99,58 @@ def register_keybind(
     The callback may return the sentinel `Block` type (or an instance thereof) in
     order to block normal processing of the key event.
 
+    Repeat events, and mouse wheel ticks, may optionally be throttled. Events within
+    the interval since the last one the callback was run on are dropped without
+    running it, they block if the last event the callback was run on did.
+
+    Keybinds may be registered in the current raw keybind frame, in which case
+    they're only active while it's on top of the stack, and are removed when it's
+    popped.
+
     Args:
         key: The key to match, or None to match any.
         event: The key event to match, or None to match any.
         gameplay_bind: True if this keybind should only trigger during gameplay.
         callback: The callback to use.
+        repeat_interval: The minimum time between repeat events, in seconds.
+        wheel_interval: The minimum time between mouse wheel ticks, in seconds.
+        in_frame: True if to register in the current raw keybind frame.
+    Returns:
+        An opaque handle to be used in calls to deregister_keybind.
+    """
+
+def register_gesture(
+    key: str,
+    gameplay_bind: bool,
+    callback: Callable[[], _BlockSignal],
+    *,
+    modifiers: Sequence[str] = (),
+    hold_time: float = 0.0,
+    taps: int = 1,
+    tap_window: float = DEFAULT_TAP_WINDOW,
+) -> _KeybindHandle:
+    """
+    Registers a new gesture keybind.
+
+    Gestures may require other modifier keys to be held when the key is pressed
+    (chords), the key to be held for a minimum time, or the key to be pressed
+    multiple times in a row. The callback is run with no args, only once the whole
+    gesture completes.
+
+    Holds complete on the first repeat event after the hold time passes, or on
+    release if there wasn't one.
+
+    The callback may return the sentinel `Block` type (or an instance thereof) in
+    order to block normal processing of the key event which completed the gesture.
+
+    Args:
+        key: The key to match.
+        gameplay_bind: True if this keybind should only trigger during gameplay.
+        callback: The callback to use.
+        modifiers: Keys which must all be held when the key is pressed.
+        hold_time: The minimum time the key must be held, in seconds.
+        taps: How many times the key must be pressed.
+        tap_window: The maximum time between two taps, in seconds.
     Returns:
         An opaque handle to be used in calls to deregister_keybind.
     """
@@ -96,3 +183,84 @@ def _deregister_all() -> None:
     Not intended for regular use, only exists for recovery during debugging, in case
     a handle was lost.
     """
+
+def push_frame() -> None:
+    """
+    Pushes a new raw keybind frame.
+
+    While a frame is on top of the stack, only keybinds registered in it, and
+    keybinds not registered in any frame, are active.
+    """
+
+def pop_frame() -> None:
+    """Pops the current raw keybind frame, deregistering all keybinds in it."""
+
+def set_stats_enabled(enabled: bool) -> None:
+    """
+    Sets if to collect timing stats on every keybind callback.
+
+    Args:
+        enabled: True if to collect stats.
+    """
+
+def set_slow_callback_threshold(threshold: float) -> None:
+    """
+    Sets the threshold over which a keybind callback is considered slow.
+
+    Any callback which takes longer than this to run prints a dev warning.
+
+    Args:
+        threshold: The threshold, in seconds, or 0 to disable.
+    """
+
+def reset_stats() -> None:
+    """Resets the timing stats of every keybind."""
+
+def _get_stats() -> list[_RawKeybindStats]:
+    """
+    Gets the timing stats of every keybind.
+
+    Returns:
+        A list of tuples of each keybind's key, event, gameplay bind flag, callback,
+        call count, total time, max time, and call time histogram.
+    """
+
+def _invalidate_menu_state() -> None:
+    """
+    Invalidates the cached menu state, so the next key event checks it again.
+
+    Not intended for regular use, only exists to be called when the menu stack
+    changes.
+    """
+
+def _set_input_recorder(
+    recorder: Callable[[str, int, bool | None, float], None] | None,
+) -> None:
+    """
+    Sets a callback to be passed every input event, after it's processed.
+
+    Not intended for regular use, only exists to record inputs to replay for
+    testing.
+
+    Args:
+        recorder: A callback taking the key, the event as an int, if the event was
+                  done in a menu (or None if processing it didn't need to check),
+                  and the event's timestamp in seconds, on an arbitrary monotonic
+                  clock. None to stop recording.
+    """
+
+def _handle_key_event(key: str, event: int, in_menu: bool, timestamp: float) -> bool:
+    """
+    Processes a key event, as if it were sent by the game.
+
+    Not intended for regular use, only exists to replay recorded inputs for
+    testing.
+
+    Args:
+        key: The key's name.
+        event: The event, as an int.
+        in_menu: True if to process the event as if in a menu.
+        timestamp: The time of the event, in seconds, on an arbitrary monotonic clock.
+    Returns:
+        True if the event should be blocked.
+    """
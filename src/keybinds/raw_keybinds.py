@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, cast, overload
 
 from mods_base.keybinds import EInputEvent, KeybindBlockSignal
 
-from .keybinds import deregister_keybind, register_keybind
+from .keybinds import deregister_keybind, pop_frame, push_frame, register_keybind
 
 if TYPE_CHECKING:
     from .keybinds import _KeybindHandle  # pyright: ignore[reportPrivateUsage]
@@ -23,7 +23,9 @@ temporarily add some extra callbacks, primarily to help enhance menus.
 
 Raw keybinds work off of a stack. The top of the stack represents the currently focused menu, only
 callbacks within it are processed. On opening a new menu, with different focus, you should push a
-new frame, and register callbacks within it. On closing a menu, you should pop it's frame.
+new frame, and register callbacks within it. On closing a menu, you should pop it's frame. Frames
+are tracked natively, so pushing and popping costs the same no matter how many callbacks each
+frame has.
 
 Raw keybinds follow the standard blocking logic when multiple callbacks receive the same event. Raw
 keybinds are processed *before* gameplay keybinds, so a raw keybind specifying to block the input
@@ -54,11 +56,23 @@ class RawKeybind:
     key: str | None
     event: EInputEvent | None
     callback: RawKeybindCallback_Any
+    repeat_interval: float = 0.0
+    wheel_interval: float = 0.0
 
     _handle: _KeybindHandle | None = None
 
     def enable(self) -> None:
-        """Enables this keybind."""
+        """
+        Enables this keybind.
+
+        Binds can only be registered in the top frame, so this may only be called while the frame
+        this bind was added to is on top.
+        """
+        if not raw_keybind_callback_stack or not any(
+            bind is self for bind in raw_keybind_callback_stack[-1]
+        ):
+            raise RuntimeError("Can't enable a raw keybind while its frame isn't on top!")
+
         if self._handle is not None:
             self.disable()
 
@@ -70,6 +84,9 @@ class RawKeybind:
                     self.event,
                     False,
                     cast(RawKeybindCallback_KeyAndEvent, self.callback),
+                    repeat_interval=self.repeat_interval,
+                    wheel_interval=self.wheel_interval,
+                    in_frame=True,
                 )
             else:
                 self._handle = register_keybind(
@@ -77,6 +94,9 @@ class RawKeybind:
                     self.event,
                     False,
                     cast(RawKeybindCallback_KeyOnly, self.callback),
+                    repeat_interval=self.repeat_interval,
+                    wheel_interval=self.wheel_interval,
+                    in_frame=True,
                 )
         elif self.event is None:
             self._handle = register_keybind(
@@ -84,6 +104,9 @@ class RawKeybind:
                 self.event,
                 False,
                 cast(RawKeybindCallback_EventOnly, self.callback),
+                repeat_interval=self.repeat_interval,
+                wheel_interval=self.wheel_interval,
+                in_frame=True,
             )
         else:
             self._handle = register_keybind(
@@ -91,6 +114,9 @@ class RawKeybind:
                 self.event,
                 False,
                 cast(RawKeybindCallback_NoArgs, self.callback),
+                repeat_interval=self.repeat_interval,
+                wheel_interval=self.wheel_interval,
+                in_frame=True,
             )
 
     def disable(self) -> None:
@@ -107,24 +133,16 @@ raw_keybind_callback_stack: list[list[RawKeybind]] = []
 
 def push() -> None:
     """Pushes a new raw keybind frame."""
-    if raw_keybind_callback_stack:
-        old_frame = raw_keybind_callback_stack[-1]
-        for bind in old_frame:
-            bind.disable()
-
+    push_frame()
     raw_keybind_callback_stack.append([])
 
 
 def pop() -> None:
     """Pops the current raw keybind frame."""
-    old_frame = raw_keybind_callback_stack.pop()
-    for bind in old_frame:
-        bind.disable()
-
-    if raw_keybind_callback_stack:
-        new_frame = raw_keybind_callback_stack[-1]
-        for bind in new_frame:
-            bind.enable()
+    # Popping the native frame removes all it's binds at once, so just forget their handles
+    for bind in raw_keybind_callback_stack.pop():
+        bind._handle = None
+    pop_frame()
 
 
 @overload
@@ -132,6 +150,9 @@ def add(
     key: str,
     event: EInputEvent,
     callback: RawKeybindCallback_NoArgs,
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
 ) -> None: ...
 
 
@@ -140,6 +161,9 @@ def add(
     key: str,
     event: None,
     callback: RawKeybindCallback_EventOnly,
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
 ) -> None: ...
 
 
@@ -148,6 +172,9 @@ def add(
     key: None,
     event: EInputEvent,
     callback: RawKeybindCallback_KeyOnly,
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
 ) -> None: ...
 
 
@@ -156,6 +183,9 @@ def add(
     key: None,
     event: None,
     callback: RawKeybindCallback_KeyAndEvent,
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
 ) -> None: ...
 
 
@@ -164,6 +194,9 @@ def add(
     key: str,
     event: EInputEvent = EInputEvent.IE_Pressed,
     callback: None = None,
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
 ) -> Callable[[RawKeybindCallback_NoArgs], None]: ...
 
 
@@ -172,6 +205,9 @@ def add(
     key: str,
     event: None,
     callback: None = None,
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
 ) -> Callable[[RawKeybindCallback_EventOnly], None]: ...
 
 
@@ -180,6 +216,9 @@ def add(
     key: None,
     event: EInputEvent = EInputEvent.IE_Pressed,
     callback: None = None,
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
 ) -> Callable[[RawKeybindCallback_KeyOnly], None]: ...
 
 
@@ -188,6 +227,9 @@ def add(
     key: None,
     event: None,
     callback: None = None,
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
 ) -> Callable[[RawKeybindCallback_KeyAndEvent], None]: ...
 
 
@@ -195,6 +237,9 @@ def add(
     key: str | None,
     event: EInputEvent | None = EInputEvent.IE_Pressed,
     callback: RawKeybindCallback_Any | None = None,
+    *,
+    repeat_interval: float = 0.0,
+    wheel_interval: float = 0.0,
 ) -> RawKeybindDecorator_Any | None:
     """
     Adds a new raw keybind callback in the current frame.
@@ -203,12 +248,16 @@ def add(
         key: The key to filter to, or None to be passed all keys.
         event: The event to filter to, or None to be passed all events.
         callback: The callback to run. If None, this function acts as a decorator factory,
+        repeat_interval: The minimum time between running the callback on repeat events, in
+                         seconds. Repeats within this interval are dropped.
+        wheel_interval: The minimum time between running the callback on mouse wheel ticks, in
+                        seconds. Ticks within this interval are dropped.
     Returns:
         If the callback was not explicitly provided, a decorator to register it.
     """
 
     def decorator(callback: RawKeybindCallback_Any) -> None:
-        bind = RawKeybind(key, event, callback)
+        bind = RawKeybind(key, event, callback, repeat_interval, wheel_interval)
         raw_keybind_callback_stack[-1].append(bind)
         bind.enable()
 
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, NamedTuple, Self
+
+from .keybinds import _set_input_recorder  # pyright: ignore[reportPrivateUsage]
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+
+__all__: tuple[str, ...] = (
+    "InputRecord",
+    "InputRecorder",
+    "read_recording",
+    "write_recording",
+)
+
+"""
+This module allows recording the raw stream of input events the keybind dispatcher sees, so that it
+can be replayed outside of the game, for testing and benchmarking.
+
+Recordings use a compact binary format. After a header, each event is stored as a fixed size
+struct of its timestamp, key index, event, and in menu flag. Keys are stored in a table built up as
+they're used - the first time a new key is used, its index is the length of the table so far, and
+the event is followed by the key's name.
+
+Since checking if we're in a menu may be slow, the dispatcher only does so when it needs to. If an
+event didn't need it, its in menu flag is recorded as unknown.
+"""
+
+RECORDING_HEADER = b"KBREC\x01"
+EVENT_STRUCT = struct.Struct("<dHBB")
+KEY_LENGTH_STRUCT = struct.Struct("<B")
+IN_MENU_UNKNOWN = 2
+
+
+class InputRecord(NamedTuple):
+    timestamp: float
+    key: str
+    event: int
+    in_menu: bool | None
+
+
+class RecordingWriter:
+    file: BinaryIO
+    key_indexes: dict[str, int]
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.key_indexes = {}
+        file.write(RECORDING_HEADER)
+
+    def write(self, record: InputRecord) -> None:
+        """
+        Writes a single input event.
+
+        Args:
+            record: The event to write.
+        """
+        new_key = record.key not in self.key_indexes
+        if new_key:
+            self.key_indexes[record.key] = len(self.key_indexes)
+
+        self.file.write(
+            EVENT_STRUCT.pack(
+                record.timestamp,
+                self.key_indexes[record.key],
+                record.event,
+                IN_MENU_UNKNOWN if record.in_menu is None else record.in_menu,
+            ),
+        )
+        if new_key:
+            encoded = record.key.encode("utf8")
+            self.file.write(KEY_LENGTH_STRUCT.pack(len(encoded)) + encoded)
+
+
+def write_recording(path: Path, records: Iterable[InputRecord]) -> None:
+    """
+    Writes a full recording to a file.
+
+    Args:
+        path: The path to write to.
+        records: The input events to write.
+    """
+    with path.open("wb") as file:
+        writer = RecordingWriter(file)
+        for record in records:
+            writer.write(record)
+
+
+def read_recording(path: Path) -> Iterator[InputRecord]:
+    """
+    Reads all input events from a recording.
+
+    Args:
+        path: The path to read from.
+    Yields:
+        Each input event, in order.
+    """
+    data = path.read_bytes()
+    if not data.startswith(RECORDING_HEADER):
+        raise ValueError(f"{path} is not an input recording")
+
+    keys: list[str] = []
+    offset = len(RECORDING_HEADER)
+    while offset < len(data):
+        timestamp, key_idx, event, in_menu = EVENT_STRUCT.unpack_from(data, offset)
+        offset += EVENT_STRUCT.size
+
+        if key_idx == len(keys):
+            (length,) = KEY_LENGTH_STRUCT.unpack_from(data, offset)
+            offset += KEY_LENGTH_STRUCT.size
+            keys.append(data[offset : offset + length].decode("utf8"))
+            offset += length
+
+        yield InputRecord(
+            timestamp,
+            keys[key_idx],
+            event,
+            None if in_menu == IN_MENU_UNKNOWN else bool(in_menu),
+        )
+
+
+class InputRecorder:
+    """
+    Records all input events to a file while active.
+
+    May be used as a context manager, or by explicitly calling start/stop. Only one recorder may be
+    active at once.
+    """
+
+    path: Path
+    _file: BinaryIO | None
+    _writer: RecordingWriter | None
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        Creates a new recorder.
+
+        Args:
+            path: The path to write the recording to.
+        """
+        self.path = Path(path)
+        self._file = None
+        self._writer = None
+
+    def start(self) -> None:
+        """Starts recording, overwriting any existing recording."""
+        global active_recorder
+
+        if self._file is not None:
+            return
+        if active_recorder is not None:
+            raise RuntimeError(f"Already recording inputs to {active_recorder.path}")
+
+        self._file = self.path.open("wb")
+        self._writer = RecordingWriter(self._file)
+        _set_input_recorder(self._on_event)
+        active_recorder = self
+
+    def stop(self) -> None:
+        """Stops recording."""
+        global active_recorder
+
+        if self._file is None:
+            return
+
+        _set_input_recorder(None)
+        active_recorder = None
+        self._file.close()
+        self._file = None
+        self._writer = None
+
+    def _on_event(self, key: str, event: int, in_menu: bool | None, timestamp: float) -> None:
+        if self._writer is not None:
+            self._writer.write(InputRecord(timestamp, key, event, in_menu))
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+
+active_recorder: InputRecorder | None = None
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .keybinds import (
+    _STATS_HISTOGRAM_BOUNDS,  # pyright: ignore[reportPrivateUsage]
+    _get_stats,  # pyright: ignore[reportPrivateUsage]
+    reset_stats,
+    set_slow_callback_threshold,
+    set_stats_enabled,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from mods_base.keybinds import EInputEvent
+
+__all__: tuple[str, ...] = (
+    "KeybindStats",
+    "get_stats",
+    "reset_stats",
+    "set_slow_callback_threshold",
+    "set_stats_enabled",
+)
+
+"""
+This module gives access to timing stats of every keybind callback, to help track down which ones
+are adding input latency.
+
+Stats collection is off by default, and must be turned on using `set_stats_enabled`. Separately,
+`set_slow_callback_threshold` prints a dev warning whenever a single callback takes longer than the
+given time.
+"""
+
+
+@dataclass(frozen=True)
+class KeybindStats:
+    """
+    The timing stats of a single keybind.
+
+    Attributes:
+        key: The key the bind is on, or None if it matches any.
+        event: The event the bind is on, or None if it matches any.
+        gameplay_bind: True if this is a gameplay bind, False if it's a raw bind.
+        callback: The bind's callback.
+        calls: How many times the callback was run.
+        total_time: The total time spent running the callback, in seconds.
+        max_time: The longest single run of the callback, in seconds.
+        histogram: A tuple of each histogram bucket's upper bound, in seconds, and how many calls
+                   fell into it. The last bucket is unbounded, and uses infinity.
+    """
+
+    key: str | None
+    event: EInputEvent | None
+    gameplay_bind: bool
+    callback: Callable[..., Any]
+    calls: int
+    total_time: float
+    max_time: float
+    histogram: tuple[tuple[float, int], ...]
+
+    @property
+    def mean_time(self) -> float:
+        """The average time of each run of the callback, in seconds."""
+        return self.total_time / self.calls if self.calls else 0
+
+    @property
+    def callback_name(self) -> str:
+        """A user-facing name for the callback, using it's module and qualified name."""
+        qualname = getattr(self.callback, "__qualname__", None)
+        if qualname is None:
+            return repr(self.callback)
+        module = getattr(self.callback, "__module__", None)
+        return qualname if module is None else f"{module}.{qualname}"
+
+
+def get_stats() -> list[KeybindStats]:
+    """
+    Gets the timing stats of every keybind.
+
+    Binds which were registered before stats were enabled only count calls since then.
+
+    Returns:
+        A list of each keybind's stats, sorted by total time, slowest first.
+    """
+    bounds = (*_STATS_HISTOGRAM_BOUNDS, float("inf"))
+    return sorted(
+        (
+            KeybindStats(
+                key,
+                event,
+                gameplay_bind,
+                callback,
+                calls,
+                total_time,
+                max_time,
+                tuple(zip(bounds, histogram, strict=True)),
+            )
+            for key, event, gameplay_bind, callback, calls, total_time, max_time, histogram in (
+                _get_stats()
+            )
+        ),
+        key=lambda stats: stats.total_time,
+        reverse=True,
+    )